@@ -20,7 +20,9 @@ from src import teams, schools, auth, projects, submission, upload, gold_divisio
 from src.services import timeout_service
 import os
 from src.jobs.scoreboard_job import add_scoreboard_job
-from src.extensions import cache, scheduler
+from src.jobs.grading_job import add_grading_recovery_job
+from src.jobs.job_lock import SCHEDULER_ENABLED
+from src.extensions import cache, cache_config, scheduler
 
 def create_app():
     app = Flask(__name__)
@@ -71,16 +73,19 @@ def create_app():
     db.init_app(app)
 
     # Cache setup
-    cache.init_app(app, config={
-        'CACHE_TYPE': 'SimpleCache',
-        'CACHE_DEFAULT_TIMEOUT': 60,
-    })
+    cache.init_app(app, config=cache_config())
+
+    # Jobs may start in every worker; each run takes a DB advisory lock (job_lock)
+    # so only one process does the work
+    if SCHEDULER_ENABLED:
+        if scheduler.get_job("scoreboard_snapshot_job") is None:
+            add_scoreboard_job(scheduler, app)
 
-    if scheduler.get_job("scoreboard_snapshot_job") is None:
-        add_scoreboard_job(scheduler, app)
+        if scheduler.get_job("grading_recovery_job") is None:
+            add_grading_recovery_job(scheduler, app)
 
-    if not scheduler.running:
-        scheduler.start()
+        if not scheduler.running:
+            scheduler.start()
 
     return app
 
@@ -5,6 +5,7 @@ from src.repositories.school_repository import SchoolRepository
 from src.repositories.team_repository import TeamRepository
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.submission_repository import SubmissionRepository
+from src.repositories.gold_division_repository import GoldDivisionRepository
 
 class Container(containers.DeclarativeContainer):
     config = providers.Configuration()
@@ -13,4 +14,5 @@ class Container(containers.DeclarativeContainer):
     project_repo = providers.Factory(ProjectRepository)
     submission_repo = providers.Factory(SubmissionRepository)
     user_repo = providers.Factory(UserRepository)
+    gold_division_repo = providers.Factory(GoldDivisionRepository)
     auth_service = providers.Factory(PAMAuthenticationService)
\ No newline at end of file
@@ -18,6 +18,7 @@ from src.jwt_manager import jwt
 from src.repositories.models import AdminUsers, StudentUsers
 from src.repositories.team_repository import TeamRepository
 from src.repositories.user_repository import UserRepository
+from src.services.response_cache import bump_cache_generation
 
 auth_api = Blueprint("auth_api", __name__)
 
@@ -294,6 +295,7 @@ def register_user(user_repo: UserRepository = Provide[Container.user_repo]):
         questionTwo=questionTwo,
         role=0,
     )
+    bump_cache_generation("schools")
 
     if not DEBUGGER_MODE:
         try:
@@ -423,6 +425,7 @@ def create_student_user(
         member_id=member_id,
         password_hash=password_hash,
     )
+    bump_cache_generation("schools")
 
     return make_response(
         {
@@ -480,6 +483,7 @@ def delete_student_user(
         return make_response({"message": "Student not found."}, HTTPStatus.NOT_FOUND)
 
     user_repo.delete_student(student.Id)
+    bump_cache_generation("schools")
     return make_response({"message": "Success"}, HTTPStatus.OK)
 
 @auth_api.route("/student/invite", methods=["POST"])
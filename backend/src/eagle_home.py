@@ -4,7 +4,7 @@ from http import HTTPStatus
 from dependency_injector.wiring import Provide, inject
 from flask import Blueprint, current_app, jsonify, make_response, request, send_file
 from flask_jwt_extended import current_user, jwt_required
-from sqlalchemy import asc, desc
+from sqlalchemy import asc, desc, func
 
 from container import Container
 from src.constants import (
@@ -15,6 +15,7 @@ from src.constants import (
 from src.repositories.database import db
 from src.repositories.models import AdminUsers, EagleTeamMessages, StudentUsers, Teams
 from src.repositories.project_repository import ProjectRepository
+from src.services.response_cache import etag_json_response
 
 eagle_api = Blueprint("eagle_api", __name__)
 
@@ -57,7 +58,17 @@ def _visible_eagle_teams_query():
     return teams_query
 
 
-def _message_sender_role(message) -> str | None:
+def _admin_roles(admin_ids) -> dict[int, int]:
+    admin_ids = {int(admin_id) for admin_id in admin_ids if admin_id is not None}
+    if not admin_ids:
+        return {}
+    return {
+        int(u.Id): int(getattr(u, "Role", TEACHER_ROLE) or TEACHER_ROLE)
+        for u in AdminUsers.query.filter(AdminUsers.Id.in_(admin_ids)).all()
+    }
+
+
+def _message_sender_role(message, role_by_admin: dict[int, int]) -> str | None:
     if message is None:
         return None
 
@@ -66,11 +77,69 @@ def _message_sender_role(message) -> str | None:
         return "student"
 
     admin_id = int(getattr(message, "AdminId", 0) or 0)
-    admin = AdminUsers.query.filter_by(Id=admin_id).first() if admin_id > 0 else None
-    admin_role = int(getattr(admin, "Role", TEACHER_ROLE) or TEACHER_ROLE) if admin else ADMIN_ROLE
+    admin_role = role_by_admin.get(admin_id, ADMIN_ROLE)
     return "admin" if admin_role == ADMIN_ROLE else "teacher"
 
 
+def _latest_team_messages(team_ids: list[int]) -> dict[int, tuple[EagleTeamMessages, int]]:
+    """
+    Latest message and message count per team as {team_id: (message, count)}, in one
+    query: ROW_NUMBER() picks the newest row and COUNT() OVER the same partition
+    carries the thread size along with it.
+    """
+    if not team_ids:
+        return {}
+
+    ranked = (
+        db.session.query(
+            EagleTeamMessages.Id.label("MessageId"),
+            func.row_number().over(
+                partition_by=EagleTeamMessages.TeamId,
+                order_by=(desc(EagleTeamMessages.CreatedAt), desc(EagleTeamMessages.Id)),
+            ).label("RowNumber"),
+            func.count(EagleTeamMessages.Id).over(
+                partition_by=EagleTeamMessages.TeamId,
+            ).label("MessageCount"),
+        )
+        .filter(EagleTeamMessages.TeamId.in_(team_ids))
+        .subquery()
+    )
+
+    rows = (
+        db.session.query(EagleTeamMessages, ranked.c.MessageCount)
+        .join(ranked, ranked.c.MessageId == EagleTeamMessages.Id)
+        .filter(ranked.c.RowNumber == 1)
+        .all()
+    )
+    return {int(message.TeamId): (message, int(count)) for message, count in rows}
+
+
+def _serialize_team_messages(rows) -> list[dict]:
+    role_by_admin = _admin_roles(m.AdminId for m in rows)
+
+    out = []
+    for m in rows:
+        st = (m.SenderType or "").lower()
+        if st == "student":
+            sender = "student"
+            sender_role = "student"
+        else:
+            sender = "admin"
+            rid = int(m.AdminId) if m.AdminId is not None else None
+            ar = role_by_admin.get(rid, ADMIN_ROLE) if rid is not None else ADMIN_ROLE
+            sender_role = "admin" if ar == ADMIN_ROLE else "teacher"
+        out.append(
+            {
+                "id": m.Id,
+                "sender": sender,
+                "senderRole": sender_role,
+                "body": m.Body,
+                "createdAt": m.CreatedAt.isoformat(sep=" ", timespec="seconds") if m.CreatedAt else "",
+            }
+        )
+    return out
+
+
 def _conversation_stage(message_count: int, last_sender_role: str | None) -> str:
     if message_count <= 0:
         return "no_messages"
@@ -160,22 +229,13 @@ def list_eagle_conversations():
         return make_response({"message": "Unauthorized"}, HTTPStatus.FORBIDDEN)
 
     teams = teams_query.order_by(asc(Teams.SchoolId), asc(Teams.TeamNumber)).all()
+    latest_by_team = _latest_team_messages([int(team.Id) for team in teams])
+    role_by_admin = _admin_roles(message.AdminId for message, _ in latest_by_team.values())
     payload = []
 
     for team in teams:
-        latest_message = (
-            EagleTeamMessages.query
-            .filter(EagleTeamMessages.TeamId == int(team.Id))
-            .order_by(desc(EagleTeamMessages.CreatedAt), desc(EagleTeamMessages.Id))
-            .first()
-        )
-        message_count = (
-            EagleTeamMessages.query
-            .filter(EagleTeamMessages.TeamId == int(team.Id))
-            .count()
-        )
-
-        last_sender_role = _message_sender_role(latest_message)
+        latest_message, message_count = latest_by_team.get(int(team.Id), (None, 0))
+        last_sender_role = _message_sender_role(latest_message, role_by_admin)
         payload.append(
             {
                 "teamId": int(team.Id),
@@ -223,38 +283,24 @@ def get_messages():
     else:
         return make_response({"message": "Unauthorized"}, HTTPStatus.FORBIDDEN)
 
-    rows = (
-        EagleTeamMessages.query.filter_by(TeamId=team_id)
-        .order_by(asc(EagleTeamMessages.CreatedAt), asc(EagleTeamMessages.Id))
-        .all()
+    # Pollers pass an id a few messages behind their newest (ids can commit out of order,
+    # see useThreadMessages) and get everything after it; the ETag lets an unchanged
+    # thread answer 304 from a single index lookup
+    after_id = request.args.get("after_id", type=int) or 0
+    max_id, count = (
+        db.session.query(func.max(EagleTeamMessages.Id), func.count(EagleTeamMessages.Id))
+        .filter(EagleTeamMessages.TeamId == team_id)
+        .one()
     )
-    admin_ids = {int(m.AdminId) for m in rows if m.AdminId is not None}
-    role_by_admin: dict[int, int] = {}
-    if admin_ids:
-        for u in AdminUsers.query.filter(AdminUsers.Id.in_(admin_ids)).all():
-            role_by_admin[int(u.Id)] = int(getattr(u, "Role", TEACHER_ROLE) or TEACHER_ROLE)
 
-    out = []
-    for m in rows:
-        st = (m.SenderType or "").lower()
-        if st == "student":
-            sender = "student"
-            sender_role = "student"
-        else:
-            sender = "admin"
-            rid = int(m.AdminId) if m.AdminId is not None else None
-            ar = role_by_admin.get(rid, ADMIN_ROLE) if rid is not None else ADMIN_ROLE
-            sender_role = "admin" if ar == ADMIN_ROLE else "teacher"
-        out.append(
-            {
-                "id": m.Id,
-                "sender": sender,
-                "senderRole": sender_role,
-                "body": m.Body,
-                "createdAt": m.CreatedAt.isoformat(sep=" ", timespec="seconds") if m.CreatedAt else "",
-            }
-        )
-    return jsonify(out)
+    def build():
+        rows_query = EagleTeamMessages.query.filter_by(TeamId=team_id)
+        if after_id:
+            rows_query = rows_query.filter(EagleTeamMessages.Id > after_id)
+        rows = rows_query.order_by(asc(EagleTeamMessages.CreatedAt), asc(EagleTeamMessages.Id)).all()
+        return _serialize_team_messages(rows)
+
+    return etag_json_response(f"eagle-{team_id}-{after_id}-{int(max_id or 0)}-{int(count or 0)}", build)
 
 
 @eagle_api.route("/messages", methods=["POST"])
@@ -1,5 +1,35 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from flask_caching import Cache
 from apscheduler.schedulers.background import BackgroundScheduler
 
+GRADING_WORKER_COUNT = int(os.getenv("GRADING_WORKERS", "4"))
+BACKGROUND_WORKER_COUNT = 2
+
+# Shared by every gunicorn worker: Redis when CACHE_REDIS_URL is set, otherwise
+# files under CACHE_DIR (same host only)
+CACHE_DEFAULT_TIMEOUT = 60
+CACHE_DIR = os.getenv("CACHE_DIR", "/tmp/abacus-cache")
+
 cache = Cache()
-scheduler = BackgroundScheduler()
\ No newline at end of file
+scheduler = BackgroundScheduler()
+grading_executor = ThreadPoolExecutor(max_workers=GRADING_WORKER_COUNT, thread_name_prefix="grading")
+background_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKER_COUNT, thread_name_prefix="background")
+
+
+def cache_config() -> dict:
+    redis_url = os.getenv("CACHE_REDIS_URL")
+    if redis_url:
+        return {
+            "CACHE_TYPE": "RedisCache",
+            "CACHE_REDIS_URL": redis_url,
+            "CACHE_KEY_PREFIX": "abacus:",
+            "CACHE_DEFAULT_TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+        }
+    return {
+        "CACHE_TYPE": "FileSystemCache",
+        "CACHE_DIR": CACHE_DIR,
+        "CACHE_THRESHOLD": 2000,
+        "CACHE_DEFAULT_TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+    }
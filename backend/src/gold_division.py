@@ -2,8 +2,11 @@ from datetime import datetime, timedelta
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import current_user, jwt_required
+from dependency_injector.wiring import inject, Provide
+from container import Container
 
 from src.repositories.database import db
+from src.repositories.gold_division_repository import GoldDivisionRepository
 from src.repositories.models import (
     AdminUsers,
     GoldDivision,
@@ -212,15 +215,16 @@ def get_latest_graded_team_submission(project_id: int, team_id: int):
     return None
 
 
-def get_effective_grade_source(submission):
+def get_effective_grade_source(submission, team_id: int | None = None):
     if not submission:
         return None
 
     if has_been_graded(submission):
         return submission
 
-    submitting_student = StudentUsers.query.get(int(getattr(submission, "StudentId", 0) or 0))
-    team_id = int(getattr(submitting_student, "TeamId", 0) or 0) if submitting_student else 0
+    if team_id is None:
+        submitting_student = StudentUsers.query.get(int(getattr(submission, "StudentId", 0) or 0))
+        team_id = int(getattr(submitting_student, "TeamId", 0) or 0) if submitting_student else 0
     project_id = int(getattr(submission, "ProjectId", 0) or 0)
 
     if team_id <= 0 or project_id <= 0:
@@ -229,16 +233,75 @@ def get_effective_grade_source(submission):
     return get_latest_graded_team_submission(project_id, team_id)
 
 
-def serialize_submission(submission, *, include_grades: bool, teacher_view: bool = False):
+def get_projects_by_id(project_ids) -> dict[int, Projects]:
+    ids = sorted({int(project_id) for project_id in project_ids if project_id})
+    if not ids:
+        return {}
+
+    return {int(project.Id): project for project in Projects.query.filter(Projects.Id.in_(ids)).all()}
+
+
+def get_grade_sources(gold_division_repo, rows) -> dict[tuple[int, int], GoldDivision]:
+    """
+    get_effective_grade_source for many (submission, team_id) rows, keyed by
+    (project_id, team_id). Ungraded rows fall back to their team's latest graded
+    submission, which is loaded for all of them in one query.
+    """
+    ungraded = [
+        (submission, team_id)
+        for submission, team_id in rows
+        if submission and team_id and not has_been_graded(submission)
+    ]
+    latest_graded = {}
+    if ungraded:
+        graded_rows = gold_division_repo.get_latest_team_submissions(
+            project_ids=sorted({int(getattr(submission, "ProjectId", 0) or 0) for submission, _ in ungraded}),
+            team_ids=sorted({int(team_id) for _, team_id in ungraded}),
+            graded_only=True,
+        )
+        latest_graded = {(int(graded.ProjectId), team_id): graded for graded, team_id in graded_rows}
+
+    sources = {}
+    for submission, team_id in rows:
+        if not submission:
+            continue
+        key = (int(getattr(submission, "ProjectId", 0) or 0), int(team_id or 0))
+        sources[key] = submission if has_been_graded(submission) else latest_graded.get(key)
+    return sources
+
+
+def serialize_submission(
+    submission,
+    *,
+    include_grades: bool,
+    teacher_view: bool = False,
+    team_id: int | None = None,
+    projects_by_id: dict[int, Projects] | None = None,
+    grade_sources: dict[tuple[int, int], GoldDivision] | None = None,
+):
+    """
+    List callers pass projects_by_id and grade_sources (see serialize_latest_submissions)
+    so no row triggers its own query; without them each is looked up individually.
+    """
     if not submission:
         return None
 
-    submitting_student = StudentUsers.query.get(int(getattr(submission, "StudentId", 0) or 0))
-    team_id = int(getattr(submitting_student, "TeamId", 0) or 0) if submitting_student else None
-    project = Projects.query.get(int(getattr(submission, "ProjectId", 0) or 0)) \
-        if getattr(submission, "ProjectId", None) is not None else None
+    # Callers that already joined the team pass team_id to skip the student lookup
+    if team_id is None:
+        submitting_student = StudentUsers.query.get(int(getattr(submission, "StudentId", 0) or 0))
+        team_id = int(getattr(submitting_student, "TeamId", 0) or 0) if submitting_student else None
 
-    grade_source = get_effective_grade_source(submission) if include_grades else None
+    project_id = int(getattr(submission, "ProjectId", 0) or 0)
+    if projects_by_id is None:
+        projects_by_id = get_projects_by_id([project_id])
+    project = projects_by_id.get(project_id)
+
+    grade_source = None
+    if include_grades:
+        if grade_sources is None:
+            grade_source = get_effective_grade_source(submission, team_id=team_id or 0)
+        else:
+            grade_source = grade_sources.get((project_id, int(team_id or 0)))
 
     return {
         "id": submission.Id,
@@ -261,45 +324,29 @@ def serialize_submission(submission, *, include_grades: bool, teacher_view: bool
     }
 
 
-def get_latest_visible_submissions_for_query(base_query):
-    rows = (
-        base_query
-        .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
-        .order_by(
-            GoldDivision.ProjectId.asc(),
-            StudentUsers.TeamId.asc(),
-            GoldDivision.SubmittedAt.desc(),
-            GoldDivision.Id.desc(),
-        )
-        .all()
-    )
-
-    latest_rows = []
-    seen: set[tuple[int, int]] = set()
-
-    for row in rows:
-        project_id = int(getattr(row, "ProjectId", 0) or 0)
-        student = StudentUsers.query.get(int(getattr(row, "StudentId", 0) or 0))
-        team_id = int(getattr(student, "TeamId", 0) or 0) if student else 0
-        key = (project_id, team_id)
+def get_latest_visible_submissions(gold_division_repo, teacher_id: int | None = None):
+    """
+    Latest submission per (project, team) as (submission, team_id), newest first;
+    limited to one teacher's students when teacher_id is given.
+    """
+    return gold_division_repo.get_latest_team_submissions(teacher_id=teacher_id)
 
-        if project_id <= 0 or team_id <= 0:
-            continue
 
-        if key in seen:
-            continue
-
-        seen.add(key)
-        latest_rows.append(row)
+def serialize_latest_submissions(gold_division_repo, rows, *, include_grades: bool, teacher_view: bool):
+    projects_by_id = get_projects_by_id(getattr(submission, "ProjectId", None) for submission, _ in rows)
+    grade_sources = get_grade_sources(gold_division_repo, rows) if include_grades else {}
 
-    latest_rows.sort(
-        key=lambda submission: (
-            getattr(submission, "SubmittedAt", None) or datetime.min,
-            int(getattr(submission, "Id", 0) or 0),
-        ),
-        reverse=True,
-    )
-    return latest_rows
+    return [
+        serialize_submission(
+            submission,
+            include_grades=include_grades,
+            teacher_view=teacher_view,
+            team_id=team_id,
+            projects_by_id=projects_by_id,
+            grade_sources=grade_sources,
+        )
+        for submission, team_id in rows
+    ]
 
 
 def get_team_display_name(team) -> str:
@@ -315,13 +362,36 @@ def get_team_display_name(team) -> str:
     return "Unnamed Team"
 
 
-def serialize_team_project_row(team, submission, *, include_grades: bool, project=None):
-    school = Schools.query.get(int(getattr(team, "SchoolId", 0) or 0))
+def serialize_team_project_row(
+    team,
+    submission,
+    *,
+    include_grades: bool,
+    project=None,
+    schools_by_id: dict[int, Schools] | None = None,
+    projects_by_id: dict[int, Projects] | None = None,
+    grade_sources: dict[tuple[int, int], GoldDivision] | None = None,
+):
+    """
+    Row builders pass schools_by_id, projects_by_id and grade_sources loaded for every
+    row at once; without them each is looked up individually.
+    """
+    school_id = int(getattr(team, "SchoolId", 0) or 0)
+    if schools_by_id is None:
+        school = Schools.query.get(school_id)
+    else:
+        school = schools_by_id.get(school_id)
     school_name = getattr(school, "Name", None) if school else None
+    team_id = int(getattr(team, "Id", 0) or 0)
 
     if submission:
         status = get_submission_status(submission)
-        grade_source = get_effective_grade_source(submission) if include_grades else None
+        grade_source = None
+        if include_grades:
+            if grade_sources is None:
+                grade_source = get_effective_grade_source(submission, team_id=team_id)
+            else:
+                grade_source = grade_sources.get((int(getattr(submission, "ProjectId", 0) or 0), team_id))
         points = getattr(grade_source, "Points", None) if grade_source else None
         feedback = getattr(grade_source, "Feedback", None) if grade_source else None
         admin_grader_id = getattr(grade_source, "AdminGraderId", None) if grade_source else None
@@ -329,7 +399,9 @@ def serialize_team_project_row(team, submission, *, include_grades: bool, projec
         project_id = getattr(submission, "ProjectId", None)
         project_name = getattr(project, "Name", None) if project else None
         if not project_name and project_id:
-            submission_project = Projects.query.get(int(project_id))
+            if projects_by_id is None:
+                projects_by_id = get_projects_by_id([project_id])
+            submission_project = projects_by_id.get(int(project_id))
             project_name = getattr(submission_project, "Name", None) if submission_project else None
         student_id = getattr(submission, "StudentId", None)
         link = getattr(submission, "Link", None)
@@ -384,16 +456,14 @@ def serialize_team_project_row(team, submission, *, include_grades: bool, projec
 def serialize_submission_history_item(
     submission,
     *,
+    team_id: int | None,
+    project,
+    admin_graders_by_id: dict[int, AdminUsers],
     submission_number=None,
     event_type: str = "submission",
     event_timestamp=None,
 ):
-    submitting_student = StudentUsers.query.get(int(getattr(submission, "StudentId", 0) or 0))
-    team_id = int(getattr(submitting_student, "TeamId", 0) or 0) if submitting_student else None
-    project = Projects.query.get(int(getattr(submission, "ProjectId", 0) or 0)) \
-        if getattr(submission, "ProjectId", None) is not None else None
-    admin_grader = AdminUsers.query.get(int(getattr(submission, "AdminGraderId", 0) or 0)) \
-        if getattr(submission, "AdminGraderId", None) is not None else None
+    admin_grader = admin_graders_by_id.get(int(getattr(submission, "AdminGraderId", 0) or 0))
 
     admin_grader_name = None
     if admin_grader:
@@ -434,15 +504,28 @@ def serialize_submission_history_item(
     }
 
 
-def build_submission_history_events(history_rows):
+def build_submission_history_events(history_rows, *, team_id: int | None, project):
+    """
+    Every row in history_rows belongs to the same team and project.
+    """
     history_count = len(history_rows)
     events = []
 
+    grader_ids = sorted({int(row.AdminGraderId) for row in history_rows if getattr(row, "AdminGraderId", None) is not None})
+    admin_graders_by_id = (
+        {int(admin.Id): admin for admin in AdminUsers.query.filter(AdminUsers.Id.in_(grader_ids)).all()}
+        if grader_ids
+        else {}
+    )
+
     for index, row in enumerate(history_rows):
         submission_number = history_count - index
 
         submission_event = serialize_submission_history_item(
             row,
+            team_id=team_id,
+            project=project,
+            admin_graders_by_id=admin_graders_by_id,
             submission_number=submission_number,
             event_type="submission",
             event_timestamp=getattr(row, "SubmittedAt", None),
@@ -453,6 +536,9 @@ def build_submission_history_events(history_rows):
         if regrade_requested_at is not None:
             regrade_event = serialize_submission_history_item(
                 row,
+                team_id=team_id,
+                project=project,
+                admin_graders_by_id=admin_graders_by_id,
                 submission_number=submission_number,
                 event_type="regrade_request",
                 event_timestamp=regrade_requested_at,
@@ -471,6 +557,14 @@ def build_submission_history_events(history_rows):
     return events
 
 
+def get_schools_by_id(teams) -> dict[int, Schools]:
+    ids = sorted({int(getattr(team, "SchoolId", 0) or 0) for team in teams} - {0})
+    if not ids:
+        return {}
+
+    return {int(school.Id): school for school in Schools.query.filter(Schools.Id.in_(ids)).all()}
+
+
 def get_gold_teams_for_site_admin() -> list[Teams]:
     return (
         Teams.query
@@ -510,21 +604,29 @@ def get_gold_projects() -> list[Projects]:
     )
 
 
-def build_team_rows_for_all_gold_projects(team, *, include_grades: bool):
+def build_team_rows_for_all_gold_projects(gold_division_repo, team, *, include_grades: bool):
     rows = []
 
-    for project in get_gold_projects():
-        project_id = int(getattr(project, "Id", 0) or 0)
-        if project_id <= 0:
-            continue
-
-        submission = get_team_gold_submission(project_id, int(getattr(team, "Id", 0) or 0))
+    team_id = int(getattr(team, "Id", 0) or 0)
+    projects = [project for project in get_gold_projects() if int(getattr(project, "Id", 0) or 0) > 0]
+    latest = gold_division_repo.get_latest_team_submissions(
+        project_ids=[int(project.Id) for project in projects],
+        team_ids=[team_id],
+    ) if team_id > 0 else []
+    submission_by_project = {int(submission.ProjectId): submission for submission, _ in latest}
+    grade_sources = get_grade_sources(gold_division_repo, latest) if include_grades else {}
+    schools_by_id = get_schools_by_id([team])
+
+    for project in projects:
         rows.append(
             serialize_team_project_row(
                 team,
-                submission,
+                submission_by_project.get(int(project.Id)),
                 include_grades=include_grades,
                 project=project,
+                schools_by_id=schools_by_id,
+                projects_by_id={int(project.Id): project},
+                grade_sources=grade_sources,
             )
         )
 
@@ -549,20 +651,28 @@ def build_team_rows_for_all_gold_projects(team, *, include_grades: bool):
     return rows
 
 
-def build_project_team_rows(teams: list[Teams], project_id: int, *, include_grades: bool):
+def build_project_team_rows(gold_division_repo, teams: list[Teams], project_id: int, *, include_grades: bool):
     rows = []
 
-    for team in teams:
-        team_id = int(getattr(team, "Id", 0) or 0)
-        if team_id <= 0:
-            continue
+    teams = [team for team in teams if int(getattr(team, "Id", 0) or 0) > 0]
+    latest = gold_division_repo.get_latest_team_submissions(
+        project_ids=[project_id],
+        team_ids=[int(team.Id) for team in teams],
+    )
+    submission_by_team = {team_id: submission for submission, team_id in latest}
+    grade_sources = get_grade_sources(gold_division_repo, latest) if include_grades else {}
+    schools_by_id = get_schools_by_id(teams)
+    projects_by_id = get_projects_by_id([project_id])
 
-        submission = get_team_gold_submission(project_id, team_id)
+    for team in teams:
         rows.append(
             serialize_team_project_row(
                 team,
-                submission,
+                submission_by_team.get(int(team.Id)),
                 include_grades=include_grades,
+                schools_by_id=schools_by_id,
+                projects_by_id=projects_by_id,
+                grade_sources=grade_sources,
             )
         )
 
@@ -674,7 +784,10 @@ def create_gold_submission():
 # -----------------------------
 @gold_division_api.route('/visible', methods=['GET'])
 @jwt_required()
-def get_visible_submissions():
+@inject
+def get_visible_submissions(
+    gold_division_repo: GoldDivisionRepository = Provide[Container.gold_division_repo],
+):
 
     if not isinstance(current_user, AdminUsers):
         return jsonify({'message': 'Admins/teachers only'}), 403
@@ -711,6 +824,7 @@ def get_visible_submissions():
                 ]
             else:
                 result = build_team_rows_for_all_gold_projects(
+                    gold_division_repo,
                     team,
                     include_grades=True,
                 )
@@ -731,14 +845,10 @@ def get_visible_submissions():
 
         if project_id is not None:
             teams = get_gold_teams_for_site_admin()
-            result = build_project_team_rows(teams, project_id, include_grades=True)
+            result = build_project_team_rows(gold_division_repo, teams, project_id, include_grades=True)
         else:
-            query = GoldDivision.query
-            submissions = get_latest_visible_submissions_for_query(query)
-            result = [
-                serialize_submission(s, include_grades=True, teacher_view=False)
-                for s in submissions
-            ]
+            submissions = get_latest_visible_submissions(gold_division_repo)
+            result = serialize_latest_submissions(gold_division_repo, submissions, include_grades=True, teacher_view=False)
 
         return jsonify({
             "currentAdminId": current_user.Id,
@@ -785,6 +895,7 @@ def get_visible_submissions():
                 ]
             else:
                 result = build_team_rows_for_all_gold_projects(
+                    gold_division_repo,
                     team,
                     include_grades=False,
                 )
@@ -805,19 +916,10 @@ def get_visible_submissions():
 
         if project_id is not None:
             teams = get_gold_teams_for_teacher(current_user)
-            result = build_project_team_rows(teams, project_id, include_grades=False)
+            result = build_project_team_rows(gold_division_repo, teams, project_id, include_grades=False)
         else:
-            query = (
-                GoldDivision.query
-                .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
-                .filter(StudentUsers.TeacherId == current_user.Id)
-            )
-
-            submissions = get_latest_visible_submissions_for_query(query)
-            result = [
-                serialize_submission(s, include_grades=False, teacher_view=True)
-                for s in submissions
-            ]
+            submissions = get_latest_visible_submissions(gold_division_repo, teacher_id=current_user.Id)
+            result = serialize_latest_submissions(gold_division_repo, submissions, include_grades=False, teacher_view=True)
 
         return jsonify({
             "currentAdminId": None,
@@ -841,17 +943,17 @@ def get_visible_submissions():
 # -----------------------------
 @gold_division_api.route('/all', methods=['GET'])
 @jwt_required()
-def get_all_submissions():
+@inject
+def get_all_submissions(
+    gold_division_repo: GoldDivisionRepository = Provide[Container.gold_division_repo],
+):
 
     if not is_site_admin(current_user):
         return jsonify({'message': 'Admins only'}), 403
 
-    submissions = get_latest_visible_submissions_for_query(GoldDivision.query)
+    submissions = get_latest_visible_submissions(gold_division_repo)
 
-    result = [
-        serialize_submission(s, include_grades=True, teacher_view=False)
-        for s in submissions
-    ]
+    result = serialize_latest_submissions(gold_division_repo, submissions, include_grades=True, teacher_view=False)
 
     return jsonify({
         "currentAdminId": current_user.Id,
@@ -891,7 +993,7 @@ def get_submission_history(submission_id):
     project = Projects.query.get(project_id)
 
     history_rows = get_team_gold_submission_history(project_id, team_id)
-    serialized_history = build_submission_history_events(history_rows)
+    serialized_history = build_submission_history_events(history_rows, team_id=team_id, project=project)
 
     return jsonify({
         "teamId": team_id,
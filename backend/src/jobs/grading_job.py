@@ -0,0 +1,25 @@
+from src.jobs.job_lock import job_lock
+from src.services.grading_engine import prune_result_cache
+from src.services.grading_service import prune_judge0_callbacks, requeue_stale_submissions
+
+def run_grading_recovery_job(app) -> None:
+    with app.app_context():
+        with job_lock("grading_recovery") as acquired:
+            if not acquired:
+                return
+            requeue_stale_submissions(app)
+            prune_judge0_callbacks()
+            prune_result_cache()
+
+def add_grading_recovery_job(scheduler, app) -> None:
+    scheduler.add_job(
+        func=run_grading_recovery_job,
+        trigger="interval",
+        seconds=60,
+        id="grading_recovery_job",
+        args=[app],
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=120,
+    )
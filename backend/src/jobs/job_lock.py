@@ -0,0 +1,32 @@
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from src.repositories.database import db
+
+# Set to "false" in processes that should serve requests only (the scheduler then
+# never starts there); leave enabled in at least one process.
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").strip().lower() not in {"0", "false", "no"}
+
+JOB_LOCK_PREFIX = "abacus:job:"
+
+
+@contextmanager
+def job_lock(name: str):
+    """
+    MySQL advisory lock for one scheduled job run, so only one gunicorn worker runs
+    it at a time. Yields False (without waiting) when another process holds it.
+    The lock lives on a dedicated connection and is released if the process dies.
+    """
+    conn = db.engine.connect()
+    try:
+        lock_name = JOB_LOCK_PREFIX + name
+        acquired = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": lock_name}).scalar() == 1
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": lock_name})
+    finally:
+        conn.close()
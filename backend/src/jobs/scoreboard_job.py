@@ -1,7 +1,13 @@
 from datetime import datetime, timedelta
 from src.repositories.database import db
 from src.constants import COMPETITION_START, COMPETITION_END, get_minute_index
-from src.services.scoreboard_service import build_scoreboard_payload, save_scoreboard_snapshot
+from src.jobs.job_lock import job_lock
+from src.services.scoreboard_service import (
+    encode_scoreboard_snapshot,
+    get_incremental_scoreboard,
+    publish_scoreboard_responses,
+    save_scoreboard_snapshot,
+)
 
 DIVISIONS = ["Blue"]
 ONLINE_VALUES = [False, True]
@@ -20,26 +26,43 @@ def run_scoreboard_job(app) -> None:
 
         snapshot_time = COMPETITION_START + timedelta(minutes=minute_index)
         container = app.container
+        team_repo = container.team_repo()
 
-        for division in DIVISIONS:
-            for is_online in ONLINE_VALUES:
-                payload = build_scoreboard_payload(
-                    project_repo=container.project_repo(),
-                    team_repo=container.team_repo(),
-                    division=division,
-                    is_online=is_online,
-                    project_type=PROJECT_TYPE,
-                )
-
-                save_scoreboard_snapshot(
-                    minute=minute_index,
-                    timestamp=snapshot_time,
-                    division=division,
-                    is_online=is_online,
-                    payload=payload,
-                )
-
-        db.session.commit()
+        with job_lock("scoreboard_snapshot") as acquired:
+            if not acquired:
+                return
+
+            written = False
+            for division in DIVISIONS:
+                for is_online in ONLINE_VALUES:
+                    # Another worker already finished this minute
+                    if team_repo.get_scoreboard_snapshot_at(division, is_online, minute_index) is not None:
+                        continue
+
+                    # Only applies TeamProjectStats rows changed since the previous minute
+                    board = get_incremental_scoreboard(division, is_online, PROJECT_TYPE)
+                    board.refresh(container.project_repo(), team_repo, now=now)
+                    kind, base_minute, payload = encode_scoreboard_snapshot(team_repo, board, minute_index)
+
+                    save_scoreboard_snapshot(
+                        minute=minute_index,
+                        timestamp=snapshot_time,
+                        division=division,
+                        is_online=is_online,
+                        payload=payload,
+                        kind=kind,
+                        base_minute=base_minute,
+                    )
+                    written = True
+
+            db.session.commit()
+            if not written:
+                return
+
+            # Ready-made response bytes for every current view, so requests never parse snapshots
+            for division in DIVISIONS:
+                for is_online in ONLINE_VALUES:
+                    publish_scoreboard_responses(team_repo, division, is_online, now)
 
 def add_scoreboard_job(scheduler, app) -> None:
     scheduler.add_job(
@@ -5,12 +5,10 @@ import json
 import os
 import re
 import shutil
-import subprocess
 import os.path
 from typing import List
 import zipfile
 import stat
-import sys
 
 import requests
 
@@ -25,9 +23,12 @@ from injector import inject
 from flask_jwt_extended import jwt_required
 from flask_jwt_extended import current_user
 from src.repositories.project_repository import ProjectRepository
-from src.repositories.models import AdminUsers, StudentUsers, Teams, Submissions, Projects, GoldDivision
+from src.repositories.gold_division_repository import GoldDivisionRepository
+from src.repositories.models import AdminUsers, StudentUsers, Teams, Submissions, Projects
 from src.repositories.database import db
 from src.services.dataService import all_submissions 
+from src.services.grading_service import get_recompute_status, start_recompute_job
+from src.services.response_cache import bump_cache_generation, cache_generation, get_cached_json, json_bytes_response
 from src.models.ProjectJson import ProjectJson
 from src.constants import (
      ADMIN_ROLE,
@@ -41,7 +42,6 @@ from dependency_injector.wiring import inject, Provide
 from container import Container
 from datetime import datetime
 import itertools
-import importlib.util
 from werkzeug.utils import secure_filename
 from urllib.parse import quote
 
@@ -52,6 +52,10 @@ TS_DIR_RE = re.compile(r"^\d{8}_\d{6}$")
 PROJECT_TYPES = {'competition', 'practice', 'none'}
 PROJECT_DIVISIONS = {'blue', 'gold'}
 GOLD_PROBLEM_TYPES = {'normal', 'creative'}
+# Output comparison policies understood by grade.py ("float:<tolerance>" is also accepted)
+TESTCASE_COMPARE_POLICIES = {'normalized', 'exact', 'tokens', 'float'}
+# Submission/review counts in all_projects may lag by up to this long
+ALL_PROJECTS_CACHE_SECONDS = 10
 
 def project_root() -> str:
     return "/tabot-files/project-files"
@@ -90,6 +94,22 @@ def normalize_gold_problem_type(v: str | None) -> str:
     raw = (v or "").strip().lower()
     return raw if raw in GOLD_PROBLEM_TYPES else "normal"
 
+def normalize_compare_policy(v: str | None) -> str:
+    raw = (v or "").strip().lower()
+    if raw in TESTCASE_COMPARE_POLICIES:
+        return raw
+    if raw.startswith("float:"):
+        try:
+            float(raw.split(":", 1)[1])
+            return raw
+        except ValueError:
+            pass
+    return "normalized"
+
+def parse_bool_flag(v: str) -> bool:
+    s = (v or "").strip().lower()
+    return s in ("1", "true", "yes", "y", "on")
+
 def get_next_order_index_for_division(project_type: str, division: str, exclude_project_id: int | None = None) -> int | None:
     if project_type not in {"competition", "practice"}:
         return None
@@ -210,6 +230,16 @@ def get_visible_student_ids_for_gold_summary() -> list[int]:
 
     return []
 
+def project_summary_scope() -> str:
+    """
+    Which teams the current user's project summary covers (see get_visible_team_ids_for_project_summary).
+    """
+    if isinstance(current_user, AdminUsers):
+        if int(getattr(current_user, "Role", 0) or 0) == ADMIN_ROLE:
+            return "admin"
+        return f"school:{int(getattr(current_user, 'SchoolId', 0) or 0)}"
+    return f"team:{int(getattr(current_user, 'TeamId', 0) or 0)}"
+
 def build_project_total_submission_counts(projects, visible_team_ids: list[int]) -> dict[int, int]:
     project_ids = [int(proj.Id) for proj in (projects or [])]
     counts_by_project: dict[int, int] = {pid: 0 for pid in project_ids}
@@ -233,28 +263,14 @@ def build_project_total_submission_counts(projects, visible_team_ids: list[int])
 
     return counts_by_project
 
-def build_gold_project_total_submission_counts(projects, visible_team_ids: list[int]) -> dict[int, int]:
+def build_gold_project_total_submission_counts(gold_division_repo, projects, visible_team_ids: list[int]) -> dict[int, int]:
     project_ids = [int(proj.Id) for proj in (projects or [])]
     counts_by_project: dict[int, int] = {pid: 0 for pid in project_ids}
 
     if not project_ids or not visible_team_ids:
         return counts_by_project
 
-    submissions = (
-        GoldDivision.query
-        .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
-        .filter(
-            GoldDivision.ProjectId.in_(project_ids),
-            StudentUsers.TeamId.in_(visible_team_ids),
-        )
-        .all()
-    )
-
-    for submission in submissions:
-        project_id = int(getattr(submission, "ProjectId", 0) or 0)
-        if project_id in counts_by_project:
-            counts_by_project[project_id] += 1
-
+    counts_by_project.update(gold_division_repo.count_submissions_by_project(project_ids, visible_team_ids))
     return counts_by_project
 
 def build_project_review_counts(projects, visible_team_ids: list[int]) -> dict[int, dict[str, int]]:
@@ -315,7 +331,7 @@ def build_project_review_counts(projects, visible_team_ids: list[int]) -> dict[i
 
     return counts_by_project
 
-def build_gold_project_review_counts(projects, visible_team_ids: list[int]) -> dict[int, dict[str, int]]:
+def build_gold_project_review_counts(gold_division_repo, projects, visible_team_ids: list[int]) -> dict[int, dict[str, int]]:
     project_ids = [int(proj.Id) for proj in (projects or [])]
     total_visible_teams = len(visible_team_ids)
 
@@ -331,41 +347,11 @@ def build_gold_project_review_counts(projects, visible_team_ids: list[int]) -> d
     if not project_ids or not visible_team_ids:
         return counts_by_project
 
-    seen_pairs: set[tuple[int, int]] = set()
-    submissions = (
-        GoldDivision.query
-        .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
-        .filter(
-            GoldDivision.ProjectId.in_(project_ids),
-            StudentUsers.TeamId.in_(visible_team_ids),
-        )
-        .order_by(
-            GoldDivision.ProjectId.asc(),
-            StudentUsers.TeamId.asc(),
-            GoldDivision.SubmittedAt.desc(),
-            GoldDivision.Id.desc(),
-        )
-        .all()
-    )
-
-    for submission in submissions:
-        project_id = int(getattr(submission, "ProjectId", 0) or 0)
-        student_id = int(getattr(submission, "StudentId", 0) or 0)
-
-        student = StudentUsers.query.get(student_id)
-        team_id = int(getattr(student, "TeamId", 0) or 0) if student else 0
-        key = (project_id, team_id)
-
-        if team_id <= 0 or key in seen_pairs:
-            continue
-
-        seen_pairs.add(key)
-
-        project_counts = counts_by_project.get(project_id)
-        if not project_counts:
-            continue
-
-        project_counts["SubmittedAtLeastOnceCount"] += 1
+    # One row per (project, team) that has submitted
+    for submission, _team_id in gold_division_repo.get_latest_team_submissions(project_ids=project_ids, team_ids=visible_team_ids):
+        project_counts = counts_by_project.get(int(submission.ProjectId))
+        if project_counts:
+            project_counts["SubmittedAtLeastOnceCount"] += 1
 
     for project_counts in counts_by_project.values():
         project_counts["NotSubmittedCount"] = max(
@@ -378,43 +364,47 @@ def build_gold_project_review_counts(projects, visible_team_ids: list[int]) -> d
 @projects_api.route('/all_projects', methods=['GET'])
 @jwt_required()
 @inject
-def all_projects(project_repo: ProjectRepository = Provide[Container.project_repo], submission_repo: SubmissionRepository = Provide[Container.submission_repo], user_repo: UserRepository = Provide[Container.user_repo]):
+def all_projects(project_repo: ProjectRepository = Provide[Container.project_repo], submission_repo: SubmissionRepository = Provide[Container.submission_repo], user_repo: UserRepository = Provide[Container.user_repo], gold_division_repo: GoldDivisionRepository = Provide[Container.gold_division_repo]):
     if not isinstance(current_user, (AdminUsers, StudentUsers)):
         return make_response({'message': 'Access Denied'}, HTTPStatus.UNAUTHORIZED)
 
     division_filter = normalize_division(request.args.get("division"))
 
-    data = project_repo.get_all_projects()
-    data = [
-        proj for proj in data
-        if normalize_division(getattr(proj, "Division", "blue")) == division_filter
-    ]
+    def build():
+        data = project_repo.get_all_projects()
+        data = [
+            proj for proj in data
+            if normalize_division(getattr(proj, "Division", "blue")) == division_filter
+        ]
 
-    visible_team_ids = get_visible_team_ids_for_project_summary(division_filter)
+        visible_team_ids = get_visible_team_ids_for_project_summary(division_filter)
 
-    if division_filter == "gold":
-        review_counts = build_gold_project_review_counts(data, visible_team_ids)
-        total_submission_counts = build_gold_project_total_submission_counts(data, visible_team_ids)
-    else:
-        review_counts = build_project_review_counts(data, visible_team_ids)
-        total_submission_counts = build_project_total_submission_counts(data, visible_team_ids)
-
-    new_projects = [
-        {
-            "Id": proj.Id,
-            "Name": proj.Name,
-            "Type": proj.Type,
-            "Division": normalize_division(getattr(proj, "Division", "blue")),
-            "GoldProblemType": normalize_gold_problem_type(getattr(proj, "GoldProblemType", "normal")),
-            "DescriptionText": getattr(proj, "DescriptionText", None),
-            "OrderIndex": proj.OrderIndex,
-            "TotalSubmissions": total_submission_counts.get(proj.Id, 0),
-            "NotSubmittedCount": review_counts.get(proj.Id, {}).get("NotSubmittedCount", 0),
-            "SubmittedAtLeastOnceCount": review_counts.get(proj.Id, {}).get("SubmittedAtLeastOnceCount", 0),
-            "PassingAllTestcasesCount": review_counts.get(proj.Id, {}).get("PassingAllTestcasesCount", 0),
-        } for proj in data
-    ]
-    return jsonify(new_projects)
+        if division_filter == "gold":
+            review_counts = build_gold_project_review_counts(gold_division_repo, data, visible_team_ids)
+            total_submission_counts = build_gold_project_total_submission_counts(gold_division_repo, data, visible_team_ids)
+        else:
+            review_counts = build_project_review_counts(data, visible_team_ids)
+            total_submission_counts = build_project_total_submission_counts(data, visible_team_ids)
+
+        new_projects = [
+            {
+                "Id": proj.Id,
+                "Name": proj.Name,
+                "Type": proj.Type,
+                "Division": normalize_division(getattr(proj, "Division", "blue")),
+                "GoldProblemType": normalize_gold_problem_type(getattr(proj, "GoldProblemType", "normal")),
+                "DescriptionText": getattr(proj, "DescriptionText", None),
+                "OrderIndex": proj.OrderIndex,
+                "TotalSubmissions": total_submission_counts.get(proj.Id, 0),
+                "NotSubmittedCount": review_counts.get(proj.Id, {}).get("NotSubmittedCount", 0),
+                "SubmittedAtLeastOnceCount": review_counts.get(proj.Id, {}).get("SubmittedAtLeastOnceCount", 0),
+                "PassingAllTestcasesCount": review_counts.get(proj.Id, {}).get("PassingAllTestcasesCount", 0),
+            } for proj in data
+        ]
+        return new_projects
+
+    cache_key = f"all_projects:{cache_generation('projects')}:{division_filter}:{project_summary_scope()}"
+    return json_bytes_response(get_cached_json(cache_key, build, timeout=ALL_PROJECTS_CACHE_SECONDS))
 
 @projects_api.route('/competition_schedule', methods=['GET'])
 def competition_schedule():
@@ -462,6 +452,7 @@ def create_project(project_repo: ProjectRepository = Provide[Container.project_r
     project_type = request.form.get('project_type', '').strip()
     division = normalize_division(request.form.get('division'))
     gold_problem_type = normalize_gold_problem_type(request.form.get('gold_problem_type'))
+    stop_on_first_failure = parse_bool_flag(request.form.get('stop_on_first_failure'))
 
     if name == '' or project_type not in PROJECT_TYPES:
         return make_response("Error in form", HTTPStatus.BAD_REQUEST)
@@ -538,9 +529,11 @@ def create_project(project_repo: ProjectRepository = Provide[Container.project_r
     if created:
         created.Division = division
         created.GoldProblemType = gold_problem_type
+        created.StopOnFirstFailure = stop_on_first_failure
         created.DescriptionText = None
         db.session.commit()
 
+    bump_cache_generation("projects")
     return make_response(str(new_project_id), HTTPStatus.OK)
 
 @projects_api.route('/edit_project', methods=['POST'])
@@ -560,6 +553,7 @@ def edit_project(project_repo: ProjectRepository = Provide[Container.project_rep
     project_type = request.form.get('project_type', '').strip().lower()
     division = normalize_division(request.form.get('division'))
     gold_problem_type = normalize_gold_problem_type(request.form.get('gold_problem_type'))
+    stop_on_first_failure_raw = request.form.get('stop_on_first_failure')
     
     if name == '' or project_type not in PROJECT_TYPES:
         return make_response({'message': 'Error in form'}, HTTPStatus.BAD_REQUEST)
@@ -635,6 +629,7 @@ def edit_project(project_repo: ProjectRepository = Provide[Container.project_rep
             proj_row.DescriptionText = None
             db.session.commit()
 
+        bump_cache_generation("projects")
         return make_response("Project Edited", HTTPStatus.OK)
 
     if language == '':
@@ -772,166 +767,41 @@ def edit_project(project_repo: ProjectRepository = Provide[Container.project_rep
     if proj_row:
         proj_row.Division = division
         proj_row.GoldProblemType = gold_problem_type
+        if stop_on_first_failure_raw is not None:
+            proj_row.StopOnFirstFailure = parse_bool_flag(stop_on_first_failure_raw)
         proj_row.DescriptionText = None
         db.session.commit()
 
-    # Recompute testcase outputs against the path we just wrote, so we don't depend on
-    # any cached ORM objects or delayed reads.
-    try:
-        # Recompute if either the solution OR the additional file changed.
-        # If only the additional file changed, let recompute pick up the project's saved solution.
-        if solution_changed or additional_file_changed:
-            recompute_expected_outputs(
-                project_repo,
-                int(pid),
-                solution_override_path=(path if solution_changed else None),
-                language_override=language,
-            )
-    except Exception as e:
-        # Don't block the edit on recompute failures, but surface why outputs didn't refresh.
-        import traceback
-        print(f"[edit_project] recompute_expected_outputs failed: {e}", flush=True)
-        traceback.print_exc()
+    bump_cache_generation("projects")
+
+    # Recompute testcase outputs against the path we just wrote, in the background.
+    # Recompute if either the solution OR the additional file changed.
+    # If only the additional file changed, let recompute pick up the project's saved solution.
+    if solution_changed or additional_file_changed:
+        start_recompute_job(
+            current_app._get_current_object(),
+            int(pid),
+            solution_override_path=(path if solution_changed else None),
+            language_override=language,
+        )
 
     return make_response("Project Edited", HTTPStatus.OK)
 
 def has_allowed_ext(path: str) -> bool:
     return os.path.splitext(path)[1].lower() in ALLOWED_SOURCE_EXTS
 
-def run_solution_for_input(solution_root: str, language: str, input_text: str, project_id: int, additional_file_path: str = "") -> str:
-    """
-    Execute code strictly via /tabot-files/grading-scripts/grade.py (ADMIN path).
-    Returns stdout (or stderr) with normalized newlines, or "" on failure.
-    """
-    if not solution_root or not os.path.exists(solution_root):
-        return ""
-    script = "/tabot-files/grading-scripts/grade.py"
-
-    # Expand DB-stored additional file names to absolute paths under solution_root.
-    add_arg = additional_file_path or ""
-    try:
-        base_dir = solution_root if os.path.isdir(solution_root) else os.path.dirname(solution_root)
-        raw = add_arg.strip() if isinstance(add_arg, str) else ""
-        if raw.startswith("[") or raw.startswith("{"):
-            lst = json.loads(raw)
-        else:
-            lst = [raw] if raw else []
-        abs_list = []
-        for p in (lst or []):
-            if not p:
-                continue
-            if os.path.isabs(p):
-                abs_list.append(p)
-            else:
-                abs_list.append(os.path.join(base_dir, os.path.basename(p)))
-        add_arg = json.dumps(abs_list)
-    except Exception:
-        add_arg = additional_file_path or ""
-
-    args = [
-        "python", script,
-        "ADMIN",              # student_name triggers admin path
-        language or "python", # language as tabot expects
-        input_text or "",     # goes to admin_run(user_input)
-        solution_root,        # file or directory
-        add_arg,
-        str(project_id or 0),
-    ]
-    try:
-        proc = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=os.path.dirname(solution_root) if os.path.isfile(solution_root) else solution_root)
-    except Exception:
-        return ""
-    out = (proc.stdout or "").strip()
-    err = (proc.stderr or "").strip()
-    return (out or err)
-
-def load_tabot_module():
-    """
-    Try to import tabot as a normal module first.
-    If that fails, load it from /ta-bot/grading-scripts and make sure
-    its directory is on sys.path so sibling imports (output, tests)
-    resolve correctly.
-    """
-    try:
-        import tabot as _t
-        return _t
-    except Exception:
-        pass
-
-    grading_dir = "/tabot-files/grading-scripts"
-    grading_path = os.path.join(grading_dir, "grade.py")
-
-    spec = importlib.util.spec_from_file_location("tabot-files", grading_path)
-    if not spec or not spec.loader:
-        raise ImportError(f"Cannot load spec for {grading_path}")
-
-    # Ensure sibling imports like `from output import *` work
-    sys.path.insert(0, grading_dir)
-    try:
-        mod = importlib.util.module_from_spec(spec)
-        sys.modules["tabot"] = mod  # let subimports see the module name
-        # Optional but helps some relative-import edge cases:
-        mod.__package__ = None
-        spec.loader.exec_module(mod)
-        return mod
-    finally:
-        # Avoid permanently polluting sys.path
-        try:
-            sys.path.remove(grading_dir)
-        except ValueError:
-            pass
-
-try:
-    TABOT = load_tabot_module()
-except Exception as e:
-    TABOT = None
-    print(f"[projects] Warning: tabot import failed (will use subprocess path): {e}", flush=True)
-
-def recompute_expected_outputs(project_repo, project_id, *, solution_override_path: str = None, language_override: str = None):    
-    
-    """
-    For each testcase, run the (updated) solution and persist the new output.
-    """
-
-    # Always fetch the project once (needed for class id, fallback language, etc.)
-    try:
-        proj_obj = project_repo.get_selected_project(int(project_id))
-    except Exception:
-        proj_obj = None
-
-    if solution_override_path and os.path.exists(solution_override_path):
-        solution_root = solution_override_path
-        lang = (language_override or (getattr(proj_obj, "Language", "") if proj_obj else "")).strip()
-    else:
-        if not proj_obj or not getattr(proj_obj, "solutionpath", None):
-            return
-        solution_root = getattr(proj_obj, "solutionpath", "")
-        lang = getattr(proj_obj, "Language", "")
-
-    cases = project_repo.get_testcases(str(project_id))
+@projects_api.route('/recompute_status', methods=['GET'])
+@jwt_required()
+@inject
+def recompute_status(user_repo: UserRepository = Provide[Container.user_repo]):
+    if not user_repo.is_admin():
+        return make_response({'message': 'Access Denied'}, HTTPStatus.UNAUTHORIZED)
 
-    for tc_id, vals in cases.items():
-        add_path = getattr(proj_obj, "AdditionalFilePath", "") if proj_obj else ""
-        try:
-            name = vals[1] if len(vals) > 1 else ""
-            desc = vals[2] if len(vals) > 2 else ""
-            inp = vals[3] if len(vals) > 3 else ""
-        except Exception:
-            name, desc, inp = "", "", "", False
+    project_id = request.args.get('project_id', type=int)
+    if project_id is None:
+        return make_response({'message': 'Missing project_id'}, HTTPStatus.BAD_REQUEST)
 
-        new_out = run_solution_for_input(solution_root, lang, inp, project_id, add_path)
-        try:
-            project_repo.add_or_update_testcase(
-                int(project_id),
-                int(tc_id),
-                name or "",
-                desc or "",
-                inp or "",
-                new_out,
-            )
-        except Exception:
-            # continue on individual failures
-            continue
+    return make_response(get_recompute_status(project_id), HTTPStatus.OK)
 
 @projects_api.route('/list_source_files', methods=['GET'])
 @jwt_required()
@@ -1026,6 +896,7 @@ def get_project(project_repo: ProjectRepository = Provide[Container.project_repo
     if isinstance(project_info, dict):
         project_info["division"] = normalize_division(getattr(proj_row, "Division", "blue") if proj_row else "blue")
         project_info["goldProblemType"] = normalize_gold_problem_type(getattr(proj_row, "GoldProblemType", "normal") if proj_row else "normal")
+        project_info["stopOnFirstFailure"] = bool(getattr(proj_row, "StopOnFirstFailure", False)) if proj_row else False
         project_info["descriptionText"] = getattr(proj_row, "DescriptionText", None) if proj_row else None
         project_info["descriptionFile"] = (
             project_info.get("descriptionFile")
@@ -1075,6 +946,7 @@ def json_add_testcases(project_repo: ProjectRepository = Provide[Container.proje
                 testcase["input"],
                 testcase["output"],
                 bool(testcase.get("hidden", False)),
+                normalize_compare_policy(testcase.get("compare")),
             )
 
     return make_response("Testcase Added", HTTPStatus.OK)
@@ -1105,26 +977,13 @@ def add_or_update_testcase(project_repo: ProjectRepository = Provide[Container.p
     except ValueError:
         return make_response("Invalid numeric id", HTTPStatus.BAD_REQUEST)
 
-    def parse_hidden(v: str) -> bool:
-        s = (v or "").strip().lower()
-        return s in ("1", "true", "yes", "y", "on")
-
-    hidden = parse_hidden(hidden_raw)
-
-    # Auto-recompute expected output when editing a testcase.
-    # If the project's language is Python, run the saved solution with the new input
-    # and overwrite the provided `output` with the program's stdout.
-    try:
-        project = project_repo.get_selected_project(int(project_id))
-        language = (getattr(project, "Language", "") or "")
-        solution_root = (getattr(project, "solutionpath", "") or "")
-        add_path = getattr(project, "AdditionalFilePath", "") if project else ""
-        output = run_solution_for_input(solution_root, language, input_data, int(project_id), add_path)
-    except Exception:
-        # Fall back to the submitted output if recomputation fails
-        pass
+    hidden = parse_bool_flag(hidden_raw)
+    compare_raw = request.form.get('compare')
+    compare_policy = normalize_compare_policy(compare_raw) if compare_raw is not None else None
 
-    project_repo.add_or_update_testcase(project_id, id_val, name, description, input_data, output, hidden)
+    # The repository recomputes the expected output from the saved solution
+    # (falling back to the submitted output if that run fails).
+    project_repo.add_or_update_testcase(project_id, id_val, name, description, input_data, output, hidden, compare_policy)
 
     return make_response("Testcase Added", HTTPStatus.OK)
 
@@ -1236,6 +1095,7 @@ def reorder_projects(
             return make_response({'message': f'Project ID {proj_id} not found'}, HTTPStatus.BAD_REQUEST)
     db.session.commit()
 
+    bump_cache_generation("projects")
     return make_response("Projects Reordered", HTTPStatus.OK)
 
 @projects_api.route('/my_competition', methods=['GET'])
@@ -0,0 +1,76 @@
+from sqlalchemy import func, or_
+from typing import List, Optional
+
+from src.repositories.database import db
+from .models import GoldDivision, StudentUsers
+
+
+class GoldDivisionRepository:
+    def get_latest_team_submissions(
+        self,
+        project_ids: Optional[List[int]] = None,
+        team_ids: Optional[List[int]] = None,
+        teacher_id: Optional[int] = None,
+        graded_only: bool = False,
+    ) -> List[tuple[GoldDivision, int]]:
+        """
+        Latest submission per (project, team) as (submission, team_id), newest first.
+        One query: teams come from the StudentUsers join and the latest row is picked
+        with ROW_NUMBER() instead of a lookup per submission. With graded_only, only
+        rows with points, feedback or a grader are considered.
+        """
+        if project_ids is not None and not project_ids:
+            return []
+        if team_ids is not None and not team_ids:
+            return []
+
+        ranked = (
+            db.session.query(
+                GoldDivision.Id.label("SubmissionId"),
+                StudentUsers.TeamId.label("TeamId"),
+                func.row_number().over(
+                    partition_by=(GoldDivision.ProjectId, StudentUsers.TeamId),
+                    order_by=(GoldDivision.SubmittedAt.desc(), GoldDivision.Id.desc()),
+                ).label("RowNumber"),
+            )
+            .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
+            .filter(GoldDivision.ProjectId > 0, StudentUsers.TeamId > 0)
+        )
+        if project_ids is not None:
+            ranked = ranked.filter(GoldDivision.ProjectId.in_(project_ids))
+        if team_ids is not None:
+            ranked = ranked.filter(StudentUsers.TeamId.in_(team_ids))
+        if teacher_id is not None:
+            ranked = ranked.filter(StudentUsers.TeacherId == teacher_id)
+        if graded_only:
+            ranked = ranked.filter(or_(
+                GoldDivision.Points.isnot(None),
+                func.trim(func.coalesce(GoldDivision.Feedback, "")) != "",
+                GoldDivision.AdminGraderId.isnot(None),
+            ))
+        ranked = ranked.subquery()
+
+        rows = (
+            db.session.query(GoldDivision, ranked.c.TeamId)
+            .join(ranked, ranked.c.SubmissionId == GoldDivision.Id)
+            .filter(ranked.c.RowNumber == 1)
+            .order_by(GoldDivision.SubmittedAt.desc(), GoldDivision.Id.desc())
+            .all()
+        )
+        return [(submission, int(team_id)) for submission, team_id in rows]
+
+    def count_submissions_by_project(self, project_ids: List[int], team_ids: List[int]) -> dict[int, int]:
+        if not project_ids or not team_ids:
+            return {}
+
+        rows = (
+            db.session.query(GoldDivision.ProjectId, func.count(GoldDivision.Id))
+            .join(StudentUsers, StudentUsers.Id == GoldDivision.StudentId)
+            .filter(
+                GoldDivision.ProjectId.in_(project_ids),
+                StudentUsers.TeamId.in_(team_ids),
+            )
+            .group_by(GoldDivision.ProjectId)
+            .all()
+        )
+        return {int(project_id): int(count) for project_id, count in rows}
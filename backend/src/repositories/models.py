@@ -17,6 +17,7 @@ class Projects(db.Model):
     DescriptionText = Column(String)
     OrderIndex = Column(Integer)
     GoldProblemType = Column(String(20), nullable=False, default="normal")
+    StopOnFirstFailure = Column(Boolean, nullable=False, default=False)
     Submissions = relationship('Submissions')
     solutionpath = Column(String)
     AsnDescriptionPath = Column(String)
@@ -34,6 +35,8 @@ class Submissions(db.Model):
     User = Column(Integer, ForeignKey('StudentUsers.Id'))
     Project = Column(Integer, ForeignKey('Projects.Id'))
     TestCaseResults = Column(String)
+    GradingStatus = Column(String(16), nullable=False, default="graded")
+    GradingStartedAt = Column(DateTime, nullable=True)
 
 
 class LoginAttempts(db.Model):
@@ -53,6 +56,7 @@ class Testcases(db.Model):
     input = Column(String)
     Output = Column(String)
     Hidden = Column(Boolean, default=False)
+    ComparePolicy = Column(String(32), nullable=False, default="normalized")
 
 
 class Schools(db.Model):
@@ -110,6 +114,8 @@ class HelpRequests(db.Model):
     CurrentAdminId = Column(Integer, ForeignKey('AdminUsers.Id'), nullable=True)
     CreatedAt = Column(DateTime, default=func.now(), nullable=False)
     CompletedAt = Column(DateTime, nullable=True)
+    # Bumped on any change to the request or its conversation (drives ?since= polling)
+    UpdatedAt = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now(), index=True)
 
 
 class HelpRequestMessages(db.Model):
@@ -144,6 +150,7 @@ class TeamProjectStats(db.Model):
     Solved = Column(Boolean, nullable=False, default=False)
     AcceptedTimeMinutes = Column(Integer, nullable=True)
     CurrentSubmissionId = Column(Integer, nullable=False)
+    UpdatedAt = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now(), index=True)
 
     __table_args__ = (
         UniqueConstraint('TeamId', 'ProjectId', name='teamprojectstats_team_project_unique'),
@@ -158,6 +165,9 @@ class ScoreboardSnapshots(db.Model):
     Minute = Column(Integer, nullable=False)
     TimeStamp = Column(DateTime, nullable=False)
     Payload = Column(Text, nullable=False)
+    # "full" keyframe, or "delta" holding only what changed since the keyframe at BaseMinute
+    Kind = Column(String(8), nullable=False, default="full")
+    BaseMinute = Column(Integer, nullable=True)
 
     __table_args__ = (
         UniqueConstraint('Division', 'IsOnline', 'Minute', name='scoreboardsnapshots_division_online_minute_unique'),
@@ -2,7 +2,6 @@ from abc import ABC, abstractmethod
 import os
 import random
 import shutil
-import subprocess
 from typing import Optional, Dict
 from flask import send_file
 from sqlalchemy.sql.expression import asc
@@ -15,6 +14,7 @@ import asyncio
 import json
 
 from src.constants import COMPETITION_PROBLEM_MAX
+from src.services.grading_engine import run_solution_for_input
 
 class ProjectRepository():
 
@@ -146,7 +146,8 @@ class ProjectRepository():
                 "description": t.Description,
                 "input": t.input,
                 "output": t.Output,
-                "hidden": bool(getattr(t, "Hidden", False))
+                "hidden": bool(getattr(t, "Hidden", False)),
+                "compare": getattr(t, "ComparePolicy", None) or "normalized",
             })
 
         return testcase_info
@@ -160,59 +161,19 @@ class ProjectRepository():
         input_data: str,
         output: str,
         hidden: bool = False,
+        compare_policy: Optional[str] = None,
     ):
-        from flask import current_app
-
-        # Fetch project and determine teacher directory base
         project = Projects.query.filter(Projects.Id == project_id).first()
-        teacher_base = current_app.config["TEACHER_FILES_DIR"]
-        # Ensure solutionpath points to the teacher project folder
-        project_base = project.solutionpath  
-
-        # Run grading-script to compute default output if none provided
-        grading_script = os.path.join(
-            current_app.root_path, "..", "tabot-files", "grading-scripts", "grade.py"
-        )
-
-        add_path = getattr(project, "AdditionalFilePath", "") or ""
-        # Expand stored names to absolute paths under the teacher project folder for grade.py
-        try:
-            base_dir = project_base if os.path.isdir(project_base) else os.path.dirname(project_base)
-            raw = (add_path or "").strip()
-            if raw.startswith("[") or raw.startswith("{"):
-                lst = json.loads(raw)
-            else:
-                lst = [raw] if raw else []
-            abs_list = []
-            for p in (lst or []):
-                if not p:
-                    continue
-                if os.path.isabs(p):
-                    abs_list.append(p)
-                else:
-                    abs_list.append(os.path.join(base_dir, os.path.basename(p)))
-            add_path = json.dumps(abs_list)
-        except Exception:
-            pass
-        #   grade.py ADMIN <language> <input_text> <solution_path> [additional_files_json]
-        result = subprocess.run(
-            [
-                "python",
-                grading_script,
-                "ADMIN",
-                project.Language,
-                input_data,
-                project_base,
-                add_path,
-                str(project_id),
-            ],
-            stdout=subprocess.PIPE,
-            text=True,
-        )
 
         # Always prefer recomputed output (includes AdditionalFilePath);
         # fall back to provided output only if recompute failed/empty.
-        recomputed = (result.stdout or "").strip()
+        recomputed = run_solution_for_input(
+            project.solutionpath,
+            project.Language,
+            input_data,
+            project_id,
+            getattr(project, "AdditionalFilePath", "") or "",
+        )
         if recomputed:
             output = recomputed
 
@@ -227,6 +188,7 @@ class ProjectRepository():
                 input=input_data,
                 Output=output,
                 Hidden=bool(hidden),
+                ComparePolicy=compare_policy or "normalized",
             )
             db.session.add(testcase)
         else:
@@ -235,8 +197,28 @@ class ProjectRepository():
             testcase.input = input_data
             testcase.Output = output
             testcase.Hidden = bool(hidden)
+            if compare_policy is not None:
+                testcase.ComparePolicy = compare_policy
+
+        db.session.commit()
+
+    def update_testcase_outputs(self, project_id: int, outputs: Dict[int, str]) -> int:
+        """
+        Writes recomputed expected outputs for many testcases in one transaction.
+        Returns the number of testcases updated.
+        """
+        if not outputs:
+            return 0
+
+        testcases = Testcases.query.filter(
+            Testcases.ProjectId == project_id,
+            Testcases.Id.in_(list(outputs.keys())),
+        ).all()
+        for testcase in testcases:
+            testcase.Output = outputs[testcase.Id]
 
         db.session.commit()
+        return len(testcases)
 
     def remove_testcase(self, testcase_id: int):
         testcase = Testcases.query.filter(Testcases.Id == testcase_id).first()
@@ -277,7 +259,7 @@ class ProjectRepository():
                 test.Description,
                 test.input,
                 test.Output,
-                add_list,
+                {"files": add_list, "compare": getattr(test, "ComparePolicy", None) or "normalized"},
                 bool(getattr(test, "Hidden", False)),
             ]
         json_object = json.dumps(testcase_holder)
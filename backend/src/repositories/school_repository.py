@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from sqlalchemy import and_, func
+
 from src.repositories.database import db
 from .models import AdminUsers, StudentUsers, Schools, Teams
 
@@ -30,6 +32,31 @@ class SchoolRepository:
                 .all()
         )
 
+    def get_team_counts_by_school(self) -> List[tuple[int, str, bool, int]]:
+        """
+        (school_id, division, is_online, team count) for every school with teams, in one grouped query.
+        """
+        rows = (
+            db.session.query(Teams.SchoolId, Teams.Division, Teams.IsOnline, func.count(Teams.Id))
+            .group_by(Teams.SchoolId, Teams.Division, Teams.IsOnline)
+            .all()
+        )
+        return [(int(school_id), division or "", bool(is_online), int(count)) for school_id, division, is_online, count in rows]
+
+    def get_student_counts_by_school(self) -> List[tuple[int, str, bool, int]]:
+        """
+        (school_id, division, is_online, student count) grouped by the student's team, counting
+        only students whose team belongs to their own school.
+        """
+        rows = (
+            db.session.query(Teams.SchoolId, Teams.Division, Teams.IsOnline, func.count(StudentUsers.Id))
+            .select_from(StudentUsers)
+            .join(Teams, and_(Teams.Id == StudentUsers.TeamId, Teams.SchoolId == StudentUsers.SchoolId))
+            .group_by(Teams.SchoolId, Teams.Division, Teams.IsOnline)
+            .all()
+        )
+        return [(int(school_id), division or "", bool(is_online), int(count)) for school_id, division, is_online, count in rows]
+
     def get_school_by_teacher_id(self, teacher_id: int) -> Optional[Schools]:
         admin = AdminUsers.query.filter(AdminUsers.Id == teacher_id).one_or_none()
         if not admin:
@@ -1,8 +1,9 @@
 from collections import defaultdict
 import json
 import os
-from sqlalchemy import and_, desc
-from typing import Dict, List
+from sqlalchemy import and_, case, desc, func, or_
+from sqlalchemy.orm import aliased
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 from src.repositories.database import db
@@ -10,7 +11,11 @@ from .models import (
     Submissions,
     Projects,
     StudentUsers,
+    AdminUsers,
+    Teams,
+    Schools,
     HelpRequests,
+    HelpRequestMessages,
     TeamProjectStats,
 )
 
@@ -54,6 +59,7 @@ class SubmissionRepository():
         project_id: int,
         status: bool,
         testcase_results: str,
+        grading_status: str = "graded",
     ):
         submission = Submissions(
             OutputFilepath=output,
@@ -64,12 +70,81 @@ class SubmissionRepository():
             Project=project_id,
             IsPassing=status,
             TestCaseResults=str(testcase_results),
+            GradingStatus=grading_status,
         )
         db.session.add(submission)
         db.session.commit()
         created_id = submission.Id
         return created_id
 
+    def claim_pending_submission(self, submission_id: int) -> bool:
+        """
+        Atomically moves a pending submission to running and stamps the claim time.
+        Returns False when another grading worker already claimed it.
+        """
+        claimed = (
+            Submissions.query
+            .filter(
+                Submissions.Id == submission_id,
+                Submissions.GradingStatus == "pending",
+            )
+            .update(
+                {
+                    Submissions.GradingStatus: "running",
+                    Submissions.GradingStartedAt: datetime.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+        return claimed == 1
+
+    def complete_submission_grading(
+        self,
+        submission_id: int,
+        status: bool,
+        testcase_results,
+        grading_status: str = "graded",
+    ) -> None:
+        submission = Submissions.query.filter(Submissions.Id == submission_id).first()
+        if submission is None:
+            return
+
+        submission.IsPassing = status
+        submission.TestCaseResults = str(testcase_results)
+        submission.GradingStatus = grading_status
+        db.session.commit()
+
+    def get_stale_grading_submission_ids(self, older_than: datetime) -> List[int]:
+        """
+        Resets running submissions whose claim is older than older_than (the worker died
+        mid-grade) back to pending, then returns every pending submission uploaded before
+        older_than. Rows still inside their claim window are left to their worker.
+        """
+        (
+            Submissions.query
+            .filter(
+                Submissions.GradingStatus == "running",
+                or_(
+                    Submissions.GradingStartedAt.is_(None),
+                    Submissions.GradingStartedAt < older_than,
+                ),
+            )
+            .update({Submissions.GradingStatus: "pending"}, synchronize_session=False)
+        )
+        db.session.commit()
+
+        rows = (
+            db.session.query(Submissions.Id)
+            .filter(
+                Submissions.GradingStatus == "pending",
+                Submissions.Time < older_than,
+            )
+            .order_by(Submissions.Id.asc())
+            .all()
+        )
+        return [int(row.Id) for row in rows]
+
     def get_total_submission_for_all_projects(self) -> Dict[int, int]:
         thisdic = {}
         project_ids = Projects.query.with_entities(Projects.Id).all()
@@ -192,6 +267,124 @@ class SubmissionRepository():
 
         return HelpRequests.query.order_by(desc(HelpRequests.CreatedAt)).all()
 
+    def get_help_request_summaries(
+        self,
+        since: datetime | None = None,
+        cursor: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[dict], tuple[datetime, int] | None]:
+        """
+        Help requests newest first with everything the admin dashboard shows, in two
+        queries: one joining student/team/school/project/teacher/admin, one picking the
+        latest message and message count per request.
+        since keeps requests whose UpdatedAt is at or after it; cursor is the
+        (CreatedAt, Id) of the last row of the previous page.
+        Returns (rows, next_cursor).
+        """
+        teacher = aliased(AdminUsers)
+        admin = aliased(AdminUsers)
+
+        query = (
+            db.session.query(HelpRequests, StudentUsers, Teams, Projects, teacher, admin, Schools)
+            .outerjoin(StudentUsers, StudentUsers.Id == HelpRequests.StudentId)
+            .outerjoin(Teams, Teams.Id == StudentUsers.TeamId)
+            .outerjoin(Projects, Projects.Id == HelpRequests.ProblemId)
+            .outerjoin(teacher, teacher.Id == HelpRequests.TeacherId)
+            .outerjoin(admin, admin.Id == HelpRequests.CurrentAdminId)
+            # The team's school; the teacher's only when the student has no team
+            .outerjoin(Schools, Schools.Id == case((Teams.Id.is_(None), teacher.SchoolId), else_=Teams.SchoolId))
+        )
+        if since is not None:
+            query = query.filter(HelpRequests.UpdatedAt >= since)
+        if cursor is not None:
+            created_at, request_id = cursor
+            query = query.filter(or_(
+                HelpRequests.CreatedAt < created_at,
+                and_(HelpRequests.CreatedAt == created_at, HelpRequests.Id < request_id),
+            ))
+        query = query.order_by(desc(HelpRequests.CreatedAt), desc(HelpRequests.Id))
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        rows = query.all()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = (last.CreatedAt, int(last.Id))
+
+        latest_by_request = self.get_latest_help_request_messages([int(row[0].Id) for row in rows])
+
+        summaries = []
+        for req, student, team, project, teacher_user, admin_user, school in rows:
+            latest_message, message_count = latest_by_request.get(int(req.Id), (None, 0))
+            summaries.append({
+                "request": req,
+                "student": student,
+                "team": team,
+                "project": project,
+                "teacher": teacher_user,
+                "admin": admin_user,
+                "school": school,
+                "latestMessage": latest_message,
+                "messageCount": message_count,
+            })
+        return summaries, next_cursor
+
+    def get_latest_help_request_messages(self, request_ids: List[int]) -> Dict[int, tuple[HelpRequestMessages, int]]:
+        """
+        {request_id: (latest message, message count)} for the given requests, in one query.
+        """
+        if not request_ids:
+            return {}
+
+        ranked = (
+            db.session.query(
+                HelpRequestMessages.Id.label("MessageId"),
+                func.row_number().over(
+                    partition_by=HelpRequestMessages.HelpRequestId,
+                    order_by=(desc(HelpRequestMessages.CreatedAt), desc(HelpRequestMessages.Id)),
+                ).label("RowNumber"),
+                func.count(HelpRequestMessages.Id).over(
+                    partition_by=HelpRequestMessages.HelpRequestId,
+                ).label("MessageCount"),
+            )
+            .filter(HelpRequestMessages.HelpRequestId.in_(request_ids))
+            .subquery()
+        )
+
+        rows = (
+            db.session.query(HelpRequestMessages, ranked.c.MessageCount)
+            .join(ranked, ranked.c.MessageId == HelpRequestMessages.Id)
+            .filter(ranked.c.RowNumber == 1)
+            .all()
+        )
+        return {int(message.HelpRequestId): (message, int(count)) for message, count in rows}
+
+    def get_help_request_messages(self, request_id: int, after_id: Optional[int] = None) -> List[HelpRequestMessages]:
+        query = HelpRequestMessages.query.filter(HelpRequestMessages.HelpRequestId == request_id)
+        if after_id:
+            query = query.filter(HelpRequestMessages.Id > after_id)
+        return query.order_by(HelpRequestMessages.CreatedAt.asc(), HelpRequestMessages.Id.asc()).all()
+
+    def get_help_request_message_state(self, request_id: int) -> tuple[int, int]:
+        """
+        (max message id, message count) for a thread; changes whenever a message is added
+        or removed, and is answered from the HelpRequestId index alone.
+        """
+        max_id, count = (
+            db.session.query(func.max(HelpRequestMessages.Id), func.count(HelpRequestMessages.Id))
+            .filter(HelpRequestMessages.HelpRequestId == request_id)
+            .one()
+        )
+        return int(max_id or 0), int(count or 0)
+
+    def get_help_request_ids(self) -> List[int]:
+        return [int(request_id) for (request_id,) in db.session.query(HelpRequests.Id).all()]
+
+    def get_database_time(self) -> datetime:
+        return db.session.query(func.now()).scalar()
+
     def get_student_help_requests(self, student_id: int, teacher_id: int) -> List[HelpRequests]:
 
         return HelpRequests.query.filter(
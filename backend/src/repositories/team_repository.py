@@ -1,8 +1,10 @@
+from datetime import datetime
 from sqlalchemy import func, case
-from typing import Any, List
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Callable, List
 
 from src.repositories.database import db
-from .models import StudentUsers, TeamProjectStats, Teams, Schools, Projects, ScoreboardSnapshots
+from .models import StudentUsers, Submissions, TeamProjectStats, Teams, Schools, Projects, ScoreboardSnapshots
 
 class TeamRepository:
     def get_team_by_id(self, team_id: int) -> Teams | None:
@@ -66,49 +68,77 @@ class TeamRepository:
     def get_team_by_name(self, school_id: int, name: str) -> Teams | None:
         return Teams.query.filter(Teams.SchoolId == school_id, func.lower(Teams.Name) == func.lower(name)).one_or_none()
 
-    def create_team_project_stats_entry(
-        self,
-        team_id: int,
-        project_id: int,
-        solved: bool,
-        accepted_time_minutes: int | None,
-        current_submission_id: int,
-    ):
-        entry = TeamProjectStats(
-            TeamId=team_id,
-            ProjectId=project_id,
-            Attempts=1,
-            Solved=solved,
-            AcceptedTimeMinutes=accepted_time_minutes,
-            CurrentSubmissionId=current_submission_id,
-        )
-        db.session.add(entry)
-        db.session.commit()
-        return entry.Id
+    def get_team_project_stats(self, team_id: int, project_id: int) -> TeamProjectStats | None:
+        return TeamProjectStats.query.filter(
+            TeamProjectStats.TeamId == team_id,
+            TeamProjectStats.ProjectId == project_id,
+        ).first()
 
-    def update_team_project_stats_entry(
+    def recompute_team_project_stats(
         self,
         team_id: int,
         project_id: int,
-        solved: bool,
-        accepted_time_minutes: int | None,
-        current_submission_id: int,
-    ):
-        entry = TeamProjectStats.query.filter(
+        accepted_minutes_for: Callable[[Submissions], int | None],
+    ) -> TeamProjectStats | None:
+        """
+        Rebuilds a team's stats row from its graded submissions in Id (upload) order, so
+        the result does not depend on which grading worker finished first. Attempts counts
+        graded submissions up to and including the first passing one; accepted_minutes_for
+        gives that submission's scoreboard minute. The row is locked while it is rebuilt so
+        two workers for the same team/project cannot overwrite each other.
+        """
+        stats_filter = (
             TeamProjectStats.TeamId == team_id,
             TeamProjectStats.ProjectId == project_id,
-        ).first()
+        )
+        graded = (
+            Submissions.query
+            .filter(
+                Submissions.Team == team_id,
+                Submissions.Project == project_id,
+                Submissions.GradingStatus == "graded",
+            )
+            .order_by(Submissions.Id.asc())
+        )
+
+        if TeamProjectStats.query.filter(*stats_filter).first() is None:
+            first = graded.first()
+            if first is None:
+                return None
+            try:
+                db.session.add(TeamProjectStats(
+                    TeamId=team_id,
+                    ProjectId=project_id,
+                    Attempts=0,
+                    Solved=False,
+                    CurrentSubmissionId=first.Id,
+                ))
+                db.session.commit()
+            except IntegrityError:
+                # Another worker created the row for this team/project first
+                db.session.rollback()
+
+        entry = TeamProjectStats.query.filter(*stats_filter).with_for_update().one()
+
+        attempts = 0
+        solved = False
+        accepted_time_minutes = None
+        current_submission_id = entry.CurrentSubmissionId
+        for submission in graded.all():
+            attempts += 1
+            current_submission_id = submission.Id
+            if submission.IsPassing:
+                solved = True
+                accepted_time_minutes = accepted_minutes_for(submission)
+                break
+
+        entry.Attempts = attempts
+        entry.Solved = solved
+        entry.AcceptedTimeMinutes = accepted_time_minutes
+        entry.CurrentSubmissionId = current_submission_id
+        db.session.commit()
+        return entry
 
-        if entry is not None and not entry.Solved:
-            entry.Attempts += 1
-            entry.CurrentSubmissionId = current_submission_id
-            if solved:
-                entry.Solved = True
-                entry.AcceptedTimeMinutes = accepted_time_minutes
-            db.session.commit()
-            return True
-        return False
-    
     def get_empty_scoreboard(self, division: str, is_online: bool) -> dict[str, Any]:
         team_rows = (
             db.session.query(
@@ -196,6 +226,35 @@ class TeamRepository:
 
         return {(s.TeamId, s.ProjectId): s for s in stat_rows}
 
+    def get_scoreboard_roster(self, division: str, is_online: bool) -> list[Any]:
+        return (
+            db.session.query(
+                Teams.Id.label("TeamId"),
+                Teams.Name.label("TeamName"),
+                Schools.Name.label("SchoolName"),
+            )
+            .join(Schools, Schools.Id == Teams.SchoolId)
+            .filter(Teams.Division == division, Teams.IsOnline == is_online)
+            .all()
+        )
+
+    def get_project_stats_changed_since(
+        self,
+        division: str,
+        is_online: bool,
+        project_ids: list[int],
+        since: datetime | None = None,
+    ) -> list[TeamProjectStats]:
+        '''TeamProjectStats rows for the division touched at or after `since` (all rows when None)'''
+        query = TeamProjectStats.query.join(Teams, Teams.Id == TeamProjectStats.TeamId).filter(
+            Teams.Division == division,
+            Teams.IsOnline == is_online,
+            TeamProjectStats.ProjectId.in_(project_ids),
+        )
+        if since is not None:
+            query = query.filter(TeamProjectStats.UpdatedAt >= since)
+        return query.all()
+
     def get_latest_scoreboard_snapshot(self, division: str, is_online: bool, max_minute: int | None = None) -> ScoreboardSnapshots | None:
         query = ScoreboardSnapshots.query.filter_by(Division=division, IsOnline=is_online)
 
@@ -203,4 +262,22 @@ class TeamRepository:
             query = query.filter(ScoreboardSnapshots.Minute <= max_minute)
         
         snapshot = query.order_by(ScoreboardSnapshots.Minute.desc()).first()
-        return snapshot
\ No newline at end of file
+        return snapshot
+
+    def get_latest_scoreboard_keyframe(self, division: str, is_online: bool, max_minute: int) -> ScoreboardSnapshots | None:
+        return (
+            ScoreboardSnapshots.query.filter_by(Division=division, IsOnline=is_online, Kind="full")
+            .filter(ScoreboardSnapshots.Minute <= max_minute)
+            .order_by(ScoreboardSnapshots.Minute.desc())
+            .first()
+        )
+
+    def get_scoreboard_snapshot_at(self, division: str, is_online: bool, minute: int) -> ScoreboardSnapshots | None:
+        return ScoreboardSnapshots.query.filter_by(Division=division, IsOnline=is_online, Minute=minute).first()
+
+    def get_scoreboard_snapshots(self, division: str, is_online: bool) -> list[ScoreboardSnapshots]:
+        return (
+            ScoreboardSnapshots.query.filter_by(Division=division, IsOnline=is_online)
+            .order_by(ScoreboardSnapshots.Minute.asc())
+            .all()
+        )
\ No newline at end of file
@@ -30,6 +30,12 @@ class UserRepository:
     def get_admin_by_id(self, user_id: int) -> Optional[AdminUsers]:
         return AdminUsers.query.filter(AdminUsers.Id == user_id).one_or_none()
 
+    def get_admins_by_ids(self, admin_ids: List[int]) -> dict[int, AdminUsers]:
+        admin_ids = {int(admin_id) for admin_id in admin_ids if admin_id}
+        if not admin_ids:
+            return {}
+        return {int(a.Id): a for a in AdminUsers.query.filter(AdminUsers.Id.in_(admin_ids)).all()}
+
     def does_admin_email_exist(self, email: str) -> bool:
         return AdminUsers.query.filter(AdminUsers.Email == email).first() is not None
 
@@ -95,6 +101,9 @@ class UserRepository:
     def get_teachers_by_school(self, school_id: int) -> Optional[AdminUsers]:
         return AdminUsers.query.filter(AdminUsers.SchoolId == school_id, AdminUsers.Role == 0).order_by(AdminUsers.Id.asc()).all()
 
+    def get_all_teachers(self) -> List[AdminUsers]:
+        return AdminUsers.query.filter(AdminUsers.Role == 0).order_by(AdminUsers.SchoolId.asc(), AdminUsers.Id.asc()).all()
+
     # -----------------------------
     # Student operations
     # -----------------------------
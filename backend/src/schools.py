@@ -8,9 +8,12 @@ from src.repositories.school_repository import SchoolRepository
 from src.repositories.user_repository import UserRepository
 from src.repositories.models import AdminUsers, Teams
 from src.constants import get_division_team_caps, get_division_member_limits
+from src.services.response_cache import cache_generation, get_cached_json, json_bytes_response
 
 school_api = Blueprint("school_api", __name__)
 
+SCHOOL_SUMMARY_CACHE_SECONDS = 300
+
 def teacher_id_for_school(school_id: int) -> int | None:
     teacher = (
         AdminUsers.query
@@ -140,122 +143,65 @@ def admin_school_summary(
     if (not school_repo.is_admin_user(current_user)) or int(getattr(current_user, "Role", 0) or 0) != 1:
         return jsonify({"message": "Unauthorized"}), 403
 
-    schools = school_repo.get_all_schools()
-    payload = []
+    def build():
+        divisions = ("Blue", "Gold", "Eagle")
 
-    for s in schools:
-        teachers = user_repo.get_teachers_by_school(int(s.Id))
-        teacher_data = []
-        for t in teachers:
+        teachers_by_school = {}
+        for t in user_repo.get_all_teachers():
             teacher_id = int(getattr(t, "Id", 0) or 0)
             first = (getattr(t, "Firstname", "") or "").strip()
             last = (getattr(t, "Lastname", "") or "").strip()
             name = (f"{first} {last}").strip() or None
             email = (getattr(t, "Email", None) or "").strip() or None
-            teacher_data.append({"id": teacher_id, "name": name, "email": email})
-
-        teams = Teams.query.filter_by(SchoolId=int(s.Id)).all()
-
-        division_team_counts = {"Blue": 0, "Gold": 0, "Eagle": 0}
-        virtual_division_team_counts = {"Blue": 0, "Gold": 0, "Eagle": 0}
-        team_meta_by_id = {}
-
-        for team in teams:
-            division = (getattr(team, "Division", "") or "").strip()
-            is_online = bool(getattr(team, "IsOnline", False))
+            teachers_by_school.setdefault(int(t.SchoolId or 0), []).append(
+                {"id": teacher_id, "name": name, "email": email}
+            )
 
-            team_meta_by_id[int(team.Id)] = {
-                "division": division,
-                "isOnline": is_online,
+        # {(school_id, division, is_online): count}, tallied from grouped rows
+        team_counts = {}
+        for school_id, division, is_online, count in school_repo.get_team_counts_by_school():
+            key = (school_id, division.strip(), is_online)
+            team_counts[key] = team_counts.get(key, 0) + count
+
+        student_counts = {}
+        for school_id, division, is_online, count in school_repo.get_student_counts_by_school():
+            key = (school_id, division.strip(), is_online)
+            student_counts[key] = student_counts.get(key, 0) + count
+
+        def division_counts(school_id: int, is_online: bool) -> dict:
+            return {
+                division: {
+                    "teamCount": team_counts.get((school_id, division, is_online), 0),
+                    "studentCount": student_counts.get((school_id, division, is_online), 0),
+                }
+                for division in divisions
             }
 
-            if division not in division_team_counts:
-                continue
-
-            if is_online:
-                virtual_division_team_counts[division] += 1
-            else:
-                division_team_counts[division] += 1
-
-        students = user_repo.get_students_for_school(int(s.Id))
-
-        division_student_counts = {"Blue": 0, "Gold": 0, "Eagle": 0}
-        virtual_division_student_counts = {"Blue": 0, "Gold": 0, "Eagle": 0}
-        in_person_student_count = 0
-        virtual_student_count = 0
-
-        for st in students:
-            tid = getattr(st, "TeamId", None)
-            if tid is None:
-                continue
-
-            try:
-                tid_int = int(tid)
-            except Exception:
-                continue
-
-            if tid_int <= 0:
-                continue
-
-            team_meta = team_meta_by_id.get(tid_int)
-            if not team_meta:
-                continue
-
-            division = team_meta.get("division")
-            is_online = bool(team_meta.get("isOnline", False))
-
-            if division not in division_student_counts:
-                continue
+        payload = []
+        for s in school_repo.get_all_schools():
+            school_id = int(s.Id)
+            in_person = division_counts(school_id, False)
+            virtual = division_counts(school_id, True)
 
-            if is_online:
-                virtual_division_student_counts[division] += 1
-                virtual_student_count += 1
-            else:
-                division_student_counts[division] += 1
-                in_person_student_count += 1
+            payload.append(
+                {
+                    "id": school_id,
+                    "name": getattr(s, "Name", "") or "",
+                    "teachers": teachers_by_school.get(school_id, []),
+                    "teamCount": sum(d["teamCount"] for d in in_person.values()),
+                    "studentCount": sum(d["studentCount"] for d in in_person.values()),
+                    "virtualTeamCount": sum(d["teamCount"] for d in virtual.values()),
+                    "virtualStudentCount": sum(d["studentCount"] for d in virtual.values()),
+                    "divisions": in_person,
+                    "virtualDivisions": virtual,
+                }
+            )
 
-        payload.append(
-            {
-                "id": int(s.Id),
-                "name": getattr(s, "Name", "") or "",
-                "teachers": teacher_data,
-                "teamCount": sum(division_team_counts.values()),
-                "studentCount": in_person_student_count,
-                "virtualTeamCount": sum(virtual_division_team_counts.values()),
-                "virtualStudentCount": virtual_student_count,
-                "divisions": {
-                    "Blue": {
-                        "teamCount": division_team_counts["Blue"],
-                        "studentCount": division_student_counts["Blue"],
-                    },
-                    "Gold": {
-                        "teamCount": division_team_counts["Gold"],
-                        "studentCount": division_student_counts["Gold"],
-                    },
-                    "Eagle": {
-                        "teamCount": division_team_counts["Eagle"],
-                        "studentCount": division_student_counts["Eagle"],
-                    },
-                },
-                "virtualDivisions": {
-                    "Blue": {
-                        "teamCount": virtual_division_team_counts["Blue"],
-                        "studentCount": virtual_division_student_counts["Blue"],
-                    },
-                    "Gold": {
-                        "teamCount": virtual_division_team_counts["Gold"],
-                        "studentCount": virtual_division_student_counts["Gold"],
-                    },
-                    "Eagle": {
-                        "teamCount": virtual_division_team_counts["Eagle"],
-                        "studentCount": virtual_division_student_counts["Eagle"],
-                    },
-                },
-            }
-        )
+        payload.sort(key=lambda x: (x.get("name") or "").lower())
+        return payload
 
-    payload.sort(key=lambda x: (x.get("name") or "").lower())
-    return jsonify(payload)
+    key = f"schools:admin_summary:{cache_generation('schools')}"
+    return json_bytes_response(get_cached_json(key, build, timeout=SCHOOL_SUMMARY_CACHE_SECONDS))
 
 @school_api.route("/id/<int:school_id>", methods=["GET"])
 @jwt_required()
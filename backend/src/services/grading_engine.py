@@ -0,0 +1,197 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+GRADING_DIR = "/tabot-files/grading-scripts"
+GRADING_SCRIPT = os.path.join(GRADING_DIR, "grade.py")
+
+# Concurrent solution runs when falling back to one subprocess per input
+SUBPROCESS_MAX_IN_FLIGHT = 8
+
+
+def load_tabot_module():
+    """
+    Try to import tabot as a normal module first.
+    If that fails, load it from /tabot-files/grading-scripts and make sure
+    its directory is on sys.path so sibling imports (judge0) resolve correctly.
+    """
+    try:
+        import tabot as _t
+        return _t
+    except Exception:
+        pass
+
+    spec = importlib.util.spec_from_file_location("tabot-files", GRADING_SCRIPT)
+    if not spec or not spec.loader:
+        raise ImportError(f"Cannot load spec for {GRADING_SCRIPT}")
+
+    # Ensure sibling imports like `from judge0 import ...` work
+    sys.path.insert(0, GRADING_DIR)
+    try:
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules["tabot"] = mod  # let subimports see the module name
+        # Optional but helps some relative-import edge cases:
+        mod.__package__ = None
+        spec.loader.exec_module(mod)
+        return mod
+    finally:
+        # Avoid permanently polluting sys.path
+        try:
+            sys.path.remove(GRADING_DIR)
+        except ValueError:
+            pass
+
+
+try:
+    TABOT = load_tabot_module()
+except Exception as e:
+    TABOT = None
+    print(f"[grading_engine] Warning: tabot import failed (will use subprocess path): {e}", flush=True)
+
+
+def expand_additional_files(solution_root: str, additional_file_path: Any) -> list[str]:
+    """
+    Expand DB-stored additional file names to absolute paths under the solution folder.
+    """
+    base_dir = solution_root if os.path.isdir(solution_root) else os.path.dirname(solution_root)
+    raw = additional_file_path.strip() if isinstance(additional_file_path, str) else ""
+    if raw.startswith("[") or raw.startswith("{"):
+        lst = json.loads(raw)
+    else:
+        lst = [raw] if raw else []
+
+    abs_list = []
+    for p in (lst or []):
+        if not p:
+            continue
+        if os.path.isabs(p):
+            abs_list.append(p)
+        else:
+            abs_list.append(os.path.join(base_dir, os.path.basename(p)))
+    return abs_list
+
+
+def grade_submission(
+    user_id: int,
+    language: str,
+    testcases_json: str,
+    submission_dir: str,
+    additional_payload: str,
+    project_id: int,
+    cwd: str,
+    stop_on_first_failure: bool = False,
+) -> bool:
+    """
+    Grades a submission in-process through grade.grade_submission, which writes
+    testcases.json into submission_dir. Falls back to running grade.py as a subprocess.
+    Returns True when the grader finished.
+    """
+    if TABOT is not None:
+        try:
+            TABOT.grade_submission(
+                str(user_id),
+                language,
+                testcases_json,
+                submission_dir,
+                additional_payload,
+                root=cwd,
+                stop_on_first_failure=stop_on_first_failure,
+            )
+            return True
+        except Exception as e:
+            print(f"[grading_engine] in-process grading failed, retrying via subprocess: {e}", flush=True)
+
+    cmd = [
+        "python", GRADING_SCRIPT,
+        str(user_id),
+        language,
+        str(testcases_json),
+        submission_dir,
+        additional_payload,
+        str(project_id),
+    ]
+    if stop_on_first_failure:
+        cmd.append("--stop-on-first-failure")
+    result = subprocess.run(cmd, cwd=cwd)
+    return result.returncode == 0
+
+
+def prune_result_cache() -> int:
+    """
+    Drops stale entries from grade.py's content-addressed result cache.
+    """
+    if TABOT is None:
+        return 0
+    return TABOT.prune_result_cache()
+
+
+def run_solution_for_input(solution_root: str, language: str, input_text: str, project_id: int, additional_file_path: str = "") -> str:
+    """
+    Runs the teacher solution against one input (grade.py ADMIN path).
+    Returns stdout (or stderr) with normalized newlines, or "" on failure.
+    """
+    if not solution_root or not os.path.exists(solution_root):
+        return ""
+
+    try:
+        add_arg = json.dumps(expand_additional_files(solution_root, additional_file_path))
+    except Exception:
+        add_arg = additional_file_path or ""
+
+    if TABOT is not None:
+        try:
+            return (TABOT.admin_run(language or "python", input_text or "", solution_root, add_arg, echo=False) or "").strip()
+        except Exception as e:
+            print(f"[grading_engine] in-process run failed, retrying via subprocess: {e}", flush=True)
+
+    args = [
+        "python", GRADING_SCRIPT,
+        "ADMIN",              # student_name triggers admin path
+        language or "python", # language as tabot expects
+        input_text or "",     # goes to admin_run(user_input)
+        solution_root,        # file or directory
+        add_arg,
+        str(project_id or 0),
+    ]
+    try:
+        proc = subprocess.run(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=os.path.dirname(solution_root) if os.path.isfile(solution_root) else solution_root,
+        )
+    except Exception:
+        return ""
+    out = (proc.stdout or "").strip()
+    err = (proc.stderr or "").strip()
+    return (out or err)
+
+
+def run_solution_for_inputs(solution_root: str, language: str, inputs: list[str], project_id: int, additional_file_path: str = "") -> list[str]:
+    """
+    Runs the teacher solution once per input, all concurrently (one Judge0 batch,
+    one compile). Returns outputs in input order; "" marks a failed run.
+    """
+    if not inputs:
+        return []
+    if not solution_root or not os.path.exists(solution_root):
+        return ["" for _ in inputs]
+
+    if TABOT is not None:
+        try:
+            add_arg = json.dumps(expand_additional_files(solution_root, additional_file_path))
+            outputs = TABOT.run_solution_batch(language or "python", list(inputs), solution_root, add_arg)
+            return [(out or "").strip() for out in outputs]
+        except Exception as e:
+            print(f"[grading_engine] in-process batch run failed, retrying via subprocess: {e}", flush=True)
+
+    with ThreadPoolExecutor(max_workers=min(SUBPROCESS_MAX_IN_FLIGHT, len(inputs))) as pool:
+        return list(pool.map(
+            lambda input_text: run_solution_for_input(solution_root, language, input_text, project_id, additional_file_path),
+            inputs,
+        ))
@@ -0,0 +1,347 @@
+import ast
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.constants import COMPETITION_START, PRACTICE_START, get_minute_index
+from src.extensions import background_executor, cache, grading_executor
+from src.repositories.database import db
+from src.services import grading_engine
+from src.services.scoreboard_service import apply_team_project_stats
+
+# A running submission is only reclaimed once its worker's claim is this old
+GRADING_STALE_SECONDS = 600
+
+# Testcases run per Judge0 batch while recomputing, so progress moves in steps
+RECOMPUTE_CHUNK_SIZE = 10
+RECOMPUTE_STATUS_TIMEOUT_SECONDS = 3600
+
+# Must match JUDGE0_CALLBACK_DIR in tabot-files/grading-scripts/judge0.py
+JUDGE0_CALLBACK_DIR = os.getenv("JUDGE0_CALLBACK_DIR", "/tabot-files/judge0-callbacks")
+JUDGE0_CALLBACK_SECRET = os.getenv("JUDGE0_CALLBACK_SECRET", "").strip()
+# judge0.py only sends callback_url when both are set; otherwise the endpoint is off
+JUDGE0_CALLBACK_ENABLED = bool(os.getenv("JUDGE0_CALLBACK_URL", "").strip() and JUDGE0_CALLBACK_SECRET)
+JUDGE0_CALLBACK_MAX_AGE_SECONDS = 600
+JUDGE0_TOKEN_RE = re.compile(r"^[A-Za-z0-9-]{8,64}$")
+
+SUBMISSION_LANGUAGES = {'.py': 'python', '.java': 'java'}
+
+
+def build_additional_payload(project) -> str:
+    """
+    Builds the additional-files argument for grade.py from the project's teacher files.
+    """
+    try:
+        sol_root = getattr(project, "solutionpath", "") or ""
+        teacher_base_dir = sol_root if os.path.isdir(sol_root) else os.path.dirname(sol_root)
+
+        raw = (getattr(project, "AdditionalFilePath", "") or "").strip()
+        if raw.startswith("[") or raw.startswith("{"):
+            lst = json.loads(raw)
+        else:
+            lst = [raw] if raw else []
+
+        abs_list = []
+        for p in (lst or []):
+            if not p:
+                continue
+            if os.path.isabs(p):
+                abs_list.append(p)
+            else:
+                abs_list.append(os.path.join(teacher_base_dir, os.path.basename(p)))
+
+        return json.dumps({"base_dir": teacher_base_dir, "files": abs_list})
+    except Exception:
+        return ""
+
+
+def detect_submission_language(submission_dir: str) -> str | None:
+    if not os.path.isdir(submission_dir):
+        return None
+
+    for name in sorted(os.listdir(submission_dir)):
+        _, ext = os.path.splitext(name)
+        language = SUBMISSION_LANGUAGES.get(ext.lower())
+        if language:
+            return language
+    return None
+
+
+def read_testcase_results(json_out: str) -> tuple[bool, dict[str, list[str]]]:
+    status = False
+    testcase_results = {"Passed": [], "Failed": [], "Skipped": []}
+    try:
+        with open(json_out, "r", encoding="utf-8", errors="replace") as f:
+            payload = json.load(f) or {}
+
+        passed, failed, skipped = [], [], []
+        for r in (payload or {}).get("results", []):
+            name = str((r or {}).get("name", "") or "")
+            if bool((r or {}).get("skipped", False)):
+                skipped.append(name)
+            elif bool((r or {}).get("passed", False)):
+                passed.append(name)
+            else:
+                failed.append(name)
+
+        status = (len(failed) == 0 and len(skipped) == 0)
+        testcase_results = {"Passed": passed, "Failed": failed, "Skipped": skipped}
+    except Exception:
+        pass
+
+    return status, testcase_results
+
+
+def accepted_minutes_for(submission, project) -> int | None:
+    """
+    Scoreboard minute of an accepted submission, counted from the start of its contest.
+    """
+    submitted_at = submission.Time if isinstance(submission.Time, datetime) else datetime.now()
+
+    if project.Type == "competition":
+        return get_minute_index(start=COMPETITION_START, now=submitted_at)
+    if project.Type == "practice":
+        return get_minute_index(start=PRACTICE_START, now=submitted_at)
+    return None
+
+
+def record_team_project_stats(team_repo, submission, project) -> None:
+    """
+    Recomputes the team's TeamProjectStats (attempts, solved, accepted minute) after one
+    of its submissions was graded.
+    """
+    entry = team_repo.recompute_team_project_stats(
+        submission.Team,
+        project.Id,
+        lambda accepted: accepted_minutes_for(accepted, project),
+    )
+    if entry is not None:
+        # Keep this process's live scoreboard current without waiting for the next refresh
+        apply_team_project_stats(entry)
+
+
+def run_grading_script(submission, project, project_repo, language: str) -> bool:
+    submission_dir = submission.CodeFilepath
+    project_bucket = os.path.dirname(os.path.dirname(submission_dir))
+
+    return grading_engine.grade_submission(
+        submission.User,
+        language,
+        project_repo.testcases_to_json(project.Id),
+        submission_dir,
+        build_additional_payload(project),
+        project.Id,
+        cwd=project_bucket,
+        stop_on_first_failure=bool(getattr(project, "StopOnFirstFailure", False)),
+    )
+
+
+def grade_submission(app, submission_id: int) -> None:
+    """
+    Grading worker body: claims a pending submission, runs the grader and
+    records IsPassing, TestCaseResults and TeamProjectStats.
+    """
+    with app.app_context():
+        container = app.container
+        submission_repo = container.submission_repo()
+        project_repo = container.project_repo()
+        team_repo = container.team_repo()
+
+        try:
+            if not submission_repo.claim_pending_submission(submission_id):
+                return
+
+            submission = submission_repo.get_submission_by_submission_id(submission_id)
+            project = project_repo.get_selected_project(int(submission.Project))
+            language = detect_submission_language(submission.CodeFilepath)
+
+            if project is None or language is None or not run_grading_script(submission, project, project_repo, language):
+                submission_repo.complete_submission_grading(
+                    submission_id,
+                    False,
+                    {"Passed": [], "Failed": []},
+                    grading_status="error",
+                )
+                return
+
+            status, testcase_results = read_testcase_results(submission.OutputFilepath)
+            submission_repo.complete_submission_grading(submission_id, status, testcase_results)
+            record_team_project_stats(team_repo, submission, project)
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Grading failed for submission %s", submission_id)
+            submission_repo.complete_submission_grading(
+                submission_id,
+                False,
+                {"Passed": [], "Failed": []},
+                grading_status="error",
+            )
+        finally:
+            db.session.remove()
+
+
+def enqueue_submission(app, submission_id: int) -> None:
+    grading_executor.submit(grade_submission, app, int(submission_id))
+
+
+def requeue_stale_submissions(app) -> int:
+    """
+    Re-enqueues submissions still pending after GRADING_STALE_SECONDS and running ones
+    whose claim (GradingStartedAt) has expired because the worker died mid-grade.
+    """
+    with app.app_context():
+        submission_repo = app.container.submission_repo()
+        older_than = datetime.now() - timedelta(seconds=GRADING_STALE_SECONDS)
+        submission_ids = submission_repo.get_stale_grading_submission_ids(older_than)
+
+    for submission_id in submission_ids:
+        enqueue_submission(app, submission_id)
+    return len(submission_ids)
+
+
+def get_grading_status_payload(submission) -> dict[str, Any]:
+    raw_results = getattr(submission, "TestCaseResults", None) or ""
+    try:
+        testcase_results = ast.literal_eval(raw_results) if raw_results else {}
+    except Exception:
+        testcase_results = {}
+    if not isinstance(testcase_results, dict):
+        testcase_results = {}
+
+    return {
+        "sid": int(submission.Id),
+        "status": getattr(submission, "GradingStatus", None) or "graded",
+        "isPassing": bool(submission.IsPassing),
+        "passed": list(testcase_results.get("Passed", []) or []),
+        "failed": list(testcase_results.get("Failed", []) or []),
+        "skipped": list(testcase_results.get("Skipped", []) or []),
+    }
+
+
+def store_judge0_callback(payload: dict[str, Any]) -> bool:
+    """
+    Drops a finished Judge0 submission where the waiting grader picks it up (<token>.json).
+    """
+    token = str((payload or {}).get("token", "") or "").strip()
+    if not JUDGE0_TOKEN_RE.match(token):
+        return False
+
+    os.makedirs(JUDGE0_CALLBACK_DIR, exist_ok=True)
+    final_path = os.path.join(JUDGE0_CALLBACK_DIR, f"{token}.json")
+    tmp_path = f"{final_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, final_path)
+    return True
+
+
+def prune_judge0_callbacks() -> int:
+    """
+    Removes callback files nobody consumed (e.g. the grader gave up or used wait=true).
+    """
+    if not os.path.isdir(JUDGE0_CALLBACK_DIR):
+        return 0
+
+    cutoff = time.time() - JUDGE0_CALLBACK_MAX_AGE_SECONDS
+    removed = 0
+    for name in os.listdir(JUDGE0_CALLBACK_DIR):
+        full = os.path.join(JUDGE0_CALLBACK_DIR, name)
+        try:
+            if os.path.getmtime(full) < cutoff:
+                os.remove(full)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def recompute_status_key(project_id: int) -> str:
+    return f"recompute:{int(project_id)}"
+
+
+def get_recompute_status(project_id: int) -> dict[str, Any]:
+    return cache.get(recompute_status_key(project_id)) or {"status": "idle", "total": 0, "completed": 0}
+
+
+def set_recompute_status(project_id: int, **fields) -> None:
+    status = dict(get_recompute_status(project_id))
+    status.update(fields)
+    cache.set(recompute_status_key(project_id), status, timeout=RECOMPUTE_STATUS_TIMEOUT_SECONDS)
+
+
+def recompute_expected_outputs(project_repo, project_id, *, solution_override_path: str = None, language_override: str = None) -> int:
+    """
+    Runs the (updated) solution once per testcase input, concurrently, and writes
+    every new output in a single transaction. Returns the number of testcases updated.
+    """
+    # Always fetch the project once (needed for fallback language, additional files, etc.)
+    try:
+        proj_obj = project_repo.get_selected_project(int(project_id))
+    except Exception:
+        proj_obj = None
+
+    if solution_override_path and os.path.exists(solution_override_path):
+        solution_root = solution_override_path
+        lang = (language_override or (getattr(proj_obj, "Language", "") if proj_obj else "")).strip()
+    else:
+        if not proj_obj or not getattr(proj_obj, "solutionpath", None):
+            set_recompute_status(project_id, status="done", total=0, completed=0, finishedAt=datetime.now().isoformat())
+            return 0
+        solution_root = getattr(proj_obj, "solutionpath", "")
+        lang = getattr(proj_obj, "Language", "")
+
+    add_path = getattr(proj_obj, "AdditionalFilePath", "") if proj_obj else ""
+    cases = project_repo.get_testcases(str(project_id))
+    set_recompute_status(project_id, status="running", total=len(cases), completed=0)
+
+    outputs: dict[int, str] = {}
+    for start in range(0, len(cases), RECOMPUTE_CHUNK_SIZE):
+        chunk = cases[start:start + RECOMPUTE_CHUNK_SIZE]
+        chunk_outputs = grading_engine.run_solution_for_inputs(
+            solution_root,
+            lang,
+            [case.get("input", "") or "" for case in chunk],
+            int(project_id),
+            add_path,
+        )
+        for case, new_out in zip(chunk, chunk_outputs):
+            # Keep the stored output when the solution failed to produce one
+            if new_out:
+                outputs[int(case["id"])] = new_out
+        set_recompute_status(project_id, completed=start + len(chunk))
+
+    updated = project_repo.update_testcase_outputs(int(project_id), outputs)
+    set_recompute_status(project_id, status="done", finishedAt=datetime.now().isoformat())
+    return updated
+
+
+def run_recompute_job(app, project_id: int, solution_override_path: str = None, language_override: str = None) -> None:
+    with app.app_context():
+        try:
+            recompute_expected_outputs(
+                app.container.project_repo(),
+                project_id,
+                solution_override_path=solution_override_path,
+                language_override=language_override,
+            )
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception("Recomputing expected outputs failed for project %s", project_id)
+            set_recompute_status(project_id, status="error", error=str(e), finishedAt=datetime.now().isoformat())
+        finally:
+            db.session.remove()
+
+
+def start_recompute_job(app, project_id: int, *, solution_override_path: str = None, language_override: str = None) -> None:
+    """
+    Recomputes expected outputs in the background; poll get_recompute_status for progress.
+    """
+    cache.set(
+        recompute_status_key(project_id),
+        {"status": "queued", "total": 0, "completed": 0, "startedAt": datetime.now().isoformat()},
+        timeout=RECOMPUTE_STATUS_TIMEOUT_SECONDS,
+    )
+    background_executor.submit(run_recompute_job, app, int(project_id), solution_override_path, language_override)
@@ -0,0 +1,54 @@
+import time
+from http import HTTPStatus
+from typing import Any, Callable
+
+from flask import Response, current_app, request
+
+from src.extensions import cache
+
+
+def cache_generation(name: str) -> int:
+    """
+    Version stamp for a group of cached responses; part of their cache keys so a
+    single bump_cache_generation() invalidates the whole group in every worker.
+    """
+    generation = cache.get(f"generation:{name}")
+    if generation is None:
+        generation = bump_cache_generation(name)
+    return generation
+
+
+def bump_cache_generation(name: str) -> int:
+    generation = time.time_ns()
+    cache.set(f"generation:{name}", generation, timeout=0)
+    return generation
+
+
+def get_cached_json(key: str, build: Callable[[], Any], timeout: int) -> bytes:
+    """
+    Serialized JSON for key, building and storing it on a miss. The cache holds the
+    encoded bytes, so a hit skips both the queries and serialization.
+    """
+    body = cache.get(key)
+    if body is None:
+        body = current_app.json.dumps(build()).encode("utf-8")
+        cache.set(key, body, timeout=timeout)
+    return body
+
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    return Response(body, status=status, mimetype="application/json")
+
+
+def etag_json_response(etag: str, build: Callable[[], Any]) -> Response:
+    """
+    JSON response tagged with etag. A matching If-None-Match gets 304 without calling
+    build(), so an unchanged poll costs only whatever query produced the etag.
+    """
+    if request.if_none_match.contains(etag):
+        resp = Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        resp = json_bytes_response(current_app.json.dumps(build()).encode("utf-8"))
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from typing import Callable
+
+# One watcher thread per process re-reads each watched scoreboard this often and
+# wakes every connected client when its ETag changes.
+FEED_POLL_SECONDS = 5
+# Comment lines sent on idle streams so proxies do not drop the connection
+FEED_HEARTBEAT_SECONDS = 15
+# Streams are closed after this long; EventSource reconnects with Last-Event-ID
+FEED_STREAM_MAX_SECONDS = 600
+# Each open stream holds a worker thread, so cap them and let the rest poll
+FEED_MAX_STREAMS = int(os.getenv("SCOREBOARD_MAX_STREAMS", "96"))
+
+ScoreboardLoader = Callable[[], tuple[str, bytes]]
+
+
+class ScoreboardFeed:
+    """
+    Latest (etag, body) for one public scoreboard view, shared by every stream.
+    """
+
+    def __init__(self, loader: ScoreboardLoader):
+        self.loader = loader
+        self.condition = threading.Condition()
+        self.etag: str | None = None
+        self.body: bytes | None = None
+        self.listeners = 0
+
+    def poll(self) -> None:
+        etag, body = self.loader()
+        with self.condition:
+            if etag != self.etag:
+                self.etag = etag
+                self.body = body
+                self.condition.notify_all()
+
+    def current(self) -> tuple[str, bytes]:
+        if self.etag is None:
+            self.poll()
+        with self.condition:
+            return self.etag, self.body
+
+    def wait_for_change(self, etag: str | None, timeout: float) -> tuple[str, bytes]:
+        with self.condition:
+            self.condition.wait_for(lambda: self.etag != etag, timeout=timeout)
+            return self.etag, self.body
+
+
+_feeds_lock = threading.Lock()
+_feeds: dict[tuple, ScoreboardFeed] = {}
+_open_streams = 0
+_watcher: threading.Thread | None = None
+
+
+def get_scoreboard_feed(key: tuple, loader: ScoreboardLoader) -> ScoreboardFeed:
+    global _watcher
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = _feeds[key] = ScoreboardFeed(loader)
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(target=_watch_feeds, name="scoreboard-feed", daemon=True)
+            _watcher.start()
+        return feed
+
+
+def _watch_feeds() -> None:
+    while True:
+        time.sleep(FEED_POLL_SECONDS)
+        with _feeds_lock:
+            feeds = [feed for feed in _feeds.values() if feed.listeners > 0]
+        for feed in feeds:
+            try:
+                feed.poll()
+            except Exception as e:
+                print(f"[scoreboard_feed] poll failed: {e}", flush=True)
+
+
+def scoreboard_event(etag: str, body: bytes) -> bytes:
+    return b"id: " + etag.encode("ascii") + b"\nevent: scoreboard\ndata: " + body + b"\n\n"
+
+
+def stream_scoreboard_events(feed: ScoreboardFeed, last_event_id: str | None = None):
+    """
+    Server-sent events for a feed: one "scoreboard" event per new ETag, heartbeats between.
+    Returns (events, release), or None when the stream limit is reached (clients fall
+    back to polling). The slot is reserved here, under the lock, so a burst of connections
+    cannot all pass the check before any stream starts. release() is idempotent; pass it to
+    Response.call_on_close so a stream that never started still gives its slot back.
+    """
+    global _open_streams
+    with _feeds_lock:
+        if _open_streams >= FEED_MAX_STREAMS:
+            return None
+        _open_streams += 1
+        feed.listeners += 1
+
+    released = False
+
+    def release():
+        nonlocal released
+        global _open_streams
+        with _feeds_lock:
+            if released:
+                return
+            released = True
+            _open_streams -= 1
+            feed.listeners -= 1
+
+    def generate():
+        try:
+            etag, body = feed.current()
+            if etag != last_event_id:
+                yield scoreboard_event(etag, body)
+
+            deadline = time.monotonic() + FEED_STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                new_etag, body = feed.wait_for_change(etag, FEED_HEARTBEAT_SECONDS)
+                if new_etag == etag:
+                    yield b": keepalive\n\n"
+                    continue
+                etag = new_etag
+                yield scoreboard_event(etag, body)
+        finally:
+            release()
+
+    return generate(), release
@@ -1,8 +1,49 @@
+import gzip
+import hashlib
 import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
 from typing import Any
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.repositories.database import db
 from src.repositories.models import ScoreboardSnapshots, TeamProjectStats
+from src.constants import (
+    COMPETITION_START,
+    COMPETITION_END,
+    SCOREBOARD_FREEZE,
+    SCOREBOARD_RELEASE,
+    get_minute_index,
+)
+from src.extensions import cache
+
+# Stats rows are re-read from slightly before the last watermark so a row committed
+# just after the previous refresh (with an older UpdatedAt) is not missed.
+# Re-applying a row is idempotent.
+STATS_WATERMARK_OVERLAP = timedelta(seconds=5)
+
+# Team names/schools and the problem set rarely change mid-contest; reload them
+# (a full rebuild) at most this often, or immediately when the problem set changes.
+SCOREBOARD_ROSTER_REFRESH = timedelta(minutes=5)
+
+# Snapshots are stored as a full keyframe every SNAPSHOT_KEYFRAME_MINUTES, with the
+# minutes in between holding only the ranking order plus the teams that differ from
+# that keyframe (so any minute is rebuilt from at most two rows).
+SNAPSHOT_KEYFRAME_MINUTES = 15
+KEYFRAME_CACHE_SIZE = 32
+
+# The snapshot job keeps writing until shortly after COMPETITION_END; replay indexes
+# are only built once the last minute is guaranteed to be on disk.
+REPLAY_SETTLE = timedelta(minutes=1)
+
+# Ready-to-send scoreboard responses, one per (division, online, status). The snapshot
+# job republishes the current ones every minute; anything built on demand between
+# job runs (or after the job stops) expires sooner unless it is the final board.
+SCOREBOARD_RESPONSE_CACHE_SECONDS = 3600
+SCOREBOARD_RESPONSE_FILL_SECONDS = 60
+
+_keyframe_lock = threading.Lock()
+_keyframe_cache: "OrderedDict[int, dict[str, Any]]" = OrderedDict()
 
 def _format_team_project_stats(stats: TeamProjectStats | None) -> dict[str, Any]:
     if stats is None:
@@ -66,11 +107,17 @@ def save_scoreboard_snapshot(
     timestamp: datetime,
     division: str,
     is_online: bool,
-    payload: dict[str, Any],
+    payload: dict[str, Any] | str,
+    kind: str = "full",
+    base_minute: int | None = None,
 ) -> None:
     """
     Saves a snapshot of the scoreboard to the database.
+    payload may already be serialized (IncrementalScoreboard.to_json()/delta_json()).
     """
+    if not isinstance(payload, str):
+        payload = json.dumps(payload)
+
     snapshot = ScoreboardSnapshots.query.filter_by(
         Division=division,
         IsOnline=is_online,
@@ -83,6 +130,484 @@ def save_scoreboard_snapshot(
             IsOnline=is_online,
             Minute=minute,
             TimeStamp=timestamp,
-            Payload=json.dumps(payload),
+            Payload=payload,
+            Kind=kind,
+            BaseMinute=base_minute,
         )
-        db.session.add(snapshot)
\ No newline at end of file
+        db.session.add(snapshot)
+
+
+def load_keyframe(snapshot: ScoreboardSnapshots) -> dict[str, Any]:
+    """
+    Parsed keyframe: {"projects": [...], "teams": {teamId: team}, "teamJson": {teamId: str}}.
+    Keyframes never change once written, so they are cached by row id.
+    """
+    with _keyframe_lock:
+        cached = _keyframe_cache.get(snapshot.Id)
+        if cached is not None:
+            _keyframe_cache.move_to_end(snapshot.Id)
+            return cached
+
+    payload = json.loads(snapshot.Payload) if snapshot.Payload else {}
+    teams = {int(t["teamId"]): t for t in payload.get("teams", [])}
+    keyframe = {
+        "projects": payload.get("projects", []),
+        "teams": teams,
+        "teamJson": {team_id: json.dumps(t) for team_id, t in teams.items()},
+    }
+
+    with _keyframe_lock:
+        _keyframe_cache[snapshot.Id] = keyframe
+        while len(_keyframe_cache) > KEYFRAME_CACHE_SIZE:
+            _keyframe_cache.popitem(last=False)
+    return keyframe
+
+
+def reconstruct_scoreboard_payload(team_repo, snapshot: ScoreboardSnapshots) -> dict[str, Any]:
+    """
+    Full {"projects", "teams"} payload for a stored snapshot, applying a delta row
+    onto its keyframe when needed.
+    """
+    if (getattr(snapshot, "Kind", None) or "full") != "delta":
+        return json.loads(snapshot.Payload) if snapshot.Payload else {}
+
+    base = team_repo.get_scoreboard_snapshot_at(snapshot.Division, snapshot.IsOnline, snapshot.BaseMinute)
+    if base is None:
+        return {}
+    return apply_scoreboard_delta(load_keyframe(base), snapshot.Payload)
+
+
+def apply_scoreboard_delta(keyframe: dict[str, Any], delta_payload: str) -> dict[str, Any]:
+    delta = json.loads(delta_payload) if delta_payload else {}
+
+    changed = {int(t["teamId"]): t for t in delta.get("teams", [])}
+    teams = []
+    for team_id in delta.get("order", []):
+        team = changed.get(team_id) or keyframe["teams"].get(team_id)
+        if team is not None:
+            teams.append(team)
+    return {"projects": keyframe["projects"], "teams": teams}
+
+
+def encode_scoreboard_snapshot(team_repo, board: "IncrementalScoreboard", minute: int) -> tuple[str, int | None, str]:
+    """
+    Returns (kind, base_minute, payload) for this minute: a delta against the latest
+    keyframe when one is recent enough and has the same problem set, else a new keyframe.
+    """
+    keyframe_row = team_repo.get_latest_scoreboard_keyframe(board.division, board.is_online, minute - 1)
+    if keyframe_row is None or minute - keyframe_row.Minute >= SNAPSHOT_KEYFRAME_MINUTES:
+        return "full", None, board.to_json()
+
+    keyframe = load_keyframe(keyframe_row)
+    delta = board.delta_json(keyframe)
+    if delta is None:
+        return "full", None, board.to_json()
+    return "delta", keyframe_row.Minute, delta
+
+
+class IncrementalScoreboard:
+    """
+    In-memory scoreboard for one (division, online, project type).
+
+    Holds one cell per (team, problem), the per-team totals and the ranking
+    (solved desc, penalty asc, last accepted asc, team id asc) as a sorted key list.
+    refresh() only applies TeamProjectStats rows changed since the last refresh, and
+    each team's JSON fragment is re-serialized only when that team changed, so a
+    minute snapshot costs O(changed teams) plus one string join.
+    """
+
+    def __init__(self, division: str, is_online: bool, project_type: str):
+        self.division = division
+        self.is_online = is_online
+        self.project_type = project_type
+        self.lock = threading.RLock()
+        self.loaded_at: datetime | None = None
+        self.watermark: datetime | None = None
+        self.project_ids: list[int] = []
+        self.projects_json = "[]"
+        self.teams: dict[int, dict[str, Any]] = {}
+        self.cells: dict[int, dict[int, dict[str, Any]]] = {}
+        self.rank_keys: dict[int, tuple] = {}
+        self.ranking: list[tuple] = []
+        self.team_json: dict[int, str] = {}
+
+    @staticmethod
+    def rank_key(team_id: int, solved: int, penalty: int, last_accepted: int) -> tuple:
+        return (-solved, penalty, last_accepted, team_id)
+
+    def rebuild(self, project_repo, team_repo, now: datetime) -> None:
+        projects = project_repo.get_projects_by_type_division(self.project_type, self.division.lower())
+        self.project_ids = [p.Id for p in projects]
+        self.projects_json = json.dumps([{"id": p.Id, "orderIndex": p.OrderIndex} for p in projects])
+
+        self.teams = {
+            t.TeamId: {"teamId": t.TeamId, "teamName": t.TeamName, "schoolName": t.SchoolName}
+            for t in team_repo.get_scoreboard_roster(self.division, self.is_online)
+        }
+        self.cells = {team_id: {} for team_id in self.teams}
+        self.rank_keys = {}
+        self.ranking = []
+        self.team_json = {}
+        self.watermark = None
+
+        stats = team_repo.get_project_stats_changed_since(self.division, self.is_online, self.project_ids) if self.project_ids else []
+        self.apply_stats_rows(stats)
+        for team_id in self.teams:
+            if team_id not in self.rank_keys:
+                self.recompute_team(team_id)
+        self.loaded_at = now
+
+    def apply_stats_rows(self, rows) -> None:
+        changed: set[int] = set()
+        project_ids = set(self.project_ids)
+        for row in rows:
+            if row.TeamId not in self.teams or row.ProjectId not in project_ids:
+                continue
+            self.cells.setdefault(row.TeamId, {})[row.ProjectId] = _format_team_project_stats(row)
+            changed.add(row.TeamId)
+            updated_at = getattr(row, "UpdatedAt", None)
+            if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+                self.watermark = updated_at
+
+        # The watermark only ever comes from UpdatedAt (the database clock). With no rows yet
+        # it stays None and the next refresh simply reads everything, which is still empty.
+        for team_id in changed:
+            self.recompute_team(team_id)
+
+    def apply_stats(self, stats: TeamProjectStats) -> bool:
+        """
+        Applies one freshly written TeamProjectStats row (e.g. right after grading).
+        Returns False when the row does not belong to this board.
+        """
+        with self.lock:
+            if self.loaded_at is None or stats.TeamId not in self.teams or stats.ProjectId not in self.project_ids:
+                return False
+            self.cells.setdefault(stats.TeamId, {})[stats.ProjectId] = _format_team_project_stats(stats)
+            self.recompute_team(stats.TeamId)
+            return True
+
+    def recompute_team(self, team_id: int) -> None:
+        cells = self.cells.get(team_id, {})
+        solved = penalty = last_accepted = 0
+        for cell in cells.values():
+            if not cell["solved"]:
+                continue
+            # Same arithmetic as get_scoreboard_teams (a NULL accepted time adds no penalty)
+            solved += 1
+            if cell["acceptedTimeMinutes"] is not None:
+                penalty += cell["acceptedTimeMinutes"] + 20 * (cell["attempts"] - 1)
+                last_accepted = max(last_accepted, cell["acceptedTimeMinutes"])
+
+        old_key = self.rank_keys.get(team_id)
+        if old_key is not None:
+            i = bisect_left(self.ranking, old_key)
+            if i < len(self.ranking) and self.ranking[i] == old_key:
+                del self.ranking[i]
+        new_key = self.rank_key(team_id, solved, penalty, last_accepted)
+        self.rank_keys[team_id] = new_key
+        insort(self.ranking, new_key)
+
+        empty = _format_team_project_stats(None)
+        self.team_json[team_id] = json.dumps({
+            **self.teams[team_id],
+            "solvedCount": solved,
+            "totalPenalty": penalty,
+            "lastAcceptedTime": last_accepted,
+            "projects": [{"id": pid, **cells.get(pid, empty)} for pid in self.project_ids],
+        })
+
+    def refresh(self, project_repo, team_repo, now: datetime | None = None) -> None:
+        now = now or datetime.now()
+        with self.lock:
+            if self.loaded_at is None or now - self.loaded_at >= SCOREBOARD_ROSTER_REFRESH:
+                self.rebuild(project_repo, team_repo, now)
+                return
+
+            projects = project_repo.get_projects_by_type_division(self.project_type, self.division.lower())
+            if [p.Id for p in projects] != self.project_ids:
+                self.rebuild(project_repo, team_repo, now)
+                return
+
+            if self.project_ids:
+                since = self.watermark - STATS_WATERMARK_OVERLAP if self.watermark else None
+                rows = team_repo.get_project_stats_changed_since(self.division, self.is_online, self.project_ids, since)
+                self.apply_stats_rows(rows)
+
+    def to_json(self) -> str:
+        """
+        Serialized payload, byte-identical to json.dumps(build_scoreboard_payload(...)).
+        """
+        with self.lock:
+            if not self.project_ids:
+                # Matches get_empty_scoreboard: teams by id, no per-problem cells
+                teams = [
+                    json.dumps({**self.teams[tid], "solvedCount": 0, "totalPenalty": 0, "lastAcceptedTime": 0, "projects": []})
+                    for tid in sorted(self.teams)
+                ]
+                return '{"projects": [], "teams": [' + ", ".join(teams) + "]}"
+            teams = [self.team_json[key[-1]] for key in self.ranking]
+            return '{"projects": ' + self.projects_json + ', "teams": [' + ", ".join(teams) + "]}"
+
+    def delta_json(self, keyframe: dict[str, Any]) -> str | None:
+        """
+        Ranking order plus the teams whose serialized row differs from the keyframe.
+        None when the board cannot be expressed against this keyframe (problem set changed).
+        """
+        with self.lock:
+            if not self.project_ids or json.loads(self.projects_json) != keyframe["projects"]:
+                return None
+            order = [key[-1] for key in self.ranking]
+            keyframe_json = keyframe["teamJson"]
+            changed = [self.team_json[team_id] for team_id in order if keyframe_json.get(team_id) != self.team_json[team_id]]
+            return '{"order": ' + json.dumps(order) + ', "teams": [' + ", ".join(changed) + "]}"
+
+
+_boards_lock = threading.Lock()
+_boards: dict[tuple[str, bool, str], IncrementalScoreboard] = {}
+
+
+def get_incremental_scoreboard(division: str, is_online: bool, project_type: str) -> IncrementalScoreboard:
+    key = (division, bool(is_online), project_type)
+    with _boards_lock:
+        board = _boards.get(key)
+        if board is None:
+            board = _boards[key] = IncrementalScoreboard(division, bool(is_online), project_type)
+        return board
+
+
+def apply_team_project_stats(stats: TeamProjectStats | None) -> None:
+    """
+    Pushes a TeamProjectStats change into whichever loaded scoreboard holds that team.
+    Other processes pick the change up from UpdatedAt on their next refresh.
+    """
+    if stats is None:
+        return
+    with _boards_lock:
+        boards = list(_boards.values())
+    for board in boards:
+        if board.apply_stats(stats):
+            return
+
+
+class ScoreboardReplayIndex:
+    """
+    Every stored snapshot for one (division, online), loaded with a single query once
+    the competition is over. Entries keep the stored payload text, so streaming the
+    whole replay never parses JSON and any single minute is rebuilt without the DB.
+    """
+
+    def __init__(self, division: str, is_online: bool, snapshots: list[ScoreboardSnapshots]):
+        self.division = division
+        self.is_online = is_online
+        self.minutes: list[int] = []
+        self.timestamps: dict[int, str | None] = {}
+        self.kinds: dict[int, str] = {}
+        self.base_minutes: dict[int, int | None] = {}
+        self.payloads: dict[int, str] = {}
+        self.entry_json: dict[int, str] = {}
+        self.keyframes: dict[int, dict[str, Any]] = {}
+
+        for snapshot in snapshots:
+            minute = snapshot.Minute
+            kind = snapshot.Kind or "full"
+            timestamp = snapshot.TimeStamp.isoformat() if snapshot.TimeStamp else None
+            payload = snapshot.Payload or "{}"
+
+            self.minutes.append(minute)
+            self.timestamps[minute] = timestamp
+            self.kinds[minute] = kind
+            self.base_minutes[minute] = snapshot.BaseMinute
+            self.payloads[minute] = payload
+            self.entry_json[minute] = (
+                '{"minute": ' + json.dumps(minute)
+                + ', "timestamp": ' + json.dumps(timestamp)
+                + ', "kind": ' + json.dumps(kind)
+                + ', "baseMinute": ' + json.dumps(snapshot.BaseMinute)
+                + ', "payload": ' + payload + "}"
+            )
+        self.minutes.sort()
+
+    def latest_minute(self, max_minute: int | None = None) -> int | None:
+        if not self.minutes:
+            return None
+        if max_minute is None:
+            return self.minutes[-1]
+        i = bisect_right(self.minutes, max_minute)
+        return self.minutes[i - 1] if i else None
+
+    def keyframe(self, minute: int) -> dict[str, Any]:
+        keyframe = self.keyframes.get(minute)
+        if keyframe is None:
+            payload = json.loads(self.payloads[minute])
+            keyframe = self.keyframes[minute] = {
+                "projects": payload.get("projects", []),
+                "teams": {int(t["teamId"]): t for t in payload.get("teams", [])},
+            }
+        return keyframe
+
+    def payload_at(self, max_minute: int | None = None) -> tuple[int, dict[str, Any]] | None:
+        """
+        (minute, full payload) for the latest snapshot at or before max_minute.
+        """
+        minute = self.latest_minute(max_minute)
+        if minute is None:
+            return None
+        if self.kinds[minute] != "delta":
+            return minute, json.loads(self.payloads[minute])
+        base_minute = self.base_minutes[minute]
+        if base_minute not in self.payloads:
+            return minute, {}
+        return minute, apply_scoreboard_delta(self.keyframe(base_minute), self.payloads[minute])
+
+    def iter_json(self, from_minute: int | None = None, to_minute: int | None = None):
+        """
+        Yields the replay as one JSON document. The keyframe a leading delta depends on
+        is included even when it falls before from_minute.
+        """
+        lo = bisect_left(self.minutes, from_minute) if from_minute is not None else 0
+        hi = bisect_right(self.minutes, to_minute) if to_minute is not None else len(self.minutes)
+        selected = self.minutes[lo:hi]
+        if selected and self.kinds[selected[0]] == "delta":
+            base_minute = self.base_minutes[selected[0]]
+            if base_minute in self.entry_json and base_minute < selected[0]:
+                selected = [base_minute] + selected
+
+        yield '{"division": ' + json.dumps(self.division) + ', "isOnline": ' + json.dumps(self.is_online) + ', "snapshots": ['
+        for i, minute in enumerate(selected):
+            yield ("" if i == 0 else ", ") + self.entry_json[minute]
+        yield "]}"
+
+
+_replay_lock = threading.Lock()
+_replay_indexes: dict[tuple[str, bool], ScoreboardReplayIndex] = {}
+
+
+def get_scoreboard_replay(team_repo, division: str, is_online: bool, now: datetime | None = None) -> ScoreboardReplayIndex | None:
+    """
+    Shared replay index for a division, built on first use after the competition.
+    None while the competition can still produce snapshots.
+    """
+    now = now or datetime.now()
+    if now < COMPETITION_END + REPLAY_SETTLE:
+        return None
+
+    key = (division, bool(is_online))
+    with _replay_lock:
+        index = _replay_indexes.get(key)
+        if index is None:
+            snapshots = team_repo.get_scoreboard_snapshots(division, bool(is_online))
+            index = _replay_indexes[key] = ScoreboardReplayIndex(division, bool(is_online), snapshots)
+        return index
+
+
+def resolve_competition_view(now: datetime, user_is_admin: bool) -> tuple[int | None, str, datetime | None]:
+    """
+    (minute, status, transition_at) of the competition scoreboard a viewer should see.
+    minute is None when there is no snapshot to show (upcoming, awaiting-results).
+    """
+    if now < COMPETITION_START:
+        return None, "upcoming", COMPETITION_START
+    if now > COMPETITION_END:
+        if user_is_admin or now > SCOREBOARD_RELEASE:
+            return get_minute_index(start=COMPETITION_START, now=COMPETITION_END), "final", None
+        return None, "awaiting-results", SCOREBOARD_RELEASE
+    if now > SCOREBOARD_FREEZE and not user_is_admin:
+        return get_minute_index(start=COMPETITION_START, now=SCOREBOARD_FREEZE), "frozen", COMPETITION_END
+    if now > SCOREBOARD_FREEZE:
+        return get_minute_index(start=COMPETITION_START, now=now), "frozen-admin", None
+    return get_minute_index(start=COMPETITION_START, now=now), "live", None
+
+
+def build_placeholder_response(status: str, transition_at: datetime | None = None) -> dict[str, Any]:
+    return {
+        "projects": [],
+        "teams": [],
+        "status": status,
+        "transitionAt": transition_at.isoformat() if transition_at else None,
+    }
+
+
+def build_snapshot_response(team_repo, scoreboard: ScoreboardSnapshots, status: str, transition_at: datetime | None = None) -> dict[str, Any]:
+    payload = dict(reconstruct_scoreboard_payload(team_repo, scoreboard))
+    payload["timestamp"] = scoreboard.TimeStamp.isoformat() if scoreboard.TimeStamp else None
+    payload["status"] = status
+    if transition_at:
+        payload["transitionAt"] = transition_at.isoformat()
+    return payload
+
+
+def scoreboard_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def encode_scoreboard_response(minute: int | None, payload: dict[str, Any]) -> dict[str, Any]:
+    body = json.dumps(payload).encode("utf-8")
+    return {
+        "minute": minute,
+        "etag": scoreboard_etag(body),
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=6, mtime=0),
+    }
+
+
+def scoreboard_response_key(division: str, is_online: bool, status: str) -> str:
+    return f"scoreboard:response:{division}:{bool(is_online)}:{status}"
+
+
+def build_scoreboard_response(team_repo, division: str, is_online: bool, minute: int, status: str, transition_at: datetime | None = None, timeout: int | None = None) -> dict[str, Any] | None:
+    scoreboard = team_repo.get_latest_scoreboard_snapshot(division=division, is_online=is_online, max_minute=minute)
+    if not scoreboard:
+        return None
+
+    response = encode_scoreboard_response(
+        scoreboard.Minute,
+        build_snapshot_response(team_repo, scoreboard, status, transition_at=transition_at),
+    )
+    key = scoreboard_response_key(division, is_online, status)
+    if timeout is None:
+        # On-demand fill: never replace a newer board the job published meanwhile
+        current = cache.get(key)
+        if current is not None and current["minute"] > response["minute"]:
+            return response
+        timeout = SCOREBOARD_RESPONSE_CACHE_SECONDS if status == "final" else SCOREBOARD_RESPONSE_FILL_SECONDS
+    cache.set(key, response, timeout=timeout)
+    return response
+
+
+def get_scoreboard_response(team_repo, division: str, is_online: bool, minute: int, status: str, transition_at: datetime | None = None) -> dict[str, Any] | None:
+    """
+    Precomputed {"minute", "etag", "body", "gzip"} for a scoreboard view, built and
+    stored on a miss. Entries are not tied to the request minute, so a new minute
+    does not start with a cold cache.
+    """
+    response = cache.get(scoreboard_response_key(division, is_online, status))
+    if response is not None and response["minute"] <= minute:
+        return response
+    return build_scoreboard_response(team_repo, division, is_online, minute, status, transition_at)
+
+
+def publish_scoreboard_responses(team_repo, division: str, is_online: bool, now: datetime) -> None:
+    """
+    Rebuilds the public and admin responses for the current time; run by the
+    snapshot job right after it stores a new minute.
+    """
+    for user_is_admin in (False, True):
+        minute, status, transition_at = resolve_competition_view(now, user_is_admin)
+        if minute is not None:
+            build_scoreboard_response(
+                team_repo, division, is_online, minute, status, transition_at,
+                timeout=SCOREBOARD_RESPONSE_CACHE_SECONDS,
+            )
+
+
+def load_public_scoreboard(team_repo, division: str, is_online: bool, now: datetime) -> tuple[str, bytes]:
+    """
+    (etag, body) of what an anonymous viewer currently sees, used by the live stream.
+    """
+    minute, status, transition_at = resolve_competition_view(now, False)
+    response = None
+    if minute is not None:
+        response = get_scoreboard_response(team_repo, division, is_online, minute, status, transition_at)
+    if response is None:
+        response = encode_scoreboard_response(None, build_placeholder_response(status, transition_at))
+    return response["etag"], response["body"]
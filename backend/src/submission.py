@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+import hmac
 import json
 import os
 import zipfile
@@ -10,6 +11,7 @@ from tap.parser import Parser
 from flask_jwt_extended import current_user, jwt_required
 from dependency_injector.wiring import inject, Provide
 from openpyxl import Workbook
+from sqlalchemy import func
 
 from container import Container
 from src.constants import ADMIN_ROLE
@@ -27,9 +29,20 @@ from src.repositories.school_repository import SchoolRepository
 from src.repositories.submission_repository import SubmissionRepository
 from src.repositories.team_repository import TeamRepository
 from src.repositories.user_repository import UserRepository
+from src.services.grading_service import (
+    JUDGE0_CALLBACK_ENABLED,
+    JUDGE0_CALLBACK_SECRET,
+    get_grading_status_payload,
+    store_judge0_callback,
+)
+from src.services.response_cache import etag_json_response
 
 ui_clicks_log = "/tabot-files/project-files/code_view_clicks.log"
 
+HELP_REQUEST_PAGE_MAX = 200
+# Re-send rows changed just before the client's last serverTime (commit/clock skew)
+HELP_REQUEST_SINCE_OVERLAP = timedelta(seconds=2)
+
 submission_api = Blueprint('submission_api', __name__)
 
 
@@ -89,13 +102,13 @@ def derive_help_request_stage(req, latest_message):
 
     return "awaiting_admin_reply"
 
-def serialize_help_request_message(message, req, user_repo: UserRepository):
+def serialize_help_request_message(message, req, admins_by_id: dict):
     admin_id = int(getattr(message, "AdminId", 0) or 0)
     student_id = int(getattr(message, "StudentId", 0) or 0)
 
     sender_name = "Student"
     if admin_id > 0:
-        admin = user_repo.get_user(admin_id)
+        admin = admins_by_id.get(admin_id)
         if admin and getattr(admin, "Firstname", None) and getattr(admin, "Lastname", None):
             sender_name = f"{admin.Firstname} {admin.Lastname}"
         else:
@@ -213,6 +226,47 @@ def get_student_submit_status(
     }), HTTPStatus.OK)
 
 
+@submission_api.route('/grading_status', methods=['GET'])
+@jwt_required()
+@inject
+def get_grading_status(
+    submission_repo: SubmissionRepository = Provide[Container.submission_repo],
+    user_repo: UserRepository = Provide[Container.user_repo],
+):
+    submission_id = request.args.get("id", type=int)
+    if submission_id is None:
+        return make_response({'message': 'Missing submission ID'}, HTTPStatus.BAD_REQUEST)
+
+    if not user_repo.is_admin():
+        if not submission_repo.submission_view_verification(current_user.Id, submission_id):
+            return make_response({'message': 'Unauthorized'}, HTTPStatus.FORBIDDEN)
+
+    submission = submission_repo.get_submission_by_submission_id(submission_id)
+    if not submission:
+        return make_response({'message': 'Submission not found'}, HTTPStatus.NOT_FOUND)
+
+    resp = make_response(jsonify(get_grading_status_payload(submission)), HTTPStatus.OK)
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
+
+@submission_api.route('/judge0_callback', methods=['PUT'])
+def judge0_callback():
+    # Called by Judge0 (no JWT) when a submission created with callback_url finishes.
+    # Without a secret anyone could plant results, so callback mode needs both settings.
+    if not JUDGE0_CALLBACK_ENABLED:
+        return make_response({'message': 'Not found'}, HTTPStatus.NOT_FOUND)
+
+    if not hmac.compare_digest(request.args.get("key", ""), JUDGE0_CALLBACK_SECRET):
+        return make_response({'message': 'Unauthorized'}, HTTPStatus.FORBIDDEN)
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not store_judge0_callback(payload):
+        return make_response({'message': 'Invalid callback payload'}, HTTPStatus.BAD_REQUEST)
+
+    return make_response({'message': 'OK'}, HTTPStatus.OK)
+
+
 @submission_api.route('/testcaseerrors', methods=['GET'])
 @jwt_required()
 @inject
@@ -632,6 +686,7 @@ def update_help_request(
 @inject
 def get_help_request_messages(
     request_id: int,
+    submission_repo: SubmissionRepository = Provide[Container.submission_repo],
     user_repo: UserRepository = Provide[Container.user_repo],
 ):
     req = HelpRequests.query.get(request_id)
@@ -641,15 +696,16 @@ def get_help_request_messages(
     if not can_access_help_request(req):
         return make_response(jsonify({'message': 'Not Authorized'}), HTTPStatus.UNAUTHORIZED)
 
-    messages = (
-        HelpRequestMessages.query
-        .filter(HelpRequestMessages.HelpRequestId == request_id)
-        .order_by(HelpRequestMessages.CreatedAt.asc(), HelpRequestMessages.Id.asc())
-        .all()
-    )
+    # Pollers pass an id a few messages behind their newest (ids can commit out of order)
+    after_id = request.args.get("after_id", type=int) or 0
+    max_id, count = submission_repo.get_help_request_message_state(request_id)
 
-    payload = [serialize_help_request_message(message, req, user_repo) for message in messages]
-    return make_response(jsonify(payload), HTTPStatus.OK)
+    def build():
+        messages = submission_repo.get_help_request_messages(request_id, after_id)
+        admins_by_id = user_repo.get_admins_by_ids([message.AdminId for message in messages])
+        return [serialize_help_request_message(message, req, admins_by_id) for message in messages]
+
+    return etag_json_response(f"help-request-{request_id}-{after_id}-{max_id}-{count}", build)
 
 
 @submission_api.route('/help-request/<int:request_id>/messages', methods=['POST'])
@@ -675,6 +731,8 @@ def create_help_request_message(request_id: int):
         req.CurrentAdminId = current_user.Id
         req.CompletedAt = None
 
+    req.UpdatedAt = func.now()
+
     message = HelpRequestMessages(
         HelpRequestId=request_id,
         SenderType='admin' if isinstance(current_user, AdminUsers) else 'student',
@@ -688,74 +746,102 @@ def create_help_request_message(request_id: int):
     return make_response(jsonify({'message': 'Reply sent successfully.'}), HTTPStatus.CREATED)
 
 
+def serialize_help_request_summary(summary) -> dict:
+    req = summary["request"]
+    student = summary["student"]
+    team = summary["team"]
+    project = summary["project"]
+    teacher = summary["teacher"]
+    admin = summary["admin"]
+    school = summary["school"]
+    latest_message = summary["latestMessage"]
+
+    student_id = int(getattr(req, "StudentId", 0) or 0)
+    teacher_id = int(getattr(req, "TeacherId", 0) or 0)
+    team_id = int(getattr(student, "TeamId", 0) or 0) if student else 0
+
+    teacher_firstname = teacher.Firstname if teacher else None
+    teacher_lastname = teacher.Lastname if teacher else None
+    admin_firstname = admin.Firstname if admin else None
+    admin_lastname = admin.Lastname if admin else None
+
+    return {
+        "id": getattr(req, "Id", 0),
+        "studentId": student_id,
+        "teacherId": teacher_id,
+        "teamDivision": str(getattr(team, "Division", "") or "").strip(),
+        "teamName": f"{teacher_firstname} {teacher_lastname}" if teacher_firstname and teacher_lastname else str(getattr(team, "Name", "") or f"Team {team_id}").strip(),
+        "teamSchool": str(school.Name if school else "") if school else None,
+        "problemName": getattr(project, "Name", None) if project else None,
+        "reason": str(getattr(req, "Reason", "") or "").strip(),
+        "description": str(getattr(req, "Description", "") or "").strip(),
+        "status": getattr(req, "Status", 0),
+        "adminName": f"{admin_firstname} {admin_lastname}" if admin_firstname and admin_lastname else None,
+        "createdAt": req.CreatedAt.isoformat() if getattr(req, "CreatedAt", None) else None,
+        "completedAt": req.CompletedAt.isoformat() if getattr(req, "CompletedAt", None) else None,
+        "lastMessagePreview": str(getattr(latest_message, "Body", "") or "").strip()[:140] if latest_message else None,
+        "lastMessageAt": latest_message.CreatedAt.isoformat() if latest_message and getattr(latest_message, "CreatedAt", None) else None,
+        "lastMessageSenderRole": get_help_request_message_sender_role(latest_message, req),
+        "conversationStage": derive_help_request_stage(req, latest_message),
+        "messageCount": summary["messageCount"],
+    }
+
+
+def encode_help_request_cursor(cursor) -> str | None:
+    if cursor is None:
+        return None
+    created_at, request_id = cursor
+    return f"{created_at.isoformat()}_{request_id}"
+
+
+def decode_help_request_cursor(raw: str):
+    created_raw, _, id_raw = raw.rpartition("_")
+    return datetime.fromisoformat(created_raw), int(id_raw)
+
+
 @submission_api.route('/help-requests', methods=['GET'])
 @jwt_required()
 @inject
 def get_all_help_requests(
     submission_repo: SubmissionRepository = Provide[Container.submission_repo],
-    user_repo: UserRepository = Provide[Container.user_repo],
-    team_repo: TeamRepository = Provide[Container.team_repo],
-    project_repo: ProjectRepository = Provide[Container.project_repo],
-    school_repo: SchoolRepository = Provide[Container.school_repo],
 ):
+    """
+    Admin help request dashboard.
+    Without parameters returns every request as a list. With limit/cursor (keyset
+    pagination, newest first) and/or since (requests changed at or after that
+    serverTime) returns {"items", "nextCursor", "serverTime"}; since responses also
+    carry "ids", every request id that still exists, so clients can drop deleted ones.
+    """
     if getattr(current_user, "Role", None) != ADMIN_ROLE:
         return make_response(jsonify({'message': 'Not Authorized'}), HTTPStatus.UNAUTHORIZED)
 
-    requests = submission_repo.get_all_help_requests()
-
-    payload = []
-    for req in requests:
-        latest_message = (
-            HelpRequestMessages.query
-            .filter(HelpRequestMessages.HelpRequestId == getattr(req, "Id", 0))
-            .order_by(HelpRequestMessages.CreatedAt.desc(), HelpRequestMessages.Id.desc())
-            .first()
-        )
-        message_count = (
-            HelpRequestMessages.query
-            .filter(HelpRequestMessages.HelpRequestId == getattr(req, "Id", 0))
-            .count()
-        )
-
-        student_id = int(getattr(req, "StudentId", 0) or 0)
-        teacher_id = int(getattr(req, "TeacherId", 0) or 0)
-
-        teacher = user_repo.get_user(teacher_id) if teacher_id > 0 else None
-        student = user_repo.get_student_by_id(student_id)
-
-        team_id = int(getattr(student, "TeamId", 0) or 0) if student else 0
-        team = team_repo.get_team_by_id(team_id) if team_id > 0 else None
-        project = project_repo.get_selected_project(getattr(req, "ProblemId", None)) if getattr(req, "ProblemId", None) else None
-        teacher_firstname = teacher.Firstname if teacher else None
-        teacher_lastname = teacher.Lastname if teacher else None
-        adminId = getattr(req, "CurrentAdminId", None)
-        admin = user_repo.get_user(adminId) if adminId else None
-        admin_firstname = admin.Firstname if admin else None
-        admin_lastname = admin.Lastname if admin else None
-        schoolId = int(getattr(team, "SchoolId", 0) or 0) if team else teacher.SchoolId if teacher else 0
-        school = school_repo.get_school_by_id(schoolId) if schoolId > 0 else None
-
-        payload.append({
-            "id": getattr(req, "Id", 0),
-            "studentId": student_id,
-            "teacherId": teacher_id,
-            "teamDivision": str(getattr(team, "Division", "") or "").strip(),
-            "teamName": f"{teacher_firstname} {teacher_lastname}" if teacher_firstname and teacher_lastname else str(getattr(team, "Name", "") or f"Team {team_id}").strip(),
-            "teamSchool": str(school.Name if school else "") if school else None,
-            "problemName": getattr(project, "Name", None) if project else None,
-            "reason": str(getattr(req, "Reason", "") or "").strip(),
-            "description": str(getattr(req, "Description", "") or "").strip(),
-            "status": getattr(req, "Status", 0),
-            "adminName": f"{admin_firstname} {admin_lastname}" if admin_firstname and admin_lastname else None,
-            "createdAt": req.CreatedAt.isoformat() if getattr(req, "CreatedAt", None) else None,
-            "completedAt": req.CompletedAt.isoformat() if getattr(req, "CompletedAt", None) else None,
-            "lastMessagePreview": str(getattr(latest_message, "Body", "") or "").strip()[:140] if latest_message else None,
-            "lastMessageAt": latest_message.CreatedAt.isoformat() if latest_message and getattr(latest_message, "CreatedAt", None) else None,
-            "lastMessageSenderRole": get_help_request_message_sender_role(latest_message, req),
-            "conversationStage": derive_help_request_stage(req, latest_message),
-            "messageCount": message_count,
-        })
+    since_raw = (request.args.get("since") or "").strip()
+    cursor_raw = (request.args.get("cursor") or "").strip()
+    limit = request.args.get("limit", type=int)
 
+    try:
+        since = datetime.fromisoformat(since_raw) - HELP_REQUEST_SINCE_OVERLAP if since_raw else None
+        cursor = decode_help_request_cursor(cursor_raw) if cursor_raw else None
+    except ValueError:
+        return make_response(jsonify({'message': 'Invalid since or cursor'}), HTTPStatus.BAD_REQUEST)
+    if limit is not None:
+        limit = max(1, min(limit, HELP_REQUEST_PAGE_MAX))
+
+    # Read before the rows so changes made while this request runs show up next poll
+    server_time = submission_repo.get_database_time()
+    summaries, next_cursor = submission_repo.get_help_request_summaries(since=since, cursor=cursor, limit=limit)
+    items = [serialize_help_request_summary(summary) for summary in summaries]
+
+    if not (since_raw or cursor_raw or limit is not None):
+        return make_response(jsonify(items), HTTPStatus.OK)
+
+    payload = {
+        "items": items,
+        "nextCursor": encode_help_request_cursor(next_cursor),
+        "serverTime": server_time.isoformat() if server_time else None,
+    }
+    if since is not None:
+        payload["ids"] = submission_repo.get_help_request_ids()
     return make_response(jsonify(payload), HTTPStatus.OK)
 
 
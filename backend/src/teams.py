@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from flask import Blueprint, request, jsonify, make_response, send_file
+from flask import Blueprint, Response, current_app, request, jsonify, make_response, send_file
 from flask_jwt_extended import jwt_required, current_user
 from dependency_injector.wiring import inject, Provide
 from container import Container
@@ -21,14 +21,23 @@ from src.constants import (
     DIVISION_TEAM_CAPS,
     COMPETITION_START,
     COMPETITION_END,
-    SCOREBOARD_FREEZE,
     SCOREBOARD_RELEASE,
     is_registration_open,
     is_student_submission_locked,
     is_teacher_submission_locked,
     get_minute_index,
 )
-from src.services.scoreboard_service import build_scoreboard_payload
+from src.services.scoreboard_service import (
+    build_placeholder_response,
+    build_scoreboard_payload,
+    get_scoreboard_replay,
+    get_scoreboard_response,
+    load_public_scoreboard,
+    reconstruct_scoreboard_payload,
+    resolve_competition_view,
+)
+from src.services.scoreboard_feed import get_scoreboard_feed, stream_scoreboard_events
+from src.services.response_cache import bump_cache_generation
 from src.extensions import cache
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
@@ -143,13 +152,25 @@ def build_scoreboard_now(project_repo, team_repo, division, is_online, project_t
         payload["transitionAt"] = transition_at.isoformat()
     return payload
 
-def build_snapshot_response(scoreboard, status, transition_at=None):
-    payload = json.loads(scoreboard.Payload) if scoreboard.Payload else {}
-    payload["timestamp"] = scoreboard.TimeStamp.isoformat() if scoreboard.TimeStamp else None
-    payload["status"] = status
-    if transition_at:
-        payload["transitionAt"] = transition_at.isoformat()
-    return payload
+def scoreboard_body_response(response):
+    """
+    Serves a precomputed scoreboard response (see get_scoreboard_response), gzipped
+    when the client accepts it, answering If-None-Match with 304.
+    """
+    use_gzip = "gzip" in request.accept_encodings
+    etag = response["etag"] + "-gz" if use_gzip else response["etag"]
+
+    if request.if_none_match.contains(response["etag"]) or request.if_none_match.contains(response["etag"] + "-gz"):
+        resp = make_response("", HTTPStatus.NOT_MODIFIED)
+    elif use_gzip:
+        resp = Response(response["gzip"], mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+    else:
+        resp = Response(response["body"], mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
 
 
 @team_api.route('/create', methods=['POST'])
@@ -206,6 +227,7 @@ def create_team(
         )
 
     team = team_repo.create_team(school_id, team_number, name, default_division, False)
+    bump_cache_generation("schools")
 
     return make_response({
             'id': team.Id,
@@ -297,6 +319,7 @@ def update_team(
             )
 
     team_repo.update_team(team.Id, name=name, division=division, is_online=is_online)
+    bump_cache_generation("schools")
     
     return make_response({'message': 'Success'}, HTTPStatus.OK)
 
@@ -341,6 +364,7 @@ def delete_team(
         )
 
     team_repo.delete_team(team_id)
+    bump_cache_generation("schools")
 
     return make_response({'message': 'Success'}, HTTPStatus.OK)
 
@@ -638,57 +662,101 @@ def get_scoreboard(
             return make_response({'message': 'Forbidden'}, HTTPStatus.FORBIDDEN)
         return jsonify(build_scoreboard_now(project_repo, team_repo, division, is_online, project_type, now, "practice"))
 
-    if now < COMPETITION_START:
-        if not user_is_admin:
-            return jsonify({
-                "projects": [],
-                "teams": [],
-                "status": "upcoming",
-                "transitionAt": COMPETITION_START.isoformat()
-            })
-        return jsonify(build_scoreboard_now(
-            project_repo, team_repo, division, is_online, project_type, now, "upcoming",
-            transition_at=COMPETITION_START
-        ))
-
-    transition_at = None
-    if now > COMPETITION_END:
-        if user_is_admin or now > SCOREBOARD_RELEASE:
-            minute = get_minute_index(start=COMPETITION_START, now=COMPETITION_END)
-            status = "final"
-        else:
-            return jsonify({
-                "projects": [],
-                "teams": [],
-                "status": "awaiting-results",
-                "transitionAt": SCOREBOARD_RELEASE.isoformat()
-            })
-    elif now > SCOREBOARD_FREEZE and not user_is_admin:
-        minute = get_minute_index(start=COMPETITION_START, now=SCOREBOARD_FREEZE)
-        status = "frozen"
-        transition_at = COMPETITION_END
-    elif now > SCOREBOARD_FREEZE and user_is_admin:
-        minute = get_minute_index(start=COMPETITION_START, now=now)
-        status = "frozen-admin"
-    else:
-        minute = get_minute_index(start=COMPETITION_START, now=now)
-        status = "live"
+    minute, status, transition_at = resolve_competition_view(now, user_is_admin)
+    if minute is None:
+        if user_is_admin and status == "upcoming":
+            return jsonify(build_scoreboard_now(
+                project_repo, team_repo, division, is_online, project_type, now, "upcoming",
+                transition_at=COMPETITION_START
+            ))
+        return jsonify(build_placeholder_response(status, transition_at))
+
+    response = get_scoreboard_response(team_repo, division, is_online, minute, status, transition_at)
+    if response is None:
+        return make_response({"message": "Scoreboard failed to load."}, HTTPStatus.NOT_FOUND)
 
-    cache_key = f"scoreboard:{division}:{is_online}:{minute}:{status}"
+    return scoreboard_body_response(response)
 
-    cached = cache.get(cache_key)
-    if cached:
-        return jsonify(cached)
+@team_api.route("/scoreboard/stream", methods=["GET"])
+def stream_scoreboard():
+    """
+    Server-sent events for the public competition scoreboard. Every viewer of a
+    division shares one feed per process, which re-reads the scoreboard every few
+    seconds and pushes it only when its ETag changes.
+    """
+    division = request.args.get("division", type=str)
+    is_online_raw = request.args.get("is_online", type=str)
 
-    scoreboard = team_repo.get_latest_scoreboard_snapshot(division=division, is_online=is_online, max_minute=minute)
-    if not scoreboard:
-        return make_response({"message": "Scoreboard failed to load."}, HTTPStatus.NOT_FOUND)
+    try:
+        division, is_online = clean_scoreboard_args(division, is_online_raw)
+    except Exception as e:
+        return make_response({'message': str(e)}, HTTPStatus.BAD_REQUEST)
 
-    payload = build_snapshot_response(scoreboard, status, transition_at=transition_at)
+    app = current_app._get_current_object()
 
-    cache.set(cache_key, payload, timeout=60)
+    def load():
+        with app.app_context():
+            return load_public_scoreboard(app.container.team_repo(), division, is_online, datetime.now())
 
-    return jsonify(payload)
+    feed = get_scoreboard_feed(("competition", division, is_online), load)
+    stream = stream_scoreboard_events(feed, last_event_id=request.headers.get("Last-Event-ID"))
+    if stream is None:
+        return make_response({"message": "Too many live viewers, falling back to polling."}, HTTPStatus.SERVICE_UNAVAILABLE)
+
+    events, release = stream
+    resp = Response(events, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    resp.call_on_close(release)
+    return resp
+
+@team_api.route("/scoreboard/replay", methods=["GET"])
+@jwt_required(optional=True)
+@inject
+def get_scoreboard_replay_route(
+    team_repo: TeamRepository = Provide[Container.team_repo],
+    user_repo: UserRepository = Provide[Container.user_repo],
+):
+    """
+    Post-competition scoreboard history.
+    With ?minute=M returns the full scoreboard as of minute M; otherwise streams every
+    stored snapshot (keyframes and deltas) in one response, optionally limited by
+    from_minute/to_minute.
+    """
+    division = request.args.get("division", type=str)
+    is_online_raw = request.args.get("is_online", type=str)
+
+    try:
+        division, is_online = clean_scoreboard_args(division, is_online_raw)
+    except Exception as e:
+        return make_response({'message': str(e)}, HTTPStatus.BAD_REQUEST)
+
+    user_is_admin = current_user is not None and user_repo.is_admin()
+    now = datetime.now()
+    if not user_is_admin and now <= SCOREBOARD_RELEASE:
+        return make_response({'message': 'Scoreboard replay is not available yet.'}, HTTPStatus.FORBIDDEN)
+
+    replay = get_scoreboard_replay(team_repo, division, is_online, now=now)
+    if replay is None:
+        return make_response({'message': 'Scoreboard replay is available after the competition ends.'}, HTTPStatus.NOT_FOUND)
+
+    minute = request.args.get("minute", type=int)
+    if minute is not None:
+        found = replay.payload_at(minute)
+        if found is None:
+            return make_response({"message": "No scoreboard snapshot for that minute."}, HTTPStatus.NOT_FOUND)
+        snapshot_minute, payload = found
+        return jsonify({
+            **payload,
+            "minute": snapshot_minute,
+            "timestamp": replay.timestamps.get(snapshot_minute),
+            "status": "replay",
+        })
+
+    from_minute = request.args.get("from_minute", type=int)
+    to_minute = request.args.get("to_minute", type=int)
+    return Response(replay.iter_json(from_minute, to_minute), mimetype="application/json")
 
 @team_api.route("/scoreboard/download", methods=["GET"])
 @jwt_required()
@@ -720,7 +788,7 @@ def download_scoreboard(
 
     if scoreboard:
         timestamp = scoreboard.TimeStamp.strftime("%B %d, %Y at %I:%M %p") if scoreboard.TimeStamp else "Unknown"
-        payload = json.loads(scoreboard.Payload) if scoreboard.Payload else {}
+        payload = reconstruct_scoreboard_payload(team_repo, scoreboard)
     else:
         try:
             payload = build_scoreboard_now(project_repo, team_repo, division, is_online, "competition", now, "")
@@ -1,8 +1,5 @@
-from src.repositories.team_repository import TeamRepository
 from flask.json import jsonify
-import json
 import os
-import subprocess
 import os.path
 
 from flask_jwt_extended import jwt_required
@@ -17,6 +14,7 @@ from datetime import datetime
 from src.repositories.submission_repository import SubmissionRepository
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.user_repository import UserRepository
+from src.services.grading_service import enqueue_submission
 from dependency_injector.wiring import inject, Provide
 from container import Container
 
@@ -25,7 +23,6 @@ from src.constants import (
     PRACTICE_END,
     COMPETITION_START,
     COMPETITION_END,
-    get_minute_index,
 )
 
 upload_api = Blueprint('upload_api', __name__)
@@ -95,7 +92,6 @@ def file_upload(
     user_repo: UserRepository = Provide[Container.user_repo],
     submission_repo: SubmissionRepository = Provide[Container.submission_repo],
     project_repo: ProjectRepository = Provide[Container.project_repo],
-    team_repo: TeamRepository = Provide[Container.team_repo],
 ):
     user_id = request.form.get("student_id", current_user.Id, type=int)
     user_id_str = str(user_id)
@@ -145,7 +141,6 @@ def file_upload(
     ok, result = validate_files(upload_files)
     if not ok:
         return result
-    language = result
 
     student_base = current_app.config['STUDENT_FILES_DIR']
 
@@ -161,7 +156,6 @@ def file_upload(
     ts_stamp = ts_now.strftime("%Y%m%d_%H%M%S")
     dt_string = ts_now.strftime("%Y/%m/%d %H:%M:%S")
 
-    outputpath = project_bucket
     submission_dir = os.path.join(user_bucket, ts_stamp)
     os.makedirs(submission_dir, exist_ok=True)
 
@@ -178,78 +172,7 @@ def file_upload(
         dst = os.path.join(submission_dir, safe_filename)
         f.save(dst)
 
-    path = submission_dir
-
-    testcase_info_json = project_repo.testcases_to_json(project.Id)
-
-    grading_script = "/tabot-files/grading-scripts/grade.py"
-    project_id_arg = str(project.Id)
-
-    add_payload = ""
-    try:
-        sol_root = getattr(project, "solutionpath", "") or ""
-        teacher_base_dir = sol_root if os.path.isdir(sol_root) else os.path.dirname(sol_root)
-
-        raw = (getattr(project, "AdditionalFilePath", "") or "").strip()
-        if raw.startswith("[") or raw.startswith("{"):
-            lst = json.loads(raw)
-        else:
-            lst = [raw] if raw else []
-
-        abs_list = []
-        for p in (lst or []):
-            if not p:
-                continue
-            if os.path.isabs(p):
-                abs_list.append(p)
-            else:
-                abs_list.append(os.path.join(teacher_base_dir, os.path.basename(p)))
-
-        add_payload = json.dumps({"base_dir": teacher_base_dir, "files": abs_list})
-    except Exception:
-        add_payload = ""
-
-    cmd = [
-        "python", grading_script,
-        user_id_str,
-        language,
-        str(testcase_info_json),
-        path,
-        add_payload,
-        project_id_arg
-    ]
-    result = subprocess.run(cmd, cwd=outputpath)
-
-    if result.returncode != 0:
-        message = {
-            'message': 'Error in running grading script!'
-        }
-        return make_response(message, HTTPStatus.INTERNAL_SERVER_ERROR)
-
     json_out = os.path.join(submission_dir, "testcases.json")
-    if not os.path.exists(json_out):
-        alt = os.path.join(submission_dir, f"{user_id_str}.json")
-        if os.path.exists(alt):
-            json_out = alt
-
-    status = False
-    TestCaseResults = {"Passed": [], "Failed": []}
-    try:
-        with open(json_out, "r", encoding="utf-8", errors="replace") as f:
-            payload = json.load(f) or {}
-
-        passed, failed = [], []
-        for r in (payload or {}).get("results", []):
-            name = str((r or {}).get("name", "") or "")
-            if bool((r or {}).get("passed", False)):
-                passed.append(name)
-            else:
-                failed.append(name)
-
-        status = (len(failed) == 0)
-        TestCaseResults = {"Passed": passed, "Failed": failed}
-    except Exception:
-        pass
 
     submissionId = submission_repo.create_submission(
         team_id=team_id,
@@ -258,39 +181,20 @@ def file_upload(
         codepath=submission_dir,
         time=dt_string,
         project_id=project.Id,
-        status=status,
-        testcase_results=TestCaseResults,
+        status=False,
+        testcase_results={"Passed": [], "Failed": []},
+        grading_status="pending",
     )
 
-    difference = None
-    if status:
-        if project.Type == "competition":
-            difference = get_minute_index(start=COMPETITION_START, now=ts_now)
-        elif project.Type == "practice":
-            difference = get_minute_index(start=PRACTICE_START, now=ts_now)
-
-    if submission_repo.is_first_submission_for_team_and_project(team_id, project.Id):
-        team_repo.create_team_project_stats_entry(
-            team_id=team_id,
-            project_id=project.Id,
-            solved=status,
-            accepted_time_minutes=difference if status else None,
-            current_submission_id=submissionId,
-        )
-    else:
-        team_repo.update_team_project_stats_entry(
-            team_id=team_id,
-            project_id=project.Id,
-            solved=status,
-            accepted_time_minutes=difference if status else None,
-            current_submission_id=submissionId,
-        )
+    # Grading runs on the worker pool; clients poll /api/submissions/grading_status
+    enqueue_submission(current_app._get_current_object(), submissionId)
 
     message = {
         'message': 'Success',
         'remainder': 120,
         'cooldownRemainingSeconds': 120,
         "sid": submissionId,
+        "gradingStatus": "pending",
     }
 
     return make_response(message, HTTPStatus.OK)
\ No newline at end of file
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GRADING_DIR = os.path.join(os.path.dirname(BACKEND_DIR), "tabot-files", "grading-scripts")
+
+# Tests import the app as `src.…` (like app.py) and the grading scripts by module name
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, GRADING_DIR)
+
+from src.repositories.database import db  # noqa: E402
+from src.repositories import models  # noqa: E402,F401
+
+
+@pytest.fixture
+def app():
+    """
+    Flask app on an in-memory SQLite database with every model's table created.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
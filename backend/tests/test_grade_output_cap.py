@@ -0,0 +1,48 @@
+import grade
+import judge0
+
+
+def run_python_testcase(monkeypatch, tmp_path, stdout: str, expected: str) -> tuple[dict, dict]:
+    source = tmp_path / "main.py"
+    source.write_text("print()\n")
+    monkeypatch.setattr(
+        judge0,
+        "judge0_create_submission",
+        lambda zip_b64, stdin: {
+            "token": "t",
+            "stdout": judge0.base64_encode_text(stdout),
+            "status": {"id": judge0.JUDGE0_STATUS_ACCEPTED},
+        },
+    )
+    spec = {
+        "name": "big",
+        "description": "",
+        "input": "",
+        "expected": expected,
+        "additional_files": [],
+        "entry_class": "",
+        "compare": "exact",
+    }
+    [response] = grade.execute_testcases(str(source), "python", [spec], max_in_flight=1, use_batch=False)
+    return response, grade.build_testcase_result(spec, response)
+
+
+def test_runaway_output_is_cut_at_decode_and_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(grade, "MAX_OUTPUT_CHARS", 20)
+    line = "0123456789\n"
+
+    response, result = run_python_testcase(monkeypatch, tmp_path, line * 1000, line * 1000)
+
+    assert response["stdout"] == (line * 2)[:21]
+    assert not result["passed"]
+    assert result["diffTruncated"]
+
+
+def test_output_at_the_cap_is_compared_in_full(monkeypatch, tmp_path):
+    monkeypatch.setattr(grade, "MAX_OUTPUT_CHARS", 20)
+    stdout = "0123456789\n" + "abcdefgh\n"
+
+    response, result = run_python_testcase(monkeypatch, tmp_path, stdout, stdout)
+
+    assert response["stdout"] == stdout
+    assert result["passed"]
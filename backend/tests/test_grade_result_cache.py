@@ -0,0 +1,30 @@
+from grade import results_are_cacheable
+from judge0 import TIMEOUT_EXIT_CODE, normalize_judge0_result
+
+
+def judge0_result(status_id: int, exit_code: int | None = 0) -> dict:
+    return {"stdout": "", "stderr": "", "compile_output": "", "status_id": status_id, "exit_code": exit_code}
+
+
+def test_definite_verdicts_are_cacheable():
+    wrong = judge0_result(4)
+    assert results_are_cacheable([judge0_result(3), wrong, judge0_result(6), judge0_result(11, 1)])
+    # Testcases skipped after the first failure
+    assert results_are_cacheable([wrong, None, None])
+
+
+def test_python_timeout_reported_as_runtime_error_is_not_cacheable():
+    assert not results_are_cacheable([judge0_result(3), judge0_result(11, TIMEOUT_EXIT_CODE)])
+
+
+def test_time_limits_and_missing_verdicts_are_not_cacheable():
+    assert not results_are_cacheable([judge0_result(5)])
+    assert not results_are_cacheable([judge0_result(13)])
+    assert not results_are_cacheable([judge0_result(0, None)])
+
+
+def test_normalized_results_keep_the_exit_code():
+    result = normalize_judge0_result({"status": {"id": 11}, "exit_code": TIMEOUT_EXIT_CODE})
+    assert result["exit_code"] == TIMEOUT_EXIT_CODE
+    assert not results_are_cacheable([result])
+    assert normalize_judge0_result({"status": {"id": 3}})["exit_code"] is None
@@ -0,0 +1,90 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import grade
+import judge0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(judge0, "time", SimpleNamespace(time=clock.time, sleep=clock.sleep))
+    monkeypatch.setattr(judge0, "JUDGE0_CALLBACK_URL", "")
+    monkeypatch.setattr(judge0, "JUDGE0_POLL_MAX_SECONDS", 10.0)
+    monkeypatch.setattr(judge0, "poll_delays", lambda: itertools.repeat(4.0))
+    return clock
+
+
+def serve_batches(monkeypatch, clock, finished_at: dict[str, float]) -> list[float]:
+    """
+    Fakes the batch GET: each token reports Accepted once the clock reaches its time.
+    """
+    polls: list[float] = []
+
+    def get_batch(tokens):
+        polls.append(clock.now)
+        return [
+            {"token": t, "status": {"id": 3 if clock.now >= finished_at[t] else 2}}
+            for t in tokens
+        ]
+
+    monkeypatch.setattr(judge0, "judge0_get_submissions_batch", get_batch)
+    return polls
+
+
+def test_deadline_restarts_while_the_batch_makes_progress(monkeypatch, clock):
+    # Together these take longer than JUDGE0_POLL_MAX_SECONDS, but one finishes every 8s
+    serve_batches(monkeypatch, clock, {"a": 8.0, "b": 16.0, "c": 24.0})
+
+    results = judge0.poll_judge0_batch(["a", "b", "c"])
+
+    assert {t: r["status"]["id"] for t, r in results.items()} == {"a": 3, "b": 3, "c": 3}
+
+
+def test_stalled_batch_gives_up_and_reports_an_internal_error(monkeypatch, clock):
+    polls = serve_batches(monkeypatch, clock, {"a": 4.0, "b": float("inf")})
+
+    results = judge0.poll_judge0_batch(["a", "b"])
+
+    # "a" finished at 4s, so "b" was given until 14s without progress
+    assert polls == [4.0, 8.0, 12.0]
+    assert clock.now == pytest.approx(14.0)
+
+    stalled = judge0.normalize_judge0_result(results["b"])
+    assert stalled["status_id"] == judge0.JUDGE0_STATUS_INTERNAL_ERROR
+    assert judge0.is_internal_error(judge0.normalize_judge0_result({}))
+    assert not grade.results_are_cacheable([stalled])
+
+
+def test_grading_fails_instead_of_recording_wrong_output(monkeypatch, tmp_path):
+    submission = tmp_path / "submission" / "main.py"
+    submission.parent.mkdir()
+    submission.write_text("print(1)\n")
+    testcases = {"1": ["first", "", "", "1\n"], "2": ["second", "", "", "2\n"]}
+
+    monkeypatch.setattr(grade, "RESULT_CACHE_DIR", "")
+    monkeypatch.setattr(
+        grade,
+        "execute_testcases",
+        lambda *args, **kwargs: [
+            {"stdout": "1\n", "stderr": "", "compile_output": "", "status_id": 3},
+            judge0.judge0_error_result(stderr="Judge0 did not finish this testcase in time."),
+        ],
+    )
+
+    with pytest.raises(RuntimeError, match="second"):
+        grade.grade_submission("1", "python", testcases, str(submission.parent), "", root=str(tmp_path))
+    assert not (submission.parent / "testcases.json").exists()
@@ -0,0 +1,30 @@
+import judge0
+
+
+def test_shared_build_output_is_attached_to_every_run(monkeypatch):
+    monkeypatch.setattr(
+        judge0,
+        "judge0_create_submission",
+        lambda zip_b64, stdin: {
+            "token": "t",
+            "stdout": judge0.base64_encode_text(stdin),
+            "status": {"id": judge0.JUDGE0_STATUS_ACCEPTED},
+        },
+    )
+    archive = ("zip", None, "main.c:3: warning: unused variable 'x'\n")
+
+    results = [
+        judge0.call_judge0_api("main.c", stdin, "c", [], archive=archive)
+        for stdin in ("1\n", "2\n")
+    ]
+
+    assert [r["stdout"] for r in results] == ["1\n", "2\n"]
+    assert all(r["compile_output"] == archive[2] for r in results)
+
+
+def test_run_compile_output_is_kept_over_the_build_output():
+    result = judge0.normalize_judge0_result(
+        {"compile_output": judge0.base64_encode_text("own\n"), "status": {"id": judge0.JUDGE0_STATUS_ACCEPTED}},
+        "shared\n",
+    )
+    assert result["compile_output"] == "own\n"
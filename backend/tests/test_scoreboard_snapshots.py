@@ -0,0 +1,131 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.repositories.database import db
+from src.repositories.models import Schools, TeamProjectStats, Teams
+from src.repositories.team_repository import TeamRepository
+from src.services import scoreboard_service
+from src.services.scoreboard_service import (
+    SNAPSHOT_KEYFRAME_MINUTES,
+    IncrementalScoreboard,
+    ScoreboardReplayIndex,
+    encode_scoreboard_snapshot,
+    reconstruct_scoreboard_payload,
+    save_scoreboard_snapshot,
+)
+
+DIVISION = "Blue"
+START = datetime(2026, 4, 1, 9, 0)
+
+
+class FakeProjectRepository:
+    def __init__(self, *project_ids: int):
+        self.project_ids = list(project_ids)
+
+    def get_projects_by_type_division(self, project_type, division):
+        return [SimpleNamespace(Id=pid, OrderIndex=i) for i, pid in enumerate(self.project_ids)]
+
+
+@pytest.fixture
+def team_repo(app):
+    # load_keyframe caches by row id, and ids restart with every test database
+    scoreboard_service._keyframe_cache.clear()
+
+    db.session.add(Schools(Id=1, Name="Central"))
+    db.session.add_all([
+        Teams(Id=team_id, SchoolId=1, TeamNumber=team_id, Name=f"Team {team_id}", Division=DIVISION, IsOnline=False)
+        for team_id in (1, 2, 3)
+    ])
+    db.session.commit()
+    return TeamRepository()
+
+
+def record(team_id: int, project_id: int, attempts: int, accepted: int | None) -> TeamProjectStats:
+    entry = TeamProjectStats.query.filter_by(TeamId=team_id, ProjectId=project_id).first()
+    if entry is None:
+        entry = TeamProjectStats(TeamId=team_id, ProjectId=project_id)
+        db.session.add(entry)
+    entry.Attempts = attempts
+    entry.Solved = accepted is not None
+    entry.AcceptedTimeMinutes = accepted
+    entry.CurrentSubmissionId = attempts
+    db.session.commit()
+    return entry
+
+
+def snapshot(team_repo, board: IncrementalScoreboard, minute: int):
+    kind, base_minute, payload = encode_scoreboard_snapshot(team_repo, board, minute)
+    save_scoreboard_snapshot(minute, START, DIVISION, False, payload, kind=kind, base_minute=base_minute)
+    db.session.commit()
+    return team_repo.get_scoreboard_snapshot_at(DIVISION, False, minute)
+
+
+def test_deltas_rebuild_the_board_from_their_keyframe(team_repo):
+    projects = FakeProjectRepository(10, 11)
+    record(1, 10, 1, 5)
+    board = IncrementalScoreboard(DIVISION, False, "competition")
+    board.refresh(projects, team_repo, now=START)
+
+    keyframe = snapshot(team_repo, board, 0)
+    assert (keyframe.Kind, keyframe.BaseMinute) == ("full", None)
+    assert json.loads(keyframe.Payload) == json.loads(board.to_json())
+
+    # Team 3 jumps to first place; team 1 is unchanged
+    board.apply_stats(record(3, 10, 1, 2))
+    board.apply_stats(record(3, 11, 2, 4))
+    delta = snapshot(team_repo, board, 1)
+
+    assert (delta.Kind, delta.BaseMinute) == ("delta", 0)
+    stored = json.loads(delta.Payload)
+    assert stored["order"] == [3, 1, 2]
+    assert [team["teamId"] for team in stored["teams"]] == [3]
+    assert reconstruct_scoreboard_payload(team_repo, delta) == json.loads(board.to_json())
+
+    # Later deltas are still taken against the keyframe, not the previous delta
+    board.apply_stats(record(2, 11, 3, 7))
+    second = snapshot(team_repo, board, 2)
+    assert second.BaseMinute == 0
+    assert [team["teamId"] for team in json.loads(second.Payload)["teams"]] == [3, 2]
+    assert reconstruct_scoreboard_payload(team_repo, second) == json.loads(board.to_json())
+
+
+def test_new_keyframe_after_the_interval_or_a_problem_set_change(team_repo):
+    projects = FakeProjectRepository(10)
+    board = IncrementalScoreboard(DIVISION, False, "competition")
+    board.refresh(projects, team_repo, now=START)
+
+    snapshot(team_repo, board, 0)
+    assert snapshot(team_repo, board, SNAPSHOT_KEYFRAME_MINUTES - 1).Kind == "delta"
+    assert snapshot(team_repo, board, SNAPSHOT_KEYFRAME_MINUTES).Kind == "full"
+
+    projects.project_ids.append(11)
+    board.refresh(projects, team_repo, now=START)
+    changed = snapshot(team_repo, board, SNAPSHOT_KEYFRAME_MINUTES + 1)
+    assert changed.Kind == "full"
+    assert [p["id"] for p in json.loads(changed.Payload)["projects"]] == [10, 11]
+
+
+def test_replay_index_matches_stored_snapshots(team_repo):
+    projects = FakeProjectRepository(10)
+    board = IncrementalScoreboard(DIVISION, False, "competition")
+    board.refresh(projects, team_repo, now=START)
+
+    snapshot(team_repo, board, 0)
+    board.apply_stats(record(2, 10, 2, 3))
+    snapshot(team_repo, board, 1)
+    board.apply_stats(record(1, 10, 1, 4))
+    snapshot(team_repo, board, 2)
+
+    replay = ScoreboardReplayIndex(DIVISION, False, team_repo.get_scoreboard_snapshots(DIVISION, False))
+
+    for minute in (0, 1, 2):
+        stored = team_repo.get_scoreboard_snapshot_at(DIVISION, False, minute)
+        assert replay.payload_at(minute) == (minute, reconstruct_scoreboard_payload(team_repo, stored))
+    assert replay.payload_at()[1] == json.loads(board.to_json())
+
+    # A window starting on a delta still carries the keyframe it needs
+    window = json.loads("".join(replay.iter_json(from_minute=2, to_minute=2)))
+    assert [(s["minute"], s["kind"]) for s in window["snapshots"]] == [(0, "full"), (2, "delta")]
@@ -0,0 +1,60 @@
+from src.repositories.database import db
+from src.repositories.models import Submissions
+from src.repositories.team_repository import TeamRepository
+
+TEAM_ID = 7
+PROJECT_ID = 3
+
+
+def add_pending_submissions(*passing: bool) -> list[int]:
+    rows = [
+        Submissions(Team=TEAM_ID, Project=PROJECT_ID, GradingStatus="pending", IsPassing=False)
+        for _ in passing
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [row.Id for row in rows]
+
+
+def finish_grading(team_repo: TeamRepository, submission_id: int, passing: bool):
+    submission = db.session.get(Submissions, submission_id)
+    submission.GradingStatus = "graded"
+    submission.IsPassing = passing
+    db.session.commit()
+    # The accepted minute is the submission's Id here, so the test can see which one counted
+    return team_repo.recompute_team_project_stats(TEAM_ID, PROJECT_ID, lambda accepted: accepted.Id)
+
+
+def test_stats_do_not_depend_on_grading_order(app):
+    team_repo = TeamRepository()
+    failing_id, passing_id = add_pending_submissions(False, True)
+
+    # The passing upload finishes first; the earlier failing one is still counted
+    entry = finish_grading(team_repo, passing_id, True)
+    assert (entry.Attempts, entry.Solved, entry.AcceptedTimeMinutes) == (1, True, passing_id)
+
+    entry = finish_grading(team_repo, failing_id, False)
+    assert (entry.Attempts, entry.Solved, entry.AcceptedTimeMinutes) == (2, True, passing_id)
+    assert entry.CurrentSubmissionId == passing_id
+
+
+def test_submissions_after_the_first_pass_are_not_counted(app):
+    team_repo = TeamRepository()
+    first_pass_id, second_pass_id = add_pending_submissions(True, True)
+
+    finish_grading(team_repo, second_pass_id, True)
+    entry = finish_grading(team_repo, first_pass_id, True)
+
+    assert (entry.Attempts, entry.AcceptedTimeMinutes, entry.CurrentSubmissionId) == (1, first_pass_id, first_pass_id)
+
+
+def test_unsolved_counts_every_graded_submission(app):
+    team_repo = TeamRepository()
+    ids = add_pending_submissions(False, False, False)
+
+    finish_grading(team_repo, ids[2], False)
+    entry = finish_grading(team_repo, ids[0], False)
+
+    # ids[1] is still being graded
+    assert (entry.Attempts, entry.Solved, entry.AcceptedTimeMinutes) == (2, False, None)
+    assert entry.CurrentSubmissionId == ids[2]
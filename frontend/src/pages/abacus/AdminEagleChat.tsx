@@ -6,6 +6,7 @@ import { FaSync } from "react-icons/fa";
 import MenuComponent from "../components/MenuComponent";
 import DirectoryBreadcrumbs from "../components/DirectoryBreadcrumbs";
 import EagleChatThread from "../components/EagleChatThread";
+import useThreadMessages from "../components/useThreadMessages";
 import "../../styling/EagleDivision.scss";
 
 type EagleConversationStage =
@@ -50,7 +51,7 @@ export default function AdminEagleChat() {
 
     const [teams, setTeams] = useState<TeamConversationRow[]>([]);
     const [selectedTeamId, setSelectedTeamId] = useState<number | null>(null);
-    const [messages, setMessages] = useState<ChatRow[]>([]);
+    const { messages, afterIdFor, applyMessages, resetMessages } = useThreadMessages<ChatRow>();
     const [draft, setDraft] = useState("");
     const [teamsError, setTeamsError] = useState("");
     const [messagesError, setMessagesError] = useState("");
@@ -141,26 +142,27 @@ export default function AdminEagleChat() {
 
     const loadMessages = useCallback(async (teamId: number | null, showLoader = true) => {
         if (!teamId) {
-            setMessages([]);
+            resetMessages();
             setMessagesError("");
             return;
         }
 
         if (showLoader) setLoadingMessages(true);
         try {
-            const res = await axios.get<ChatRow[]>(
-                `${apiBase}/eagle/messages?team_id=${teamId}`,
-                authConfig()
-            );
-            setMessages(Array.isArray(res.data) ? res.data : []);
+            const afterId = afterIdFor(teamId);
+            const res = await axios.get<ChatRow[]>(`${apiBase}/eagle/messages`, {
+                ...authConfig(),
+                params: { team_id: teamId, ...(afterId ? { after_id: afterId } : {}) },
+            });
+            applyMessages(teamId, Array.isArray(res.data) ? res.data : [], afterId);
             setMessagesError("");
         } catch {
-            setMessages([]);
+            resetMessages();
             setMessagesError("Could not load messages for this team.");
         } finally {
             if (showLoader) setLoadingMessages(false);
         }
-    }, [apiBase, authConfig]);
+    }, [apiBase, authConfig, afterIdFor, applyMessages, resetMessages]);
 
     const refreshAll = useCallback(async () => {
         await loadTeams();
@@ -213,7 +215,7 @@ export default function AdminEagleChat() {
     useEffect(() => {
         if (teams.length === 0) {
             setSelectedTeamId(null);
-            setMessages([]);
+            resetMessages();
             return;
         }
 
@@ -228,7 +230,7 @@ export default function AdminEagleChat() {
             null;
 
         setSelectedTeamId(preferred?.id ?? null);
-    }, [teams, selectedTeamId, needsAdminReplyTeams, waitingForRequesterTeams, noMessageTeams]);
+    }, [teams, selectedTeamId, needsAdminReplyTeams, waitingForRequesterTeams, noMessageTeams, resetMessages]);
 
     useEffect(() => {
         loadMessages(selectedTeamId);
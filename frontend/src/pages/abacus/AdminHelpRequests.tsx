@@ -10,6 +10,7 @@ import axios from 'axios'
 import '../../styling/AdminHelpRequests.scss'
 import MenuComponent from '../components/MenuComponent'
 import DirectoryBreadcrumbs from '../components/DirectoryBreadcrumbs'
+import useThreadMessages from '../components/useThreadMessages'
 import HelpRequestThread, {
     HelpRequestConversationMessage,
 } from '../components/HelpRequestThread'
@@ -52,6 +53,13 @@ interface HelpRequestsStateItem {
     messageCount?: number
 }
 
+interface HelpRequestsPage {
+    items: HelpRequestsStateItem[]
+    nextCursor: string | null
+    serverTime: string | null
+    ids?: number[]
+}
+
 interface HelpRequestMessage {
     id: number
     senderType: 'student' | 'admin'
@@ -63,13 +71,20 @@ interface HelpRequestMessage {
 
 const HISTORY_PAGE_SIZE = 6
 const POLL_MS = 30000
+const REQUESTS_PAGE_SIZE = 200
 const COMPOSER_MIN_HEIGHT = 56
 
+// Server order for the list: newest CreatedAt first, then highest id (ISO strings sort as text)
+const compareRequestsNewestFirst = (a: HelpRequestsStateItem, b: HelpRequestsStateItem) => {
+    if (a.createdAt === b.createdAt) return b.id - a.id
+    return a.createdAt < b.createdAt ? 1 : -1
+}
+
 const AdminHelpRequests: React.FC = () => {
     const [helpRequests, setHelpRequests] = useState<HelpRequestsStateItem[]>([])
     const [historyPage, setHistoryPage] = useState(1)
     const [selectedRequestId, setSelectedRequestId] = useState<number | null>(null)
-    const [messages, setMessages] = useState<HelpRequestMessage[]>([])
+    const { messages, afterIdFor, applyMessages, resetMessages } = useThreadMessages<HelpRequestMessage>()
     const [loadingMessages, setLoadingMessages] = useState(false)
     const [draftMessage, setDraftMessage] = useState('')
     const [sendingMessage, setSendingMessage] = useState(false)
@@ -199,13 +214,43 @@ const AdminHelpRequests: React.FC = () => {
         resizeComposer()
     }, [draftMessage, selectedRequestId, resizeComposer])
 
+    // Server time of the last successful load; later polls only ask for what changed since
+    const lastSyncRef = useRef<string | null>(null)
+
     const fetchRequests = useCallback(async () => {
+        const url = `${import.meta.env.VITE_API_URL}/submissions/help-requests`
         try {
-            const res = await axios.get(
-                `${import.meta.env.VITE_API_URL}/submissions/help-requests`,
-                authConfig()
-            )
-            setHelpRequests(res.data)
+            if (lastSyncRef.current) {
+                const res = await axios.get<HelpRequestsPage>(url, {
+                    ...authConfig(),
+                    params: { since: lastSyncRef.current },
+                })
+                const changed = new Map(res.data.items.map((item) => [item.id, item]))
+                const existingIds = new Set(res.data.ids ?? [])
+
+                setHelpRequests((prev) => {
+                    const kept = prev.filter((item) => existingIds.has(item.id) && !changed.has(item.id))
+                    return [...res.data.items, ...kept].sort(compareRequestsNewestFirst)
+                })
+                lastSyncRef.current = res.data.serverTime
+                return
+            }
+
+            const loaded: HelpRequestsStateItem[] = []
+            let cursor: string | null = null
+            let serverTime: string | null = null
+            do {
+                const res: { data: HelpRequestsPage } = await axios.get<HelpRequestsPage>(url, {
+                    ...authConfig(),
+                    params: { limit: REQUESTS_PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+                })
+                loaded.push(...res.data.items)
+                serverTime = serverTime ?? res.data.serverTime
+                cursor = res.data.nextCursor
+            } while (cursor)
+
+            setHelpRequests(loaded)
+            lastSyncRef.current = serverTime
         } catch (err) {
             console.error('Failed to fetch help requests:', err)
         }
@@ -214,18 +259,19 @@ const AdminHelpRequests: React.FC = () => {
     const fetchMessages = useCallback(async (requestId: number, showLoader = true) => {
         if (showLoader) setLoadingMessages(true)
         try {
-            const res = await axios.get(
+            const afterId = afterIdFor(requestId)
+            const res = await axios.get<HelpRequestMessage[]>(
                 `${import.meta.env.VITE_API_URL}/submissions/help-request/${requestId}/messages`,
-                authConfig()
+                { ...authConfig(), params: afterId ? { after_id: afterId } : {} }
             )
-            setMessages(res.data)
+            applyMessages(requestId, Array.isArray(res.data) ? res.data : [], afterId)
         } catch (err) {
             console.error('Failed to fetch help request messages:', err)
-            setMessages([])
+            resetMessages()
         } finally {
             if (showLoader) setLoadingMessages(false)
         }
-    }, [authConfig])
+    }, [authConfig, afterIdFor, applyMessages, resetMessages])
 
     const refreshAll = useCallback(async () => {
         await fetchRequests()
@@ -287,7 +333,7 @@ const AdminHelpRequests: React.FC = () => {
     useEffect(() => {
         if (helpRequests.length === 0) {
             setSelectedRequestId(null)
-            setMessages([])
+            resetMessages()
             return
         }
 
@@ -309,15 +355,16 @@ const AdminHelpRequests: React.FC = () => {
         needsAdminReplyRequests,
         waitingForRequesterRequests,
         historyRequests,
+        resetMessages,
     ])
 
     useEffect(() => {
         if (selectedRequestId) {
             fetchMessages(selectedRequestId)
         } else {
-            setMessages([])
+            resetMessages()
         }
-    }, [selectedRequestId, fetchMessages])
+    }, [selectedRequestId, fetchMessages, resetMessages])
 
     const selectedRequest = useMemo(() => {
         return helpRequests.find((item) => item.id === selectedRequestId) ?? null
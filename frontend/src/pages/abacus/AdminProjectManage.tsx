@@ -43,6 +43,7 @@ class Testcase {
         this.input = ''
         this.output = ''
         this.hidden = false
+        this.compare = 'normalized'
     }
 
     id: number
@@ -51,8 +52,16 @@ class Testcase {
     input: string
     output: string
     hidden: boolean
+    compare: string
 }
 
+const COMPARE_POLICY_OPTIONS = [
+    { label: 'Ignore whitespace, blank lines and case', value: 'normalized' },
+    { label: 'Exact (line by line)', value: 'exact' },
+    { label: 'Tokens (whitespace-separated)', value: 'tokens' },
+    { label: 'Numbers within 1e-6', value: 'float' },
+]
+
 type SolutionLang = 'java' | 'python'
 type ProjectType = 'competition' | 'practice' | 'none'
 type ProjectDivision = 'blue' | 'gold'
@@ -135,6 +144,7 @@ export default function AdminProjectManage({
     const [mainJavaFileName, setMainJavaFileName] = useState<string>('')
     const [projectType, setProjectType] = useState<ProjectType>('none')
     const [goldProblemType, setGoldProblemType] = useState<GoldProblemType>('normal')
+    const [stopOnFirstFailure, setStopOnFirstFailure] = useState<boolean>(false)
 
     const goldProblemTypeLabel = goldProblemType === 'creative' ? 'Creative' : 'Normal'
     const goldProblemTypeMaxPoints = goldProblemType === 'creative' ? 15 : 7
@@ -352,6 +362,7 @@ export default function AdminProjectManage({
                     testcase.input = t.input
                     testcase.output = t.output
                     testcase.hidden = parseHidden(t.hidden)
+                    testcase.compare = t.compare || 'normalized'
                     rows.push(testcase)
                     return testcase
                 })
@@ -377,6 +388,7 @@ export default function AdminProjectManage({
                     setProjectLanguage(data["language"] || '')
                     setProjectType(data["type"] as ProjectType)
                     setGoldProblemType(((data["goldProblemType"] || 'normal') as GoldProblemType) === 'creative' ? 'creative' : 'normal')
+                    setStopOnFirstFailure(Boolean(data["stopOnFirstFailure"]))
                     setServerProjectLanguageSnapshot(data["language"] || '')
                     setSolutionFileNames([])
                     setSolutionFiles([])
@@ -439,6 +451,13 @@ export default function AdminProjectManage({
         })
     }
 
+    function handleCompareChange(testcase_id: number, compare: string) {
+        setModalDraft(prev => {
+            if (prev && prev.id === testcase_id) return { ...prev, compare }
+            return prev
+        })
+    }
+
     async function buttonhandleTrashClick(testcase: number) {
         let test: Testcase = new Testcase()
         for (let i = 0; i < testcases.length; i++) {
@@ -475,6 +494,7 @@ export default function AdminProjectManage({
                 testcase.input = t.input
                 testcase.output = t.output
                 testcase.hidden = parseHidden(t.hidden)
+                testcase.compare = t.compare || 'normalized'
                 rows.push(testcase)
                 return testcase
             })
@@ -552,6 +572,7 @@ export default function AdminProjectManage({
             formData.append('project_type', projectType)
             formData.append('division', division)
             formData.append('gold_problem_type', goldProblemType)
+            formData.append('stop_on_first_failure', stopOnFirstFailure ? 'true' : 'false')
 
             const res = await axios.post(`${API}/projects/create_project`, formData, authConfig())
             const newId = res.data
@@ -606,6 +627,7 @@ export default function AdminProjectManage({
             formData.append('project_type', projectType)
             formData.append('division', division)
             formData.append('gold_problem_type', goldProblemType)
+            formData.append('stop_on_first_failure', stopOnFirstFailure ? 'true' : 'false')
 
             await axios.post(`${API}/projects/edit_project`, formData, authConfig())
 
@@ -653,6 +675,7 @@ export default function AdminProjectManage({
         formData.append('output', tc.output.toString())
         formData.append('description', tc.description.toString())
         formData.append('hidden', hidden ? 'true' : 'false')
+        formData.append('compare', tc.compare || 'normalized')
 
         try {
             setSubmittingTestcase(true)
@@ -812,6 +835,7 @@ export default function AdminProjectManage({
         formData.append('output', modalDraft.output.toString())
         formData.append('description', modalDraft.description.toString())
         formData.append('hidden', modalDraft.hidden ? 'true' : 'false')
+        formData.append('compare', modalDraft.compare || 'normalized')
 
         if (modalDraft.name === '' || modalDraft.input === '' || modalDraft.description === '') {
             window.alert('Please fill out all fields')
@@ -846,6 +870,7 @@ export default function AdminProjectManage({
                 testcase.input = t.input
                 testcase.output = t.output
                 testcase.hidden = parseHidden(t.hidden)
+                testcase.compare = t.compare || 'normalized'
                 rows.push(testcase)
                 return testcase
             })
@@ -1039,6 +1064,27 @@ export default function AdminProjectManage({
                                         </div>
                                     )}
 
+                                    {division === 'blue' && (
+                                        <div className="form-field input-field">
+                                            <label>Grading</label>
+                                            <SegmentedControl
+                                                className="segment-project-type"
+                                                options={[
+                                                    { label: 'Run all test cases', value: 'all' },
+                                                    { label: 'Stop at first failure', value: 'first' },
+                                                ]}
+                                                value={stopOnFirstFailure ? 'first' : 'all'}
+                                                onChange={(v) => setStopOnFirstFailure(v === 'first')}
+                                                getOptionClassName={(v) => v.toLowerCase()}
+                                            />
+                                            <div className="muted" style={{ marginTop: 8 }}>
+                                                {stopOnFirstFailure
+                                                    ? 'Test cases after the first failure are skipped and shown as Skipped.'
+                                                    : 'Every test case runs on each submission.'}
+                                            </div>
+                                        </div>
+                                    )}
+
                                     <div className="form-group language-group">
                                         <label>Language</label>
                                         <div className="detected-language">
@@ -1682,6 +1728,24 @@ export default function AdminProjectManage({
                                     </label>
                                 </div>
 
+                                <div className="form-field modal-description-field">
+                                    <label>Output Comparison</label>
+                                    <select
+                                        value={
+                                            (selectedTestCase?.compare || 'normalized').startsWith('float')
+                                                ? 'float'
+                                                : selectedTestCase?.compare || 'normalized'
+                                        }
+                                        onChange={e => handleCompareChange(selectedTestCaseId!, e.currentTarget.value)}
+                                    >
+                                        {COMPARE_POLICY_OPTIONS.map(opt => (
+                                            <option key={opt.value} value={opt.value}>
+                                                {opt.label}
+                                            </option>
+                                        ))}
+                                    </select>
+                                </div>
+
                                 <div className="modal-action-buttons">
                                     <button
                                         type="button"
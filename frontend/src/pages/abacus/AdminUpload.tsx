@@ -43,6 +43,9 @@ interface StudentObject {
     MemberId: number;
 }
 
+const GRADING_POLL_INTERVAL_MS = 1000
+const GRADING_POLL_TIMEOUT_MS = 5 * 60 * 1000
+
 const AdminUpload = () => {
     const API = (import.meta.env.VITE_API_URL as string) || "";
     const navigate = useNavigate()
@@ -51,6 +54,7 @@ const AdminUpload = () => {
     const [mainJavaFileName, setMainJavaFileName] = useState<string>('')
 
     const [isLoading, setIsLoading] = useState<boolean>(false)
+    const [loadingMessage, setLoadingMessage] = useState<string>('Uploading...')
 
     const [schools, setSchools] = useState<SchoolObject[]>([])
     const [selectedSchool, setSelectedSchool] = useState<number>(-1)
@@ -232,6 +236,25 @@ const AdminUpload = () => {
         }
     }
 
+    async function waitForGrading(sid: number) {
+        const deadline = Date.now() + GRADING_POLL_TIMEOUT_MS
+
+        while (Date.now() < deadline) {
+            try {
+                const res = await axios.get(`${API}/submissions/grading_status`, {
+                    ...authConfig(),
+                    params: { id: sid },
+                })
+                const status = res?.data?.status
+                if (status === 'graded' || status === 'error') return
+            } catch {
+                // Keep polling until the deadline; the submission page shows the final state
+            }
+
+            await new Promise((resolve) => setTimeout(resolve, GRADING_POLL_INTERVAL_MS))
+        }
+    }
+
     async function handleSubmit(e?: React.FormEvent) {
         e?.preventDefault()
 
@@ -253,6 +276,7 @@ const AdminUpload = () => {
             return
         }
 
+        setLoadingMessage('Uploading...')
         setIsLoading(true)
 
         const formData = new FormData()
@@ -262,6 +286,8 @@ const AdminUpload = () => {
 
         try {
             const res = await axios.post(`${API}/upload/`, formData, authConfig())
+            setLoadingMessage('Grading...')
+            await waitForGrading(res.data.sid)
             setIsLoading(false)
             navigate(`/admin/upload/submission/${res.data.sid}`, {
                 state: {
@@ -291,7 +317,7 @@ const AdminUpload = () => {
 
     return (
         <>
-            <LoadingAnimation show={isLoading} message="Uploading..." />
+            <LoadingAnimation show={isLoading} message={loadingMessage} />
 
             <Helmet>
                 <title>[Admin] Blue Division Admin Upload | Abacus</title>
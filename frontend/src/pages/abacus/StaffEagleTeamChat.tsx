@@ -6,6 +6,7 @@ import { useNavigate, useParams } from "react-router-dom";
 import MenuComponent from "../components/MenuComponent";
 import DirectoryBreadcrumbs from "../components/DirectoryBreadcrumbs";
 import EagleChatThread from "../components/EagleChatThread";
+import useThreadMessages from "../components/useThreadMessages";
 import "../../styling/EagleDivision.scss";
 
 type ChatRow = {
@@ -34,7 +35,7 @@ export default function StaffEagleTeamChat({ viewer }: Props) {
 
     const teamIdNum = useMemo(() => Number(teamId), [teamId]);
 
-    const [messages, setMessages] = useState<ChatRow[]>([]);
+    const { messages, afterIdFor, applyMessages, resetMessages } = useThreadMessages<ChatRow>();
     const [draft, setDraft] = useState("");
     const [error, setError] = useState("");
     const [sending, setSending] = useState(false);
@@ -76,17 +77,18 @@ export default function StaffEagleTeamChat({ viewer }: Props) {
     const loadMessages = useCallback(async (showLoader = true) => {
         if (!Number.isFinite(teamIdNum) || teamIdNum <= 0) {
             setError("Invalid team id.");
-            setMessages([]);
+            resetMessages();
             return;
         }
 
         if (showLoader) setLoadingMessages(true);
         try {
-            const res = await axios.get<ChatRow[]>(
-                `${apiBase}/eagle/messages?team_id=${teamIdNum}`,
-                authConfig()
-            );
-            setMessages(Array.isArray(res.data) ? res.data : []);
+            const afterId = afterIdFor(teamIdNum);
+            const res = await axios.get<ChatRow[]>(`${apiBase}/eagle/messages`, {
+                ...authConfig(),
+                params: { team_id: teamIdNum, ...(afterId ? { after_id: afterId } : {}) },
+            });
+            applyMessages(teamIdNum, Array.isArray(res.data) ? res.data : [], afterId);
             setError("");
         } catch (err: any) {
             const msg = err?.response?.data?.message || "Could not load messages for this team.";
@@ -94,7 +96,7 @@ export default function StaffEagleTeamChat({ viewer }: Props) {
         } finally {
             if (showLoader) setLoadingMessages(false);
         }
-    }, [apiBase, authConfig, teamIdNum]);
+    }, [apiBase, authConfig, teamIdNum, afterIdFor, applyMessages, resetMessages]);
 
     useEffect(() => {
         loadTeamName();
@@ -7,6 +7,7 @@ import { useNavigate } from "react-router-dom";
 import MenuComponent from "../components/MenuComponent";
 import DirectoryBreadcrumbs from "../components/DirectoryBreadcrumbs";
 import EagleChatThread from "../components/EagleChatThread";
+import useThreadMessages from "../components/useThreadMessages";
 import CompetitionStageStatus, {
     CompetitionSchedule,
     CompetitionStage,
@@ -46,7 +47,7 @@ export default function StudentEagleHome() {
 
     const [problem, setProblem] = useState<ProblemPayload | null>(null);
     const [problemError, setProblemError] = useState("");
-    const [messages, setMessages] = useState<ChatRow[]>([]);
+    const { messages, afterIdFor, applyMessages } = useThreadMessages<ChatRow>();
     const [chatError, setChatError] = useState("");
     const [draft, setDraft] = useState("");
     const [sending, setSending] = useState(false);
@@ -112,8 +113,12 @@ export default function StudentEagleHome() {
 
     const loadMessages = useCallback(async () => {
         try {
-            const res = await axios.get<ChatRow[]>(`${apiBase}/eagle/messages`, authConfig());
-            setMessages(Array.isArray(res.data) ? res.data : []);
+            const afterId = afterIdFor();
+            const res = await axios.get<ChatRow[]>(`${apiBase}/eagle/messages`, {
+                ...authConfig(),
+                params: afterId ? { after_id: afterId } : {},
+            });
+            applyMessages(0, Array.isArray(res.data) ? res.data : [], afterId);
             setChatError("");
         } catch (err: unknown) {
             const ax = err as { response?: { status?: number } };
@@ -125,7 +130,7 @@ export default function StudentEagleHome() {
                 "Could not load messages. If this persists, ask an admin to run the EagleTeamMessages database setup."
             );
         }
-    }, [apiBase, authConfig, navigate]);
+    }, [apiBase, authConfig, navigate, afterIdFor, applyMessages]);
 
     useEffect(() => {
         loadTeam();
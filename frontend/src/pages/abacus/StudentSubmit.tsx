@@ -45,6 +45,15 @@ type SubmitStatusResponse = {
   cooldownRemainingSeconds?: number;
 };
 
+type GradingStatusResponse = {
+  sid: number;
+  status: "pending" | "running" | "graded" | "error";
+  isPassing?: boolean;
+};
+
+const GRADING_POLL_INTERVAL_MS = 1000;
+const GRADING_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
 const StudentSubmit = () => {
   const apiBase = (import.meta.env.VITE_API_URL as string) || "";
   const navigate = useNavigate();
@@ -59,6 +68,7 @@ const StudentSubmit = () => {
   const [mainJavaFileName, setMainJavaFileName] = useState<string>("");
 
   const [isLoading, setIsLoading] = useState<boolean>(false);
+  const [loadingMessage, setLoadingMessage] = useState<string>("Uploading...");
   const [isPageLoading, setIsPageLoading] = useState<boolean>(false);
 
   const [project, setProject] = useState<ProjectObject | null>(null);
@@ -195,6 +205,29 @@ const StudentSubmit = () => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [passedAllTests]);
 
+  async function waitForGrading(sid: number | string): Promise<GradingStatusResponse | null> {
+    const deadline = Date.now() + GRADING_POLL_TIMEOUT_MS;
+
+    while (Date.now() < deadline) {
+      try {
+        const res = await axios.get<GradingStatusResponse>(`${apiBase}/submissions/grading_status`, {
+          ...authConfig(),
+          params: { id: sid },
+        });
+        const status = res?.data?.status;
+        if (status === "graded" || status === "error") {
+          return res.data;
+        }
+      } catch {
+        // Transient errors while grading are retried until the deadline
+      }
+
+      await new Promise((resolve) => setTimeout(resolve, GRADING_POLL_INTERVAL_MS));
+    }
+
+    return null;
+  }
+
   async function fetchPage() {
     if (projectId <= 0) {
       setProject(null);
@@ -362,6 +395,7 @@ const StudentSubmit = () => {
     }
 
     clearLocalError();
+    setLoadingMessage("Uploading...");
     setIsLoading(true);
 
     const formData = new FormData();
@@ -377,6 +411,13 @@ const StudentSubmit = () => {
         return;
       }
 
+      setLoadingMessage("Grading...");
+      const grading = await waitForGrading(sid);
+      if (grading?.status === "error") {
+        showLocalError("Your submission could not be graded. Please try submitting again.");
+        return;
+      }
+
       navigate(`/submission/${sid}`, {
         state: {
           breadcrumbItems: submissionViewBreadcrumbs,
@@ -453,7 +494,7 @@ const StudentSubmit = () => {
 
   return (
     <div className="student-submit-page">
-      <LoadingAnimation show={isLoading} message="Uploading..." />
+      <LoadingAnimation show={isLoading} message={loadingMessage} />
 
       <Helmet>
         <title>Abacus</title>
@@ -10,6 +10,7 @@ import {
 } from 'react-icons/fa'
 import MenuComponent from '../components/MenuComponent'
 import DirectoryBreadcrumbs from '../components/DirectoryBreadcrumbs'
+import useThreadMessages from '../components/useThreadMessages'
 import HelpRequestThread, {
     HelpRequestConversationMessage,
 } from '../components/HelpRequestThread'
@@ -61,7 +62,7 @@ const TeacherHelpRequests: React.FC = () => {
     const [error, setError] = useState('')
 
     const [selectedRequestId, setSelectedRequestId] = useState<number | null>(null)
-    const [messages, setMessages] = useState<HelpRequestMessage[]>([])
+    const { messages, afterIdFor, applyMessages, resetMessages } = useThreadMessages<HelpRequestMessage>()
     const [loadingMessages, setLoadingMessages] = useState(false)
     const [draftMessage, setDraftMessage] = useState('')
     const [sendingMessage, setSendingMessage] = useState(false)
@@ -180,18 +181,19 @@ const TeacherHelpRequests: React.FC = () => {
     const fetchMessages = useCallback(async (requestId: number, showLoader = true) => {
         if (showLoader) setLoadingMessages(true)
         try {
-            const res = await axios.get(
+            const afterId = afterIdFor(requestId)
+            const res = await axios.get<HelpRequestMessage[]>(
                 `${import.meta.env.VITE_API_URL}/submissions/help-request/${requestId}/messages`,
-                authConfig()
+                { ...authConfig(), params: afterId ? { after_id: afterId } : {} }
             )
-            setMessages(res.data)
+            applyMessages(requestId, Array.isArray(res.data) ? res.data : [], afterId)
         } catch (err) {
             console.error('Failed to fetch help request messages:', err)
-            setMessages([])
+            resetMessages()
         } finally {
             if (showLoader) setLoadingMessages(false)
         }
-    }, [authConfig])
+    }, [authConfig, afterIdFor, applyMessages, resetMessages])
 
     useEffect(() => {
         fetchRequests()
@@ -236,7 +238,7 @@ const TeacherHelpRequests: React.FC = () => {
     useEffect(() => {
         if (helpRequests.length === 0) {
             setSelectedRequestId(null)
-            setMessages([])
+            resetMessages()
             return
         }
 
@@ -249,15 +251,15 @@ const TeacherHelpRequests: React.FC = () => {
             helpRequests[0]
 
         setSelectedRequestId(preferred?.id ?? null)
-    }, [helpRequests, selectedRequestId, activeRequests, historyRequests])
+    }, [helpRequests, selectedRequestId, activeRequests, historyRequests, resetMessages])
 
     useEffect(() => {
         if (selectedRequestId) {
             fetchMessages(selectedRequestId)
         } else {
-            setMessages([])
+            resetMessages()
         }
-    }, [selectedRequestId, fetchMessages])
+    }, [selectedRequestId, fetchMessages, resetMessages])
 
     const selectedRequest = useMemo(() => {
         return helpRequests.find((item) => item.id === selectedRequestId) ?? null
@@ -43,10 +43,12 @@ type NewJsonResult = {
     name: string
     description?: string
     passed: boolean
+    skipped?: boolean
     hidden?: boolean
     shortDiff?: string
     longDiff?: string
     shortDiffSameAsLong?: boolean
+    diffTruncated?: boolean
 }
 
 type LegacyJsonTest = {
@@ -78,6 +80,7 @@ type DiffEntry = {
     shortDiff: string
     longDiff: string
     shortDiffSameAsLong: boolean
+    diffTruncated: boolean
     hidden: boolean
 }
 
@@ -504,22 +507,25 @@ export default function DiffView(props: DiffViewProps) {
                 const rr = (r ?? {}) as NewJsonResult
                 const testName = String(rr.name ?? `Test ${idx + 1}`)
                 const passed = Boolean(rr.passed)
+                const skipped = Boolean(rr.skipped)
                 const hidden = Boolean((rr as any).hidden)
                 const shortDiff = String(rr.shortDiff ?? '')
                 const longDiff = String(rr.longDiff ?? '')
                 const shortDiffSameAsLong = Boolean((rr as any).shortDiffSameAsLong)
+                const diffTruncated = Boolean(rr.diffTruncated)
                 const desc = String(rr.description ?? '')
                 entries.push({
                     id: `${idx}__${testName}`,
                     num: idx + 1,
                     test: testName,
                     description: desc,
-                    status: passed ? 'Passed' : 'Failed',
+                    status: skipped ? 'Skipped' : passed ? 'Passed' : 'Failed',
                     passed,
-                    skipped: false,
+                    skipped,
                     shortDiff,
                     longDiff,
                     shortDiffSameAsLong,
+                    diffTruncated,
                     hidden,
                 })
             })
@@ -552,6 +558,7 @@ export default function DiffView(props: DiffViewProps) {
                 shortDiff: passed ? '' : unified,
                 longDiff: passed ? '' : unified,
                 shortDiffSameAsLong: !passed && !skipped,
+                diffTruncated: false,
                 hidden,
             })
 
@@ -1149,6 +1156,12 @@ export default function DiffView(props: DiffViewProps) {
                             </div>
                         )}
 
+                        {selectedFile && (!selectedFile.hidden || revealHiddenOutput) && !selectedFile.passed && selectedFile.diffTruncated && (
+                            <div className="muted">
+                                This output was too long to show in full; only the first differences are listed.
+                            </div>
+                        )}
+
                         {selectedFile && (!selectedFile.hidden || revealHiddenOutput) && !selectedFile.passed && (
                             diffLayout === 'side-by-side' ? renderSideBySideDiff() : <div className="diff-content">{renderStackedDiff()}</div>
                         )}
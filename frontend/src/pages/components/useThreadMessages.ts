@@ -0,0 +1,60 @@
+import { useCallback, useRef, useState } from "react";
+
+type ThreadMessage = {
+    id: number;
+    createdAt?: string | null;
+};
+
+// Polls re-request this many of the newest messages already on screen. Ids are assigned
+// on insert but can commit out of order, so a message may show up below one already seen.
+export const THREAD_MESSAGE_OVERLAP = 5;
+
+// Same order as the server: CreatedAt (one timestamp format per endpoint, so text order works), then id
+function compareMessages(a: ThreadMessage, b: ThreadMessage) {
+    const aTime = a.createdAt || "";
+    const bTime = b.createdAt || "";
+    if (aTime !== bTime) return aTime < bTime ? -1 : 1;
+    return a.id - b.id;
+}
+
+/**
+ * Messages of the selected chat thread, synced incrementally with ?after_id=.
+ * afterIdFor(threadId) gives the cursor for the next poll (null means load the whole
+ * thread) and applyMessages(threadId, rows, afterId) merges the response, dropping
+ * duplicates from the overlap. Pages with a single thread can leave threadId at 0.
+ */
+export default function useThreadMessages<T extends ThreadMessage>() {
+    const [messages, setMessages] = useState<T[]>([]);
+    const messagesRef = useRef<T[]>([]);
+    const threadRef = useRef<number | null>(null);
+
+    const replaceMessages = useCallback((threadId: number | null, rows: T[]) => {
+        threadRef.current = threadId;
+        messagesRef.current = rows;
+        setMessages(rows);
+    }, []);
+
+    const afterIdFor = useCallback((threadId: number = 0): number | null => {
+        const loaded = messagesRef.current;
+        if (threadRef.current !== threadId || loaded.length <= THREAD_MESSAGE_OVERLAP) return null;
+
+        const ids = loaded.map((row) => row.id).sort((a, b) => a - b);
+        return ids[ids.length - THREAD_MESSAGE_OVERLAP - 1];
+    }, []);
+
+    const applyMessages = useCallback((threadId: number, rows: T[], afterId: number | null) => {
+        if (afterId === null || threadRef.current !== threadId) {
+            replaceMessages(threadId, rows);
+            return;
+        }
+        if (rows.length === 0) return;
+
+        const byId = new Map(messagesRef.current.map((row) => [row.id, row]));
+        rows.forEach((row) => byId.set(row.id, row));
+        replaceMessages(threadId, Array.from(byId.values()).sort(compareMessages));
+    }, [replaceMessages]);
+
+    const resetMessages = useCallback(() => replaceMessages(null, []), [replaceMessages]);
+
+    return { messages, afterIdFor, applyMessages, resetMessages };
+}
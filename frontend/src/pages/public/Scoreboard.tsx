@@ -200,6 +200,33 @@ export default function Scoreboard() {
         return token ? { headers: { Authorization: `Bearer ${token}` } } : {};
     }
 
+    // Applies a scoreboard response (from a fetch or the live stream)
+    const applyScoreboard = useCallback((data: ApiResponse, refresh: boolean) => {
+        const apiTeams = Array.isArray(data.teams) ? data.teams : [];
+        const apiProjects = Array.isArray(data.projects) ? data.projects : [];
+        const timestampRaw = data.timestamp ?? null;
+        const transitionRaw = data.transitionAt ?? null;
+
+        const newTeams = apiTeams.map((team, idx) => {
+            const newRank = idx + 1;
+            const oldRank = prevRankByTeamIdRef.current.get(team.teamId);
+
+            return { ...team, rankDelta: refresh && oldRank !== undefined ? oldRank - newRank : 0 };
+        });
+
+        prevRankByTeamIdRef.current = new Map(newTeams.map((t, i) => [t.teamId, i + 1]));
+        animateNextLayoutRef.current = refresh;
+
+        setTeams(newTeams);
+        setProjects(apiProjects);
+        setStatus(data.status ?? "upcoming");
+        setTimestamp(formatTimestamp(timestampRaw));
+        setTransitionAt(transitionRaw ? new Date(transitionRaw).getTime() : null);
+
+        setRefreshError(false);
+        failedRefreshCount.current = 0;
+    }, []);
+
     // Fetches scoreboard data
     const fetchScoreboard = useCallback(async (refresh = false) => {
         if (isRefreshing.current) return;
@@ -221,29 +248,7 @@ export default function Scoreboard() {
                     params: { division: division, is_online: isOnline, project_type: projectType },
                 }
             );
-            const apiTeams = Array.isArray(res.data.teams) ? res.data.teams : [];
-            const apiProjects = Array.isArray(res.data.projects) ? res.data.projects : [];
-            const timestampRaw = res.data.timestamp ?? null;
-            const transitionRaw = res.data.transitionAt ?? null;
-
-            const newTeams = apiTeams.map((team, idx) => {
-                const newRank = idx + 1;
-                const oldRank = prevRankByTeamIdRef.current.get(team.teamId);
-
-                return { ...team, rankDelta: refresh && oldRank !== undefined ? oldRank - newRank : 0 };
-            });
-
-            prevRankByTeamIdRef.current = new Map(newTeams.map((t, i) => [t.teamId, i + 1]));
-            animateNextLayoutRef.current = refresh;
-
-            setTeams(newTeams);
-            setProjects(apiProjects);
-            setStatus(res.data.status ?? "upcoming");
-            setTimestamp(formatTimestamp(timestampRaw));
-            setTransitionAt(transitionRaw ? new Date(transitionRaw).getTime() : null);
-
-            setRefreshError(false);
-            failedRefreshCount.current = 0;
+            applyScoreboard(res.data, refresh);
         } catch (err: any) {
             if (refresh) {
                 failedRefreshCount.current += 1;
@@ -258,7 +263,7 @@ export default function Scoreboard() {
             }
             isRefreshing.current = false;
         }
-    }, [API, division, isOnline, projectType]);
+    }, [API, division, isOnline, projectType, applyScoreboard]);
 
     // Initial scoreboard fetch
     useEffect(() => {
@@ -271,8 +276,39 @@ export default function Scoreboard() {
         prevRowTopsRef.current = new Map();
     }, [division, isOnline, projectType]);
 
+    // Live updates pushed by the server for the public competition scoreboard;
+    // falls back to timed refreshes if the stream is unavailable
+    const [isStreaming, setIsStreaming] = useState<boolean>(false);
+    const useStream = !isAdmin && projectType === "competition" && typeof EventSource !== "undefined";
+    useEffect(() => {
+        if (!useStream) return;
+
+        const params = new URLSearchParams({ division: division, is_online: String(isOnline) });
+        const source = new EventSource(`${API}/teams/scoreboard/stream?${params.toString()}`);
+        let received = false;
+
+        source.addEventListener("scoreboard", (event) => {
+            try {
+                applyScoreboard(JSON.parse((event as MessageEvent).data), received);
+                received = true;
+                setIsStreaming(true);
+            } catch {
+                // Ignore malformed events; the next one replaces them
+            }
+        });
+        source.onerror = () => {
+            // EventSource retries on its own; poll in the meantime
+            setIsStreaming(false);
+        };
+
+        return () => {
+            source.close();
+            setIsStreaming(false);
+        };
+    }, [API, useStream, division, isOnline, applyScoreboard]);
+
     // Handles auto-refresh for live scoreboard
-    const shouldAutoRefresh = status === "live" || status === "frozen-admin";
+    const shouldAutoRefresh = (status === "live" || status === "frozen-admin") && !isStreaming;
     useEffect(() => {
         if (!shouldAutoRefresh) return;
 
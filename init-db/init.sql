@@ -41,6 +41,7 @@ CREATE TABLE `Projects` (
   `Type` varchar(20) NOT NULL,
   `Division` varchar(20) NOT NULL DEFAULT 'blue',
   `GoldProblemType` varchar(20) NOT NULL DEFAULT 'normal',
+  `StopOnFirstFailure` tinyint(1) NOT NULL DEFAULT '0',
   `DescriptionText` text,
   `OrderIndex` int DEFAULT NULL,
   `solutionpath` varchar(1000) DEFAULT NULL,
@@ -108,11 +109,14 @@ CREATE TABLE `Submissions` (
   `CodeFilepath` varchar(256) NOT NULL,
   `IsPassing` tinyint(1) NOT NULL,
   `TestCaseResults` text,
+  `GradingStatus` varchar(16) NOT NULL DEFAULT 'graded',
+  `GradingStartedAt` datetime DEFAULT NULL,
   PRIMARY KEY (`Id`),
   UNIQUE KEY `idSubmissions_UNIQUE` (`Id`),
   KEY `idx_submissions_team` (`Team`),
   KEY `idx_submissions_user` (`User`),
-  KEY `idx_submissions_project` (`Project`)
+  KEY `idx_submissions_project` (`Project`),
+  KEY `idx_submissions_grading_status` (`GradingStatus`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 -- ============================================
@@ -126,6 +130,7 @@ CREATE TABLE `Testcases` (
   `input` text,
   `Output` text,
   `Hidden` tinyint(1) NOT NULL DEFAULT 0,
+  `ComparePolicy` varchar(32) NOT NULL DEFAULT 'normalized',
   PRIMARY KEY (`Id`),
   UNIQUE KEY `Id_UNIQUE` (`Id`),
   KEY `tc_fk_idx` (`ProjectId`)
@@ -176,8 +181,10 @@ CREATE TABLE HelpRequests (
     CurrentAdminId int,
     CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CompletedAt TIMESTAMP NULL,
+    UpdatedAt TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (`Id`),
     UNIQUE KEY `Id_UNIQUE` (`Id`),
+    KEY `idx_helprequests_updatedat` (`UpdatedAt`),
     FOREIGN KEY (`StudentId`) REFERENCES StudentUsers(Id) ON DELETE CASCADE,
     FOREIGN KEY (`TeacherId`) REFERENCES AdminUsers(Id) ON DELETE SET NULL,
     FOREIGN KEY (`CurrentAdminId`) REFERENCES AdminUsers(Id) ON DELETE SET NULL,
@@ -230,10 +237,12 @@ CREATE TABLE `TeamProjectStats` (
   `Solved` tinyint(1) NOT NULL DEFAULT 0,
   `AcceptedTimeMinutes` int DEFAULT NULL,
   `CurrentSubmissionId` int NOT NULL,
+  `UpdatedAt` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`Id`),
   UNIQUE KEY `teamprojectstats_team_project_unique` (`TeamId`,`ProjectId`),
   KEY `fk_teamprojectstats_team_idx` (`TeamId`),
-  KEY `fk_teamprojectstats_project_idx` (`ProjectId`)
+  KEY `fk_teamprojectstats_project_idx` (`ProjectId`),
+  KEY `idx_teamprojectstats_updatedat` (`UpdatedAt`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 -- ============================================
@@ -246,8 +255,11 @@ CREATE TABLE `ScoreboardSnapshots` (
   `Minute` int NOT NULL,
   `TimeStamp` datetime NOT NULL,
   `Payload` text NOT NULL,
+  `Kind` varchar(8) NOT NULL DEFAULT 'full',
+  `BaseMinute` int DEFAULT NULL,
   PRIMARY KEY (`Id`),
-  UNIQUE KEY `scoreboardsnapshots_division_online_minute_unique` (`Division`,`IsOnline`,`Minute`)
+  UNIQUE KEY `scoreboardsnapshots_division_online_minute_unique` (`Division`,`IsOnline`,`Minute`),
+  KEY `idx_scoreboardsnapshots_division_online_kind_minute` (`Division`,`IsOnline`,`Kind`,`Minute`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 -- ============================================
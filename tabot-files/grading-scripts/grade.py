@@ -6,8 +6,13 @@ Writes JSON instead of TAP. Per testcase, outputs:
   - name
   - description
   - passed
+  - skipped (stop-on-first-failure mode: the testcase never ran)
   - shortDiff (unified diff, only changed lines)
   - longDiff (unified diff, all lines)
+  - diffTruncated (output or diffs were cut at the size caps below)
+
+The backend imports this module and calls grade_submission(...) / admin_run(..., echo=False)
+directly; the CLI below is kept as its subprocess fallback.
 
 Unified diff convention here:
   - '-' lines are the student's output
@@ -16,13 +21,63 @@ Unified diff convention here:
 
 import argparse
 import difflib
+import hashlib
 import json
+import math
 import os
 import re
 import sys
-from typing import Any, Dict, List, Tuple
-
-from judge0 import execute_test
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from judge0 import (
+    JUDGE0_DETERMINISTIC_STATUSES,
+    TIMEOUT_EXIT_CODE,
+    archive_key,
+    build_submission_archives,
+    collect_student_files,
+    detect_language_kind,
+    execute_test,
+    execute_tests_batch,
+    is_internal_error,
+    read_additional_file_cached,
+)
+
+# Max testcases of one submission in flight against Judge0 at once (1 = sequential)
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get("GRADE_MAX_IN_FLIGHT", "8") or "8")
+
+# Send all testcases of a submission through Judge0's /submissions/batch endpoint
+DEFAULT_USE_BATCH = os.environ.get("GRADE_USE_BATCH", "1").strip().lower() not in {"0", "false", "no"}
+
+# Output comparison policies, chosen per testcase:
+#   normalized  ignore blank lines, all whitespace and case (the default)
+#   exact       line-for-line, only trailing blank lines ignored
+#   tokens      whitespace-separated tokens must match exactly
+#   float       like tokens, but numbers match within FLOAT_COMPARE_TOLERANCE
+#               (absolute or relative); "float:1e-3" overrides the tolerance
+COMPARE_POLICIES = {"normalized", "exact", "tokens", "float"}
+DEFAULT_COMPARE_POLICY = "normalized"
+FLOAT_COMPARE_TOLERANCE = 1e-6
+TOKEN_RE = re.compile(r"\S+")
+
+# Size caps. A run's output is decoded only up to GRADE_MAX_OUTPUT_CHARS characters
+# (plus one, to tell that it went over), so runaway output is never held in full; output
+# over the cap fails its testcase. Diffs are built from that text, stop after
+# GRADE_DIFF_MAX_CHANGED_LINES differing lines, and never exceed GRADE_DIFF_MAX_CHARS
+# characters each.
+MAX_OUTPUT_CHARS = int(os.environ.get("GRADE_MAX_OUTPUT_CHARS", "262144") or "262144")
+DIFF_MAX_CHANGED_LINES = int(os.environ.get("GRADE_DIFF_MAX_CHANGED_LINES", "200") or "200")
+DIFF_MAX_CHARS = int(os.environ.get("GRADE_DIFF_MAX_CHARS", "131072") or "131072")
+
+# Content-addressed result cache: a submission whose sources, language, testcases
+# (inputs + expected outputs) and additional files hash the same as an earlier one
+# reuses that run's results instead of going to Judge0. Empty dir disables it.
+# Bump RESULT_CACHE_VERSION whenever the shape or meaning of a result changes.
+RESULT_CACHE_DIR = os.environ.get("GRADE_RESULT_CACHE_DIR", "/tabot-files/result-cache").strip()
+RESULT_CACHE_MAX_AGE_SECONDS = int(os.environ.get("GRADE_RESULT_CACHE_MAX_AGE_SECONDS", "86400") or "86400")
+RESULT_CACHE_VERSION = 5
 
 
 def normalize_newlines(text: str) -> str:
@@ -31,29 +86,128 @@ def normalize_newlines(text: str) -> str:
     return str(text).replace("\r\n", "\n").replace("\r", "\n")
 
 
-def normalize_for_compare(text: str) -> List[str]:
+def iter_lines(text: str) -> Iterator[str]:
+    """
+    Yields the lines of text one at a time, treating \r\n, \r and \n alike
+    (same split as normalize_newlines(text).split("\n")) without copying the text.
+    """
+    text = text or ""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        line = text[start:] if end == -1 else text[start:end]
+        if end != -1 and line.endswith("\r"):
+            line = line[:-1]
+        if "\r" in line:
+            yield from line.split("\r")
+        else:
+            yield line
+        if end == -1:
+            return
+        start = end + 1
+
+
+def iter_normalized_lines(text: str) -> Iterator[str]:
     """
     Roughly matches:
       diff -B -w -i -Z -b --ignore-trailing-space
 
-    Strategy:
-      - normalize newlines
-      - drop blank lines
-      - remove ALL whitespace
-      - lower-case
+    Per line: drop blank lines, remove ALL whitespace, lower-case.
     """
-    text = normalize_newlines(text)
-    out: List[str] = []
-    for line in text.split("\n"):
+    for line in iter_lines(text):
         if line.strip() == "":
             continue
-        line_no_ws = re.sub(r"\s+", "", line).lower()
-        out.append(line_no_ws)
-    return out
+        yield "".join(line.split()).lower()
+
 
+def iter_tokens(text: str) -> Iterator[str]:
+    for match in TOKEN_RE.finditer(text or ""):
+        yield match.group(0)
 
-def check_passed(student_text: str, expected_text: str) -> bool:
-    return normalize_for_compare(student_text) == normalize_for_compare(expected_text)
+
+def parse_compare_policy(policy: Any) -> Tuple[str, float]:
+    """
+    "normalized" (default), "exact", "tokens", "float" or "float:<tolerance>".
+    Unknown values fall back to "normalized".
+    """
+    raw = str(policy or "").strip().lower()
+    name, _, arg = raw.partition(":")
+    if name not in COMPARE_POLICIES:
+        return DEFAULT_COMPARE_POLICY, FLOAT_COMPARE_TOLERANCE
+    tolerance = FLOAT_COMPARE_TOLERANCE
+    if name == "float" and arg:
+        try:
+            tolerance = abs(float(arg))
+        except ValueError:
+            pass
+    return name, tolerance
+
+
+def floats_match(student_token: str, expected_token: str, tolerance: float) -> bool:
+    if student_token == expected_token:
+        return True
+    try:
+        a = float(student_token)
+        b = float(expected_token)
+    except ValueError:
+        return False
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return math.isclose(a, b, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def streams_match(student: Iterator[str], expected: Iterator[str], same=None) -> bool:
+    for student_item, expected_item in zip_longest(student, expected, fillvalue=None):
+        if student_item is None or expected_item is None:
+            return False
+        if same is None:
+            if student_item != expected_item:
+                return False
+        elif not same(student_item, expected_item):
+            return False
+    return True
+
+
+def exact_lines_match(student_text: str, expected_text: str) -> bool:
+    # Exact line-by-line, except that trailing blank lines (e.g. a final newline) are ignored
+    student_lines = iter_lines(student_text)
+    expected_lines = iter_lines(expected_text)
+    for student_line, expected_line in zip_longest(student_lines, expected_lines, fillvalue=None):
+        if student_line is None:
+            return expected_line == "" and all(line == "" for line in expected_lines)
+        if expected_line is None:
+            return student_line == "" and all(line == "" for line in student_lines)
+        if student_line != expected_line:
+            return False
+    return True
+
+
+def output_overflowed(student_text: str) -> bool:
+    return MAX_OUTPUT_CHARS > 0 and len(student_text) > MAX_OUTPUT_CHARS
+
+
+def check_passed(student_text: str, expected_text: str, policy: Any = DEFAULT_COMPARE_POLICY) -> bool:
+    """
+    Streams both outputs once under the testcase's comparison policy; neither output
+    is copied into a normalized list. Student output that was cut off at
+    MAX_OUTPUT_CHARS never passes.
+    """
+    if output_overflowed(student_text):
+        return False
+
+    name, tolerance = parse_compare_policy(policy)
+
+    if name == "exact":
+        return exact_lines_match(student_text, expected_text)
+    if name == "tokens":
+        return streams_match(iter_tokens(student_text), iter_tokens(expected_text))
+    if name == "float":
+        return streams_match(
+            iter_tokens(student_text),
+            iter_tokens(expected_text),
+            same=lambda a, b: floats_match(a, b, tolerance),
+        )
+    return streams_match(iter_normalized_lines(student_text), iter_normalized_lines(expected_text))
 
 
 def build_unified_diff(student_text: str, expected_text: str, context_lines: int, from_name: str, to_name: str) -> str:
@@ -81,7 +235,35 @@ def build_unified_diff(student_text: str, expected_text: str, context_lines: int
     return diff_str + ("\n" if diff_str else "")
 
 
-def build_short_diff(student_text: str, expected_text: str, from_name: str = "actual", to_name: str = "expected") -> str:
+def truncate_output(text: str, max_chars: int = MAX_OUTPUT_CHARS) -> Tuple[str, bool]:
+    """
+    Cuts text to max_chars, backing up to the last full line when there is one.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text, False
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut + 1 if cut > 0 else max_chars], True
+
+
+def join_diff_lines(out: List[str], max_chars: int = DIFF_MAX_CHARS) -> Tuple[str, bool]:
+    """
+    Joins diff lines, dropping whole lines once max_chars is reached.
+    """
+    total = 0
+    for i, line in enumerate(out):
+        total += len(line) + 1
+        if max_chars > 0 and total > max_chars:
+            return "\n".join(out[:i]).rstrip("\n") + "\n", True
+    return "\n".join(out).rstrip("\n") + "\n", False
+
+
+def build_short_diff(
+    student_text: str,
+    expected_text: str,
+    from_name: str = "actual",
+    to_name: str = "expected",
+    max_changed_lines: int = DIFF_MAX_CHANGED_LINES,
+) -> Tuple[str, bool]:
     """
     "Short" diff for the UI:
       - only changed lines
@@ -90,11 +272,14 @@ def build_short_diff(student_text: str, expected_text: str, from_name: str = "ac
           +expected line
 
     This ensures the Diff Finder can see adjacent -/+ pairs to enable intra-line highlighting.
+    Stops after max_changed_lines differing lines; returns (diff, truncated).
     """
     student_lines = normalize_newlines(student_text).splitlines()
     expected_lines = normalize_newlines(expected_text).splitlines()
 
     changed: List[str] = []
+    changed_count = 0
+    truncated = False
     max_len = max(len(student_lines), len(expected_lines))
 
     for i in range(max_len):
@@ -104,28 +289,34 @@ def build_short_diff(student_text: str, expected_text: str, from_name: str = "ac
         if student_line == expected_line:
             continue
 
+        if max_changed_lines > 0 and changed_count >= max_changed_lines:
+            truncated = True
+            break
+        changed_count += 1
+
         if student_line is not None:
             changed.append(f"-{student_line}")
         if expected_line is not None:
             changed.append(f"+{expected_line}")
 
     if not changed:
-        return ""
+        return "", False
 
     out: List[str] = []
     out.append(f"--- {from_name}")
     out.append(f"+++ {to_name}")
     out.append(f"@@ -1,{len(student_lines)} +1,{len(expected_lines)} @@")
     out.extend(changed)
-    return "\n".join(out).rstrip("\n") + "\n"
+    diff, cut = join_diff_lines(out)
+    return diff, truncated or cut
 
 
-def build_long_diff(student_text: str, expected_text: str, from_name: str = "actual", to_name: str = "expected") -> str:
+def build_long_diff(student_text: str, expected_text: str, from_name: str = "actual", to_name: str = "expected") -> Tuple[str, bool]:
     """
     Include every line from both student and reference, emitting in the usual replacement order:
       -actual line
       +expected line
-    across the whole output.
+    across the whole output, up to DIFF_MAX_CHARS. Returns (diff, truncated).
     """
     student_lines = normalize_newlines(student_text).splitlines()
     expected_lines = normalize_newlines(expected_text).splitlines()
@@ -134,13 +325,19 @@ def build_long_diff(student_text: str, expected_text: str, from_name: str = "act
     out.append(f"--- {from_name}")
     out.append(f"+++ {to_name}")
     out.append(f"@@ -1,{len(student_lines)} +1,{len(expected_lines)} @@")
+    size = sum(len(line) + 1 for line in out)
     n = max(len(student_lines), len(expected_lines))
     for i in range(n):
+        pair = []
         if i < len(student_lines):
-            out.append(f"-{student_lines[i]}")
+            pair.append(f"-{student_lines[i]}")
         if i < len(expected_lines):
-            out.append(f"+{expected_lines[i]}")
-    return "\n".join(out).rstrip("\n") + "\n"
+            pair.append(f"+{expected_lines[i]}")
+        size += sum(len(line) + 1 for line in pair)
+        if DIFF_MAX_CHARS > 0 and size > DIFF_MAX_CHARS:
+            return "\n".join(out).rstrip("\n") + "\n", True
+        out.extend(pair)
+    return "\n".join(out).rstrip("\n") + "\n", False
 
 
 def pick_output_directory(path: str, root: str) -> str:
@@ -183,19 +380,19 @@ def parse_entry_class_and_additional_files(value: Any) -> Tuple[str, Any]:
     Backward-compatible parsing:
       value[4] or value[5] may be:
         - list of additional files
-        - dict { "entry_class": "...", "files": [...] }
+        - dict { "entry_class": "...", "files": [...], "compare": "..." }
       value[6] may be a string entry_class
+    The other slot may hold the hidden flag (a bool), which is never a file list.
     """
     entry_class = ""
     additional_files: Any = []
 
     if isinstance(value, (list, tuple)):
-        # Newer layout (hidden removed): [name, desc, in, expected, additional_files]
-        # Older layout:                [name, desc, in, expected, hidden, additional_files]
-        if len(value) > 5:
-            additional_files = value[5]
-        elif len(value) > 4:
-            additional_files = value[4]
+        # Current layout: [name, desc, in, expected, additional_files, hidden]
+        # Older layout:   [name, desc, in, expected, hidden, additional_files]
+        candidates = [value[i] for i in (5, 4) if len(value) > i and not isinstance(value[i], bool)]
+        if candidates:
+            additional_files = candidates[0]
         if isinstance(additional_files, dict):
             entry_class = (additional_files.get("entry_class") or "").strip()
             additional_files = additional_files.get("files") or []
@@ -204,6 +401,15 @@ def parse_entry_class_and_additional_files(value: Any) -> Tuple[str, Any]:
 
     return entry_class, additional_files
 
+
+def parse_testcase_compare_policy(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        for i in (4, 5):
+            if len(value) > i and isinstance(value[i], dict) and value[i].get("compare"):
+                return str(value[i]["compare"]).strip().lower()
+    return DEFAULT_COMPARE_POLICY
+
+
 def parse_project_additional_payload(raw: Any) -> Tuple[str, List[str]]:
     """
     upload.py passes either:
@@ -283,7 +489,16 @@ def resolve_additional_files(files: Any, *, base_dir: str) -> List[str]:
     return out
 
 
-def admin_run(language: str, user_input: str, path: str, additional_files: Any) -> str:
+def runner_output_text(runner_response: Dict[str, Any]) -> str:
+    return normalize_newlines(
+        runner_response.get("stdout")
+        or runner_response.get("stderr")
+        or runner_response.get("compile_output")
+        or ""
+    )
+
+
+def admin_run(language: str, user_input: str, path: str, additional_files: Any, echo: bool = True) -> str:
     # Accept JSON-encoded additional files from the repo/db.
     if isinstance(additional_files, str):
         raw = additional_files.strip()
@@ -294,33 +509,20 @@ def admin_run(language: str, user_input: str, path: str, additional_files: Any)
                 pass
 
     runner_response = execute_test(path, user_input, language, additional_files)
-    combined = (
-        runner_response.get("stdout")
-        or runner_response.get("stderr")
-        or runner_response.get("compile_output")
-        or ""
-    )
-    combined = normalize_newlines(combined)
-    print(combined)
+    combined = runner_output_text(runner_response)
+    if echo:
+        print(combined)
     return combined
 
-def run(student_name: str, language: str, testcases_json: str, path: str, additional_file_path: Any, root: str) -> int:
-    output_dir = pick_output_directory(path, root)
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "testcases.json")
-
-    testcases_obj = json.loads(testcases_json)
-    testcase_items = normalize_testcase_items(testcases_obj)
-
-    results: List[Dict[str, Any]] = []
-
-    # Project-level additional files (teacher-provided)
-    proj_base_dir, proj_files = parse_project_additional_payload(additional_file_path)
-    proj_files = resolve_additional_files(proj_files, base_dir=proj_base_dir)
+def build_testcase_specs(testcase_items: List[Tuple[str, Any]], proj_base_dir: str, proj_files: List[str]) -> List[Dict[str, Any]]:
+    """
+    Flattens the testcase tuples into dicts with merged additional files.
+    """
+    specs: List[Dict[str, Any]] = []
 
     for key, value in testcase_items:
         # Expected tuple layout (backward-compatible):
-        # [ test_name, test_description, testcase_in, testcase_expected, hidden?, additional_files?, entry_class? ]
+        # [ test_name, test_description, testcase_in, testcase_expected, additional_files?, hidden?, entry_class? ]
         test_name = ""
         test_description = ""
         testcase_in = ""
@@ -334,9 +536,6 @@ def run(student_name: str, language: str, testcases_json: str, path: str, additi
         else:
             # If it's not a list/tuple, treat it as invalid but keep output stable.
             test_name = str(key)
-            test_description = ""
-            testcase_in = ""
-            testcase_expected = ""
 
         entry_class, testcase_additional_files = parse_entry_class_and_additional_files(value)
 
@@ -350,53 +549,394 @@ def run(student_name: str, language: str, testcases_json: str, path: str, additi
             seen.add(p)
             merged_additional.append(p)
 
-        runner_resp = execute_test(
+        specs.append(
+            {
+                "name": test_name,
+                "description": test_description,
+                "input": testcase_in,
+                "expected": testcase_expected,
+                "additional_files": merged_additional,
+                "entry_class": entry_class,
+                "compare": parse_testcase_compare_policy(value),
+            }
+        )
+
+    return specs
+
+
+def execute_testcases(
+    path: str,
+    language: str,
+    specs: List[Dict[str, Any]],
+    max_in_flight: int,
+    use_batch: bool = DEFAULT_USE_BATCH,
+    stop_on_first_failure: bool = False,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Runs every testcase against Judge0, either as one batch or keeping up to
+    max_in_flight single requests outstanding. Responses come back in testcase order.
+
+    With stop_on_first_failure, testcases are dispatched individually and nothing new
+    starts once one fails; every testcase after the first failure (in testcase order)
+    comes back as None, the same result a sequential run would give.
+    """
+    # Package the submission once and share the archive across testcases
+    archives = build_submission_archives(path, language, specs)
+    specs = [
+        {**spec, "archive": archives[archive_key(path, language, spec["additional_files"], spec["entry_class"])]}
+        for spec in specs
+    ]
+
+    # Decode one character past the cap so overflowing output is still detected
+    max_output_chars = MAX_OUTPUT_CHARS + 1 if MAX_OUTPUT_CHARS > 0 else 0
+
+    if use_batch and len(specs) > 1 and not stop_on_first_failure:
+        return execute_tests_batch(path, specs, language, max_output_chars=max_output_chars)
+
+    def execute_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+        return execute_test(
             path,
-            testcase_in,
+            spec["input"],
             language,
-            merged_additional,
-            entry_class=entry_class,
+            spec["additional_files"],
+            entry_class=spec["entry_class"],
+            archive=spec["archive"],
+            max_output_chars=max_output_chars,
         )
 
-        student_text = normalize_newlines(
-            runner_resp.get("stdout")
-            or runner_resp.get("stderr")
-            or runner_resp.get("compile_output")
-            or ""
-        )
-        expected_text = normalize_newlines(testcase_expected or "")
+    def failed(spec: Dict[str, Any], runner_resp: Dict[str, Any]) -> bool:
+        return not check_passed(runner_output_text(runner_resp), spec["expected"] or "", spec.get("compare"))
+
+    workers = min(max(1, int(max_in_flight or 1)), len(specs))
+    if workers <= 1:
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(specs)
+        for i, spec in enumerate(specs):
+            responses[i] = execute_one(spec)
+            if stop_on_first_failure and failed(spec, responses[i]):
+                break
+        return responses
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="judge0") as pool:
+        if not stop_on_first_failure:
+            return list(pool.map(execute_one, specs))
+
+        index_by_future = {pool.submit(execute_one, spec): i for i, spec in enumerate(specs)}
+        responses = [None] * len(specs)
+        for future in as_completed(index_by_future):
+            if future.cancelled():
+                continue
+            i = index_by_future[future]
+            responses[i] = future.result()
+            if failed(specs[i], responses[i]):
+                # Queued testcases never start; the ones already at Judge0 still finish
+                for other in index_by_future:
+                    other.cancel()
+
+    # The pool starts testcases in order, so every testcase before the lowest failing one
+    # ran. Report exactly the sequential outcome: everything after it counts as skipped,
+    # whether or not it happened to finish at Judge0.
+    first_failure = next(
+        (i for i, resp in enumerate(responses) if resp is not None and failed(specs[i], resp)),
+        None,
+    )
+    if first_failure is not None:
+        responses[first_failure + 1:] = [None] * (len(responses) - first_failure - 1)
+    return responses
+
+
+def build_skipped_result(spec: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": spec["name"],
+        "description": spec["description"],
+        "passed": False,
+        "skipped": True,
+        "shortDiff": "",
+        "longDiff": "",
+        "shortDiffSameAsLong": False,
+        "diffTruncated": False,
+    }
+
+
+def build_testcase_result(spec: Dict[str, Any], runner_resp: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if runner_resp is None:
+        return build_skipped_result(spec)
+
+    test_name = spec["name"]
+
+    student_text = runner_output_text(runner_resp)
+    expected_text = normalize_newlines(spec["expected"] or "")
+
+    passed = check_passed(student_text, expected_text, spec.get("compare"))
+
+    short_same_as_long = False
+    diff_truncated = False
+    if passed:
+        short_diff = ""
+        long_diff = ""
+    else:
+        from_name = f"actual:{test_name}"
+        to_name = f"expected:{test_name}"
+        # Runaway output (e.g. an infinite print loop) is only diffed up to the cap
+        student_diff_text, student_cut = truncate_output(student_text)
+        expected_diff_text, expected_cut = truncate_output(expected_text)
+        short_diff, short_cut = build_short_diff(student_diff_text, expected_diff_text, from_name=from_name, to_name=to_name)
+        long_diff, long_cut = build_long_diff(student_diff_text, expected_diff_text, from_name=from_name, to_name=to_name)
+        diff_truncated = student_cut or expected_cut or short_cut or long_cut
+        short_same_as_long = bool(long_diff) and (short_diff == long_diff)
+        if short_same_as_long:
+            short_diff = ""
 
-        passed = check_passed(student_text, expected_text)
+    return {
+        "name": test_name,
+        "description": spec["description"],
+        "passed": bool(passed),
+        "skipped": False,
+        "shortDiff": short_diff,
+        "longDiff": long_diff,
+        "shortDiffSameAsLong": short_same_as_long,
+        "diffTruncated": bool(diff_truncated),
+    }
 
-        short_same_as_long = False
-        if passed:
-            short_diff = ""
-            long_diff = ""
-        else:
-            from_name = f"actual:{test_name}"
-            to_name = f"expected:{test_name}"
-            short_diff = build_short_diff(student_text, expected_text, from_name=from_name, to_name=to_name)
-            long_diff = build_long_diff(student_text, expected_text, from_name=from_name, to_name=to_name)
-            short_same_as_long = bool(long_diff) and (short_diff == long_diff)
-            if short_same_as_long:
-                short_diff = ""
-
-        results.append(
-            {
-                "name": test_name,
-                "description": test_description,
-                "passed": bool(passed),
-                "shortDiff": short_diff,
-                "longDiff": long_diff,
-                "shortDiffSameAsLong": short_same_as_long,
-            }
+
+def hash_file_for_cache(path: str) -> str:
+    try:
+        return hashlib.sha256(read_additional_file_cached(path)).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def result_cache_key(path: str, language: str, specs: List[Dict[str, Any]], stop_on_first_failure: bool = False) -> str:
+    """
+    sha256 over everything that decides a submission's results: the source files sent
+    to Judge0, the language, and each testcase's input, expected output, entry class and
+    additional file contents. Editing testcases or the solution (which recomputes the
+    expected outputs) therefore changes the key.
+    """
+    kind = detect_language_kind(language)
+    h = hashlib.sha256()
+    h.update(f"v{RESULT_CACHE_VERSION}\0{kind}\0{int(bool(stop_on_first_failure))}\0".encode("utf-8"))
+
+    for rel, blob in collect_student_files(path, kind):
+        h.update(f"src\0{rel}\0{hashlib.sha256(blob).hexdigest()}\0".encode("utf-8"))
+
+    file_hashes: Dict[str, str] = {}
+    for spec in specs:
+        for p in spec["additional_files"]:
+            if p not in file_hashes:
+                file_hashes[p] = hash_file_for_cache(p)
+        h.update(json.dumps(
+            [
+                spec["name"],
+                spec["description"],
+                normalize_newlines(spec["input"]),
+                normalize_newlines(spec["expected"]),
+                spec["entry_class"],
+                spec.get("compare") or DEFAULT_COMPARE_POLICY,
+                [(os.path.basename(p), file_hashes[p]) for p in spec["additional_files"]],
+            ],
+            ensure_ascii=False,
+        ).encode("utf-8"))
+        h.update(b"\0")
+
+    return h.hexdigest()
+
+
+def result_cache_path(key: str) -> str:
+    return os.path.join(RESULT_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def load_cached_results(key: str) -> Any:
+    if not RESULT_CACHE_DIR:
+        return None
+    cache_path = result_cache_path(key)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        # Touch so pruning drops the least recently used entries first
+        os.utime(cache_path, None)
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) and isinstance(payload.get("results"), list) else None
+
+
+def store_cached_results(key: str, payload: Dict[str, Any]) -> None:
+    if not RESULT_CACHE_DIR:
+        return
+    cache_path = result_cache_path(key)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def prune_result_cache(max_age_seconds: int = RESULT_CACHE_MAX_AGE_SECONDS) -> int:
+    """
+    Removes cache entries not used within max_age_seconds. Returns the number removed.
+    """
+    if not RESULT_CACHE_DIR or not os.path.isdir(RESULT_CACHE_DIR):
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for base, _, fns in os.walk(RESULT_CACHE_DIR):
+        for fn in fns:
+            full = os.path.join(base, fn)
+            try:
+                if os.path.getmtime(full) < cutoff:
+                    os.remove(full)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
+
+
+def results_are_cacheable(responses: List[Optional[Dict[str, Any]]]) -> bool:
+    # Anything Judge0 did not give a definite verdict for (timeouts, host errors) is retried
+    # next time; skipped testcases (None) are fine, the failure that stopped the run is final.
+    return all(
+        r is None
+        or (r.get("status_id") in JUDGE0_DETERMINISTIC_STATUSES and r.get("exit_code") != TIMEOUT_EXIT_CODE)
+        for r in responses
+    )
+
+
+def run_solution_batch(
+    language: str,
+    inputs: List[str],
+    path: str,
+    additional_files: Any,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    use_batch: bool = DEFAULT_USE_BATCH,
+) -> List[str]:
+    """
+    ADMIN path for many inputs at once (e.g. recomputing expected outputs): the solution
+    is packaged/compiled once and every input runs concurrently. Outputs keep input order.
+    """
+    if isinstance(additional_files, str):
+        raw = additional_files.strip()
+        if raw.startswith("[") or raw.startswith("{"):
+            try:
+                additional_files = json.loads(raw)
+            except Exception:
+                pass
+    files = resolve_additional_files(additional_files, base_dir="")
+
+    specs = [
+        {
+            "name": str(i),
+            "description": "",
+            "input": user_input or "",
+            "expected": "",
+            "additional_files": files,
+            "entry_class": "",
+            "compare": DEFAULT_COMPARE_POLICY,
+        }
+        for i, user_input in enumerate(inputs)
+    ]
+    responses = execute_testcases(path, language, specs, max_in_flight, use_batch=use_batch)
+
+    return [runner_output_text(runner_response) for runner_response in responses]
+
+
+def grade_submission(
+    student_name: str,
+    language: str,
+    testcases: Any,
+    path: str,
+    additional_file_path: Any,
+    root: str = "",
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    use_batch: bool = DEFAULT_USE_BATCH,
+    stop_on_first_failure: bool = False,
+) -> Dict[str, Any]:
+    """
+    In-process grading API. Runs every testcase and writes testcases.json next to the
+    submission, returning the same {"results": [...]} payload. Byte-identical
+    resubmissions are answered from the result cache.
+
+    testcases may be the JSON string produced by ProjectRepository.testcases_to_json
+    or the already-decoded dict/list.
+
+    stop_on_first_failure stops dispatching once a testcase fails; testcases that never
+    ran are reported with "skipped": true (and "passed": false).
+
+    Raises RuntimeError (and writes nothing) when Judge0 gave no verdict for a testcase,
+    so an outage or poll timeout fails the grading run instead of counting as wrong output.
+    """
+    output_dir = pick_output_directory(path, root or os.getcwd())
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, "testcases.json")
+
+    testcases_obj = json.loads(testcases) if isinstance(testcases, str) else testcases
+    testcase_items = normalize_testcase_items(testcases_obj)
+
+    # Project-level additional files (teacher-provided)
+    proj_base_dir, proj_files = parse_project_additional_payload(additional_file_path)
+    proj_files = resolve_additional_files(proj_files, base_dir=proj_base_dir)
+
+    specs = build_testcase_specs(testcase_items, proj_base_dir, proj_files)
+
+    cache_key = result_cache_key(path, language, specs, stop_on_first_failure) if (RESULT_CACHE_DIR and specs) else ""
+    payload = load_cached_results(cache_key) if cache_key else None
+
+    if payload is None:
+        responses = execute_testcases(
+            path,
+            language,
+            specs,
+            max_in_flight,
+            use_batch=use_batch,
+            stop_on_first_failure=stop_on_first_failure,
         )
 
-    payload = {"results": results}
+        unfinished = [spec["name"] for spec, runner_resp in zip(specs, responses) if is_internal_error(runner_resp)]
+        if unfinished:
+            raise RuntimeError(f"Judge0 returned no verdict for testcases: {', '.join(map(str, unfinished))}")
+
+        results: List[Dict[str, Any]] = [
+            build_testcase_result(spec, runner_resp)
+            for spec, runner_resp in zip(specs, responses)
+        ]
+
+        payload = {"results": results}
+        if cache_key and results_are_cacheable(responses):
+            store_cached_results(cache_key, payload)
 
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
 
+    return payload
+
+
+def run(
+    student_name: str,
+    language: str,
+    testcases_json: str,
+    path: str,
+    additional_file_path: Any,
+    root: str,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    use_batch: bool = DEFAULT_USE_BATCH,
+    stop_on_first_failure: bool = False,
+) -> int:
+    grade_submission(
+        student_name,
+        language,
+        testcases_json,
+        path,
+        additional_file_path,
+        root=root,
+        max_in_flight=max_in_flight,
+        use_batch=use_batch,
+        stop_on_first_failure=stop_on_first_failure,
+    )
     return 0
 
 
@@ -425,13 +965,41 @@ def main() -> int:
         type=str,
         help="root folder (used when paths has no parent directory)",
     )
+    parser.add_argument(
+        "--max-in-flight",
+        default=DEFAULT_MAX_IN_FLIGHT,
+        type=int,
+        help="max testcases sent to Judge0 concurrently (1 runs them one at a time)",
+    )
+    parser.add_argument(
+        "--no-batch",
+        dest="use_batch",
+        action="store_false",
+        default=DEFAULT_USE_BATCH,
+        help="submit testcases individually instead of through /submissions/batch",
+    )
+    parser.add_argument(
+        "--stop-on-first-failure",
+        action="store_true",
+        help="stop dispatching testcases after the first failure (the rest are reported as skipped)",
+    )
     args = parser.parse_args()
 
     if args.student_name == "ADMIN":
         admin_run(args.language, args.testcase_json, args.paths, args.additional_file_path)
         return 0
 
-    return run(args.student_name, args.language, args.testcase_json, args.paths, args.additional_file_path, args.root)
+    return run(
+        args.student_name,
+        args.language,
+        args.testcase_json,
+        args.paths,
+        args.additional_file_path,
+        args.root,
+        max_in_flight=args.max_in_flight,
+        use_batch=args.use_batch,
+        stop_on_first_failure=args.stop_on_first_failure,
+    )
 
 
 if __name__ == "__main__":
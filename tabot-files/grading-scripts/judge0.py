@@ -12,15 +12,22 @@ Judge0 multi-file programs require scripts named `run` (required) and `compile`
 """
 
 import base64
+import hashlib
 import io
 import json
 import os
+import random
 import re
+import tarfile
+import threading
 import time
 import zipfile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Judge0 base URL. Override for self-hosted instances.
 JUDGE0_URL = "https://ce.judge0.com"
@@ -28,14 +35,96 @@ JUDGE0_URL = "https://ce.judge0.com"
 # Judge0 "Multi-file program" language id (Judge0 CE v1.13.x).
 JUDGE0_MULTIFILE_LANGUAGE_ID = 89
 
-# Polling config
+# Polling config: quick first checks, then exponential backoff (with jitter) up to a cap
 JUDGE0_TIMEOUT_SECONDS = 30.0
-JUDGE0_POLL_INTERVAL_SECONDS = 0.25
+JUDGE0_POLL_INITIAL_SECONDS = 0.05
+JUDGE0_POLL_BACKOFF_FACTOR = 2.0
+JUDGE0_POLL_MAX_INTERVAL_SECONDS = 2.0
+JUDGE0_POLL_JITTER = 0.2
+# Give up on a wait once this long passes without any submission finishing
 JUDGE0_POLL_MAX_SECONDS = 20.0
 
+# Optional callback mode: Judge0 PUTs finished submissions to this URL (the backend's
+# /api/submissions/judge0_callback), which drops them in JUDGE0_CALLBACK_DIR as <token>.json.
+# Waiting then only watches that directory; Judge0 is still polled, but rarely, as a safety net.
+# The endpoint has no JWT, so callbacks are only enabled when JUDGE0_CALLBACK_SECRET is set;
+# it is sent as ?key= and checked by the backend.
+JUDGE0_CALLBACK_SECRET = os.environ.get("JUDGE0_CALLBACK_SECRET", "").strip()
+
+
+def build_callback_url(url: str, secret: str) -> str:
+    if not url:
+        return ""
+    if not secret:
+        print("[judge0] JUDGE0_CALLBACK_URL is set without JUDGE0_CALLBACK_SECRET; callbacks disabled", flush=True)
+        return ""
+    parts = urlsplit(url)
+    query = urlencode(parse_qsl(parts.query) + [("key", secret)])
+    return urlunsplit(parts._replace(query=query))
+
+
+JUDGE0_CALLBACK_URL = build_callback_url(os.environ.get("JUDGE0_CALLBACK_URL", "").strip(), JUDGE0_CALLBACK_SECRET)
+JUDGE0_CALLBACK_DIR = os.environ.get("JUDGE0_CALLBACK_DIR", "/tabot-files/judge0-callbacks")
+JUDGE0_CALLBACK_CHECK_SECONDS = 0.05
+JUDGE0_CALLBACK_FALLBACK_POLL_SECONDS = 5.0
+
 # If your Judge0 host disallows wait=true, we will fall back automatically.
 JUDGE0_TRY_WAIT = True
 
+# Connection pooling. One keep-alive pool per process, shared by every submission.
+# JUDGE0_POOL_SIZE caps concurrent connections to the Judge0 host (extra requests wait).
+JUDGE0_POOL_SIZE = int(os.environ.get("JUDGE0_POOL_SIZE", "32") or "32")
+JUDGE0_RETRY_TOTAL = int(os.environ.get("JUDGE0_RETRY_TOTAL", "3") or "3")
+JUDGE0_RETRY_BACKOFF_SECONDS = float(os.environ.get("JUDGE0_RETRY_BACKOFF_SECONDS", "0.5") or "0.5")
+JUDGE0_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+# Judge0 status ids
+JUDGE0_STATUS_ACCEPTED = 3
+JUDGE0_STATUS_COMPILATION_ERROR = 6
+# Judge0's "Internal Error". Also given to results Judge0 never produced a verdict for
+# (poll timeout, no token, host unreachable) so they are not mistaken for wrong output.
+JUDGE0_STATUS_INTERNAL_ERROR = 13
+
+# Results whose outcome depends only on the code and input (accepted, wrong answer,
+# compilation error, runtime errors). Time limits, internal errors and unreachable
+# hosts are not.
+JUDGE0_DETERMINISTIC_STATUSES = frozenset({3, 4, 6, 7, 8, 9, 10, 11, 12})
+
+# Exit code of coreutils `timeout` when it kills the Python run script. Judge0 reports that
+# as a runtime error (NZEC), but it is really a time limit and must not be cached.
+TIMEOUT_EXIT_CODE = 124
+
+# Fields requested whenever a submission's result is read back from Judge0
+JUDGE0_RESULT_FIELDS = "token,stdout,stderr,compile_output,message,status,exit_code"
+
+# Compile Java/C/C++ once per submission and reuse the build output across testcases.
+JUDGE0_COMPILE_ONCE = True
+
+# `run` scripts for the compile-only submission: emit the build output as base64'd tar.gz.
+COMPILE_ONLY_RUN_SCRIPTS = {
+    "java": (
+        "#!/usr/bin/env bash\n"
+        "set -e\n"
+        "find . -name '*.class' -print0 | tar --null -czf - -T - | base64 -w 0\n"
+    ),
+    "c": "#!/usr/bin/env bash\nset -e\ntar -czf - ./main | base64 -w 0\n",
+    "cpp": "#!/usr/bin/env bash\nset -e\ntar -czf - ./main | base64 -w 0\n",
+}
+
+# Batch API (/submissions/batch). Judge0's default MAX_SUBMISSION_BATCH_SIZE is 20.
+JUDGE0_BATCH_MAX_SIZE = 20
+
+# Teacher additional files are identical for every team, so keep their bytes in memory
+# (keyed by content hash) for the life of the process.
+ADDITIONAL_FILE_CACHE_MAX_ENTRIES = 256
+
+_additional_file_lock = threading.Lock()
+_additional_file_hashes: Dict[Tuple[str, int, int], str] = {}
+_additional_file_blobs: Dict[str, bytes] = {}
+
 BINARY_EXTENSIONS_DENYLIST = {
     ".pdf", ".docx", ".doc", ".pptx", ".ppt", ".xlsx", ".xls",
     ".png", ".jpg", ".jpeg", ".gif", ".zip", ".tar", ".gz", ".7z",
@@ -46,23 +135,89 @@ def build_request_headers() -> Dict[str, str]:
     return h
 
 
+class Judge0Retry(Retry):
+    """
+    GETs retry on any JUDGE0_RETRY_STATUSES. POSTs (which create submissions) only retry
+    on connect errors and 429: after a 5xx or a read timeout Judge0 may already have
+    accepted the work, and sending it again would run it twice.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if (method or "").upper() == "POST":
+            return status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def build_judge0_session(pool_size: int = JUDGE0_POOL_SIZE) -> requests.Session:
+    retry = Judge0Retry(
+        total=JUDGE0_RETRY_TOTAL,
+        backoff_factor=JUDGE0_RETRY_BACKOFF_SECONDS,
+        status_forcelist=JUDGE0_RETRY_STATUSES,
+        # Read errors are only retried for these; connect errors are retried for all methods
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(1, int(pool_size)),
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_judge0_session() -> requests.Session:
+    """
+    Process-wide pooled session (keep-alive, retry/backoff on 429/5xx; see Judge0Retry).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_judge0_session()
+    return _session
+
+
+def configure_judge0_session(pool_size: int) -> None:
+    """
+    Replace the shared session, e.g. to size the pool for an in-process grader.
+    """
+    global _session
+    with _session_lock:
+        old = _session
+        _session = build_judge0_session(pool_size)
+    if old is not None:
+        old.close()
+
+
 def base64_encode_text(text: str) -> str:
     return base64.b64encode((text or "").encode("utf-8")).decode("ascii")
 
 
-def base64_decode_text(maybe_b64: Any) -> str:
+def base64_decode_text(maybe_b64: Any, max_chars: int = 0) -> str:
+    """
+    With max_chars > 0 only enough of the payload for the first max_chars characters is
+    decoded (a UTF-8 character is at most 4 bytes), so runaway output is never expanded.
+    """
     if maybe_b64 is None:
         return ""
     if not isinstance(maybe_b64, str):
-        return str(maybe_b64)
+        return str(maybe_b64)[:max_chars or None]
     s = maybe_b64.strip()
     if not s:
         return ""
+    if max_chars > 0:
+        # 4 base64 characters per 3 bytes
+        s = s[:(max_chars * 4 + 2) // 3 * 4]
     try:
-        return base64.b64decode(s, validate=False).decode("utf-8", errors="replace")
+        return base64.b64decode(s, validate=False).decode("utf-8", errors="replace")[:max_chars or None]
     except Exception:
         # If it's not actually base64, return as-is.
-        return maybe_b64
+        return maybe_b64[:max_chars or None]
 
 def strip_java_comments(src: str) -> str:
     """
@@ -199,6 +354,32 @@ def collect_student_files(student_path: str, kind: str) -> List[Tuple[str, bytes
     return out
 
 
+def read_additional_file_cached(path: str) -> bytes:
+    """
+    Returns the file's (utf-8 normalized) bytes, reusing a previous read when the
+    path, mtime and size are unchanged. Identical content shares one blob by sha256.
+    """
+    st = os.stat(path)
+    stat_key = (path, st.st_mtime_ns, st.st_size)
+
+    with _additional_file_lock:
+        digest = _additional_file_hashes.get(stat_key)
+        if digest is not None and digest in _additional_file_blobs:
+            return _additional_file_blobs[digest]
+
+    blob = read_text_file(path).encode("utf-8", errors="replace")
+    digest = hashlib.sha256(blob).hexdigest()
+
+    with _additional_file_lock:
+        if len(_additional_file_hashes) >= ADDITIONAL_FILE_CACHE_MAX_ENTRIES:
+            _additional_file_hashes.clear()
+            _additional_file_blobs.clear()
+        _additional_file_hashes[stat_key] = digest
+        blob = _additional_file_blobs.setdefault(digest, blob)
+
+    return blob
+
+
 def collect_additional_files(additional_files: Any, kind: str) -> List[Tuple[str, bytes]]:
     """
     Additional files are appended at zip root by basename, matching prior behavior.
@@ -213,8 +394,7 @@ def collect_additional_files(additional_files: Any, kind: str) -> List[Tuple[str
         _, ext = os.path.splitext(bn)
         if ext.lower() in BINARY_EXTENSIONS_DENYLIST:
             continue
-        content = read_text_file(ap)
-        out.append((bn, content.encode("utf-8", errors="replace")))
+        out.append((bn, read_additional_file_cached(ap)))
     return out
 
 
@@ -348,14 +528,15 @@ def zip_write_file(zf: zipfile.ZipFile, arcname: str, content: bytes, mode: int
     zf.writestr(info, content)
 
 
-def build_multifile_zip_base64(
+def prepare_multifile_contents(
     student_path: str,
     kind: str,
     additional_files: Any,
     entry_class: str,
-) -> Tuple[Optional[str], Optional[str]]:
+) -> Tuple[Optional[str], str, List[Tuple[str, bytes]], Optional[str]]:
     """
-    Returns (base64_zip, error_message).
+    Returns (compile_script_or_None, run_script, [(zip_relpath, bytes), ...], error_message).
+    Student files come first; additional files whose names collide are skipped.
     """
     student_file_blobs = collect_student_files(student_path, kind)
     additional_file_blobs = collect_additional_files(additional_files, kind)
@@ -379,22 +560,41 @@ def build_multifile_zip_base64(
         for ap in parse_additional_files(additional_files):
             ap = ap.strip()
             if ap.endswith(".java") and os.path.isfile(ap):
-                java_sources.append((os.path.basename(ap), read_text_file(ap)))
+                java_sources.append((os.path.basename(ap), read_additional_file_cached(ap).decode("utf-8", errors="replace")))
 
         main_class, err = pick_java_main_class(java_sources, entry_class)
         if err:
-            return None, err
+            return None, "", [], err
         # Replace placeholder in run script later
         entry_class = main_class or ""
 
     student_relpaths = [p for (p, _b) in student_file_blobs]
     compile_script, run_script, err = build_compile_and_run_scripts(kind, student_relpaths, entry_class)
     if err:
-        return None, err
+        return None, "", [], err
 
     if kind == "java":
         run_script = run_script.replace("{MAIN_CLASS}", entry_class or "Main")
 
+    files: List[Tuple[str, bytes]] = []
+    seen = set()
+    for rel, blob in student_file_blobs + additional_file_blobs:
+        if not rel or rel in seen:
+            continue
+        seen.add(rel)
+        files.append((rel, blob))
+
+    return compile_script, run_script, files, None
+
+
+def zip_multifile_base64(
+    run_script: str,
+    compile_script: Optional[str],
+    files: List[Tuple[str, bytes, int]],
+) -> str:
+    """
+    files: [(zip_relpath, bytes, unix_mode), ...]
+    """
     bio = io.BytesIO()
     with zipfile.ZipFile(bio, "w", compression=zipfile.ZIP_DEFLATED) as zf:
         # Required script
@@ -404,23 +604,144 @@ def build_multifile_zip_base64(
         if compile_script:
             zip_write_file(zf, "compile", compile_script.encode("utf-8"), mode=0o755)
 
-        # Student files
-        seen = set()
-        for rel, blob in student_file_blobs:
-            if not rel or rel in seen:
-                continue
-            seen.add(rel)
-            zip_write_file(zf, rel, blob, mode=0o644)
+        for rel, blob, mode in files:
+            zip_write_file(zf, rel, blob, mode=mode)
+
+    return base64.b64encode(bio.getvalue()).decode("ascii")
 
-        # Additional files (skip if name collides)
-        for rel, blob in additional_file_blobs:
-            if not rel or rel in seen:
-                continue
-            seen.add(rel)
-            zip_write_file(zf, rel, blob, mode=0o644)
 
-    zip_bytes = bio.getvalue()
-    return base64.b64encode(zip_bytes).decode("ascii"), None
+# (base64_zip, error_message, build_output). build_output is what an already-compiled
+# archive's shared build step printed (e.g. warnings); it is attached to every run's
+# compile_output, which Judge0 would otherwise have filled in by compiling per testcase.
+SubmissionArchive = Tuple[Optional[str], Optional[str], str]
+
+
+def build_multifile_zip_base64(
+    student_path: str,
+    kind: str,
+    additional_files: Any,
+    entry_class: str,
+) -> SubmissionArchive:
+    compile_script, run_script, files, err = prepare_multifile_contents(student_path, kind, additional_files, entry_class)
+    if err:
+        return None, err, ""
+
+    return zip_multifile_base64(run_script, compile_script, [(rel, blob, 0o644) for (rel, blob) in files]), None, ""
+
+
+def build_compiled_archive(
+    student_path: str,
+    kind: str,
+    additional_files: Any,
+    entry_class: str,
+) -> Optional[SubmissionArchive]:
+    """
+    Compile-then-execute: runs the compile script once on Judge0, captures the build
+    output (class files / ./main) and packages it with only a `run` script.
+
+    Returns (base64_zip, None, compiler_messages) on success, (None, compile_output, "")
+    when the code does not compile, or None when the build output could not be captured
+    (caller should fall back to compiling per testcase).
+    """
+    compile_script, run_script, files, err = prepare_multifile_contents(student_path, kind, additional_files, entry_class)
+    if err:
+        return None, err, ""
+    if not compile_script:
+        return None
+
+    build_zip = zip_multifile_base64(
+        COMPILE_ONLY_RUN_SCRIPTS[kind],
+        compile_script,
+        [(rel, blob, 0o644) for (rel, blob) in files],
+    )
+
+    try:
+        create_obj = judge0_create_submission(build_zip, "")
+        token = (create_obj.get("token") or "").strip()
+        has_results = any(k in create_obj for k in ("stdout", "stderr", "compile_output", "status"))
+        if has_results:
+            obj = create_obj
+        elif token:
+            obj = judge0_wait_for_submission(token)
+        else:
+            return None
+    except Exception:
+        return None
+
+    status_id = (obj.get("status") or {}).get("id")
+    if status_id == JUDGE0_STATUS_COMPILATION_ERROR:
+        result = normalize_judge0_result(obj)
+        return None, (result["compile_output"] or result["stderr"] or "Compilation failed."), ""
+    if status_id != JUDGE0_STATUS_ACCEPTED:
+        return None
+
+    # Build output comes back as a base64'd tar.gz on stdout
+    try:
+        tar_bytes = base64.b64decode(base64_decode_text(obj.get("stdout")).strip(), validate=False)
+        artifacts: List[Tuple[str, bytes, int]] = []
+        with tarfile.open(fileobj=io.BytesIO(tar_bytes), mode="r:gz") as tf:
+            for member in tf.getmembers():
+                if not member.isfile():
+                    continue
+                rel = member.name[2:] if member.name.startswith("./") else member.name
+                if not rel or rel.startswith("/") or ".." in rel.split("/"):
+                    continue
+                fh = tf.extractfile(member)
+                if fh is None:
+                    continue
+                artifacts.append((rel, fh.read(), member.mode & 0o777 or 0o644))
+    except Exception:
+        return None
+
+    if not artifacts:
+        return None
+
+    # Ship build output plus non-source data files; sources are no longer needed.
+    source_exts = allowed_exts_for_language(kind) or set()
+    seen = {rel for (rel, _blob, _mode) in artifacts}
+    for rel, blob in files:
+        if rel in seen or os.path.splitext(rel)[1].lower() in source_exts:
+            continue
+        seen.add(rel)
+        artifacts.append((rel, blob, 0o644))
+
+    return zip_multifile_base64(run_script, None, artifacts), None, base64_decode_text(obj.get("compile_output"))
+
+
+def archive_key(student_path: str, language: str, additional_files: Any, entry_class: str) -> Tuple[str, str, Tuple[str, ...], str]:
+    return (
+        student_path,
+        detect_language_kind(language),
+        tuple(a.strip() for a in parse_additional_files(additional_files)),
+        (entry_class or "").strip(),
+    )
+
+
+def build_submission_archives(
+    student_path: str,
+    language: str,
+    testcases: List[Dict[str, Any]],
+) -> Dict[Tuple[str, str, Tuple[str, ...], str], SubmissionArchive]:
+    """
+    Packages the submission once per distinct (student path, language, additional files,
+    entry class) among the testcases. Compiled languages are built once on Judge0 when
+    the archive is shared by several testcases; a compile error becomes the archive's
+    error so every testcase short-circuits with it.
+    Returns {archive_key: (base64_zip, error_message, build_output)}.
+    """
+    kind = detect_language_kind(language)
+    uses: Dict[Tuple[str, str, Tuple[str, ...], str], int] = {}
+    for tc in testcases:
+        key = archive_key(student_path, language, tc.get("additional_files"), tc.get("entry_class") or "")
+        uses[key] = uses.get(key, 0) + 1
+
+    archives: Dict[Tuple[str, str, Tuple[str, ...], str], SubmissionArchive] = {}
+    for key, count in uses.items():
+        archive = None
+        if JUDGE0_COMPILE_ONCE and kind in COMPILE_ONLY_RUN_SCRIPTS and count > 1:
+            archive = build_compiled_archive(student_path, kind, list(key[2]), key[3])
+        archives[key] = archive or build_multifile_zip_base64(student_path, kind, list(key[2]), key[3])
+    return archives
 
 
 def judge0_create_submission(additional_files_b64: str, stdin_text: str) -> Dict[str, Any]:
@@ -435,9 +756,13 @@ def judge0_create_submission(additional_files_b64: str, stdin_text: str) -> Dict
 
     def post(wait: bool) -> requests.Response:
         url = f"{JUDGE0_URL}/submissions?base64_encoded=true&wait={'true' if wait else 'false'}"
-        return requests.post(url, headers=build_request_headers(), data=json.dumps(payload), timeout=JUDGE0_TIMEOUT_SECONDS)
+        return get_judge0_session().post(url, headers=build_request_headers(), data=json.dumps(payload), timeout=JUDGE0_TIMEOUT_SECONDS)
+
+    if JUDGE0_CALLBACK_URL:
+        payload["callback_url"] = JUDGE0_CALLBACK_URL
 
-    if JUDGE0_TRY_WAIT:
+    # wait=true would hold a Judge0 worker open; callbacks make it unnecessary
+    if JUDGE0_TRY_WAIT and not JUDGE0_CALLBACK_URL:
         r = post(wait=True)
         if r.status_code == 400:
             # On many hosts, wait=true is disallowed
@@ -450,72 +775,330 @@ def judge0_create_submission(additional_files_b64: str, stdin_text: str) -> Dict
 
 
 def judge0_get_submission(token: str) -> Dict[str, Any]:
-    fields = "stdout,stderr,compile_output,message,status"
-    url = f"{JUDGE0_URL}/submissions/{token}?base64_encoded=true&fields={fields}"
-    r = requests.get(url, headers=build_request_headers(), timeout=JUDGE0_TIMEOUT_SECONDS)
+    url = f"{JUDGE0_URL}/submissions/{token}?base64_encoded=true&fields={JUDGE0_RESULT_FIELDS}"
+    r = get_judge0_session().get(url, headers=build_request_headers(), timeout=JUDGE0_TIMEOUT_SECONDS)
     r.raise_for_status()
     return r.json() if r.content else {}
 
 
+def poll_delays() -> Iterator[float]:
+    """
+    Seconds to wait between Judge0 status checks: quick at first, then exponential
+    backoff with +/- JUDGE0_POLL_JITTER so concurrent graders do not poll in lockstep.
+    In callback mode the checks are only a safety net, so they start slow.
+    """
+    delay = JUDGE0_CALLBACK_FALLBACK_POLL_SECONDS if JUDGE0_CALLBACK_URL else JUDGE0_POLL_INITIAL_SECONDS
+    cap = max(delay, JUDGE0_POLL_MAX_INTERVAL_SECONDS)
+    while True:
+        yield delay * random.uniform(1.0 - JUDGE0_POLL_JITTER, 1.0 + JUDGE0_POLL_JITTER)
+        delay = min(delay * JUDGE0_POLL_BACKOFF_FACTOR, cap)
+
+
+def read_callback_result(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns (and consumes) the submission Judge0 pushed to the callback endpoint, if any.
+    """
+    path = os.path.join(JUDGE0_CALLBACK_DIR, f"{token}.json")
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            obj = json.load(fh) or {}
+        os.remove(path)
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def sleep_until(next_check: float, deadline: float) -> None:
+    now = time.time()
+    wake = min(next_check, deadline)
+    if JUDGE0_CALLBACK_URL:
+        wake = min(wake, now + JUDGE0_CALLBACK_CHECK_SECONDS)
+    if wake > now:
+        time.sleep(wake - now)
+
+
+def judge0_wait_for_submission(token: str) -> Dict[str, Any]:
+    """
+    Wait until done (status.id not 1 or 2). On timeout, returns whatever we have.
+    """
+    deadline = time.time() + JUDGE0_POLL_MAX_SECONDS
+    delays = poll_delays()
+    next_check = time.time() + next(delays)
+    last_obj: Dict[str, Any] = {}
+    while time.time() < deadline:
+        if JUDGE0_CALLBACK_URL:
+            pushed = read_callback_result(token)
+            if pushed is not None:
+                return pushed
+
+        if time.time() >= next_check:
+            last_obj = judge0_get_submission(token)
+
+            status = last_obj.get("status") or {}
+            status_id = status.get("id")
+            if status_id not in (1, 2):
+                return last_obj
+
+            next_check = time.time() + next(delays)
+
+        sleep_until(next_check, deadline)
+
+    return last_obj
+
+
+def judge0_create_submissions_batch(items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Create up to JUDGE0_BATCH_MAX_SIZE submissions in one call.
+    items: [(additional_files_b64, stdin_text), ...]
+    Returns one {"token": ...} (or {"error": ...}) per item, in order.
+    """
+    payload: Dict[str, Any] = {
+        "submissions": [
+            {
+                "language_id": JUDGE0_MULTIFILE_LANGUAGE_ID,
+                "additional_files": zip_b64,
+                "stdin": base64_encode_text(stdin_text),
+            }
+            for (zip_b64, stdin_text) in items
+        ]
+    }
+    if JUDGE0_CALLBACK_URL:
+        for sub in payload["submissions"]:
+            sub["callback_url"] = JUDGE0_CALLBACK_URL
+    url = f"{JUDGE0_URL}/submissions/batch?base64_encoded=true"
+    r = get_judge0_session().post(url, headers=build_request_headers(), data=json.dumps(payload), timeout=JUDGE0_TIMEOUT_SECONDS)
+    r.raise_for_status()
+    created = r.json() if r.content else []
+    if not isinstance(created, list) or len(created) != len(items):
+        raise ValueError("Judge0 batch create returned an unexpected response.")
+    return created
+
+
+def judge0_get_submissions_batch(tokens: List[str]) -> List[Dict[str, Any]]:
+    url = f"{JUDGE0_URL}/submissions/batch?tokens={','.join(tokens)}&base64_encoded=true&fields={JUDGE0_RESULT_FIELDS}"
+    r = get_judge0_session().get(url, headers=build_request_headers(), timeout=JUDGE0_TIMEOUT_SECONDS)
+    r.raise_for_status()
+    obj = r.json() if r.content else {}
+    return list(obj.get("submissions") or []) if isinstance(obj, dict) else []
+
+
+def judge0_error_result(
+    stderr: str = "",
+    compile_output: str = "",
+    status_id: int = JUDGE0_STATUS_INTERNAL_ERROR,
+) -> Dict[str, Any]:
+    return {"stdout": "", "stderr": stderr or "", "compile_output": compile_output or "", "status_id": status_id}
+
+
+def is_internal_error(result: Optional[Dict[str, Any]]) -> bool:
+    return result is not None and result.get("status_id") == JUDGE0_STATUS_INTERNAL_ERROR
+
+
+def normalize_judge0_result(obj: Dict[str, Any], build_output: str = "", max_output_chars: int = 0) -> Dict[str, Any]:
+    """
+    build_output is the shared build step's output of a precompiled archive; it stands in
+    for the compile_output the run itself no longer produces. max_output_chars > 0 caps
+    each decoded stream.
+    """
+    stdout = base64_decode_text(obj.get("stdout"), max_output_chars)
+    stderr = base64_decode_text(obj.get("stderr"), max_output_chars)
+    compile_output = base64_decode_text(obj.get("compile_output"), max_output_chars) or build_output
+    message = base64_decode_text(obj.get("message"))
+
+    # If Judge0 returns an internal message but no stdout/stderr/compile_output, surface it.
+    if (not stdout) and (not stderr) and (not compile_output) and message:
+        stderr = message
+
+    status_id = (obj.get("status") or {}).get("id")
+    if not isinstance(status_id, int) or status_id in (1, 2):
+        # Still queued/processing when we stopped waiting, or never found at all
+        return judge0_error_result(stderr=stderr or "Judge0 did not finish this testcase in time.")
+
+    exit_code = obj.get("exit_code")
+    return {
+        "stdout": stdout or "",
+        "stderr": stderr or "",
+        "compile_output": compile_output or "",
+        "status_id": status_id,
+        "exit_code": int(exit_code) if isinstance(exit_code, int) else None,
+    }
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    size = max(1, int(size))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def poll_judge0_batch(tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Wait for many tokens, polling with one GET per JUDGE0_BATCH_MAX_SIZE tokens
+    (or picking up callbacks) until all are done. The JUDGE0_POLL_MAX_SECONDS deadline
+    restarts whenever a token finishes, so a large batch that Judge0 works through
+    steadily is not cut off; only a batch that stops making progress is abandoned.
+    Returns {token: last_submission_obj}; unfinished tokens keep their last state.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = [t for t in tokens if t]
+    deadline = time.time() + JUDGE0_POLL_MAX_SECONDS
+    delays = poll_delays()
+    next_check = time.time() + next(delays)
+
+    def is_done(token: str) -> bool:
+        status_id = ((results.get(token) or {}).get("status") or {}).get("id")
+        return status_id not in (None, 1, 2)
+
+    while pending and time.time() < deadline:
+        waiting = len(pending)
+        if JUDGE0_CALLBACK_URL:
+            for token in pending:
+                pushed = read_callback_result(token)
+                if pushed is not None:
+                    results[token] = pushed
+            pending = [t for t in pending if not is_done(t)]
+
+        if pending and time.time() >= next_check:
+            for group in chunked(pending, JUDGE0_BATCH_MAX_SIZE):
+                for obj in judge0_get_submissions_batch(group):
+                    token = (obj or {}).get("token") or ""
+                    if token:
+                        results[token] = obj
+            pending = [t for t in pending if not is_done(t)]
+            next_check = time.time() + next(delays)
+
+        if len(pending) < waiting:
+            deadline = time.time() + JUDGE0_POLL_MAX_SECONDS
+
+        if pending:
+            sleep_until(next_check, deadline)
+
+    return results
+
+
 def call_judge0_api(
     student_path: str,
     testcase_in: str,
     language: str,
     additional_files: Any,
     entry_class: str = "",
-) -> Dict[str, str]:
+    archive: Optional[SubmissionArchive] = None,
+    max_output_chars: int = 0,
+) -> Dict[str, Any]:
     kind = detect_language_kind(language)
 
-    zip_b64, build_err = build_multifile_zip_base64(student_path, kind, additional_files, entry_class)
+    if archive is None:
+        archive = build_multifile_zip_base64(student_path, kind, additional_files, entry_class)
+    zip_b64, build_err, build_output = archive
     if build_err:
-        return {"stdout": "", "stderr": "", "compile_output": build_err}
+        return judge0_error_result(compile_output=build_err, status_id=JUDGE0_STATUS_COMPILATION_ERROR)
 
     # Create submission
     try:
         create_obj = judge0_create_submission(zip_b64 or "", testcase_in or "")
     except Exception as e:
-        return {"stdout": "", "stderr": str(e), "compile_output": ""}
+        return judge0_error_result(stderr=str(e))
 
     # If wait=true succeeded, the response may already include stdout/stderr/status
     token = (create_obj.get("token") or "").strip()
     has_results = any(k in create_obj for k in ("stdout", "stderr", "compile_output", "status"))
 
-    def normalize_result(obj: Dict[str, Any]) -> Dict[str, str]:
-        stdout = base64_decode_text(obj.get("stdout"))
-        stderr = base64_decode_text(obj.get("stderr"))
-        compile_output = base64_decode_text(obj.get("compile_output"))
-        message = base64_decode_text(obj.get("message"))
-
-        # If Judge0 returns an internal message but no stdout/stderr/compile_output, surface it.
-        if (not stdout) and (not stderr) and (not compile_output) and message:
-            stderr = message
-
-        return {"stdout": stdout or "", "stderr": stderr or "", "compile_output": compile_output or ""}
-
     if has_results and token:
-        return normalize_result(create_obj)
+        return normalize_judge0_result(create_obj, build_output, max_output_chars)
     if not token:
         # Unexpected, but keep stable output shape
-        return {"stdout": "", "stderr": "", "compile_output": "Judge0 did not return a submission token."}
+        return judge0_error_result(stderr="Judge0 did not return a submission token.")
 
-    # Poll until done (status.id not 1 or 2)
-    deadline = time.time() + JUDGE0_POLL_MAX_SECONDS
-    last_obj: Dict[str, Any] = {}
-    while time.time() < deadline:
+    try:
+        return normalize_judge0_result(judge0_wait_for_submission(token), build_output, max_output_chars)
+    except Exception as e:
+        return judge0_error_result(stderr=str(e))
+
+
+def call_judge0_api_batch(
+    student_path: str,
+    testcases: List[Dict[str, Any]],
+    language: str,
+    max_output_chars: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Run many testcases of one submission through the Judge0 batch API.
+    testcases: [{"input", "additional_files", "entry_class", "archive"?}, ...]
+    Returns one {"stdout","stderr","compile_output","status_id"} per testcase, in order.
+    Falls back to one call per testcase if the host rejects batch requests.
+    """
+    out: List[Optional[Dict[str, Any]]] = [None] * len(testcases)
+    archives = build_submission_archives(
+        student_path,
+        language,
+        [tc for tc in testcases if tc.get("archive") is None],
+    )
+
+    # (index, zip_b64, stdin) for every testcase that packaged cleanly
+    queued: List[Tuple[int, str, str]] = []
+    build_output_by_index: Dict[int, str] = {}
+    for i, tc in enumerate(testcases):
+        archive = tc.get("archive") or archives[
+            archive_key(student_path, language, tc.get("additional_files"), tc.get("entry_class") or "")
+        ]
+        zip_b64, build_err, build_output = archive
+        if build_err:
+            out[i] = judge0_error_result(compile_output=build_err, status_id=JUDGE0_STATUS_COMPILATION_ERROR)
+            continue
+        queued.append((i, zip_b64 or "", tc.get("input") or ""))
+        build_output_by_index[i] = build_output
+
+    token_by_index: Dict[int, str] = {}
+    for group in chunked(queued, JUDGE0_BATCH_MAX_SIZE):
         try:
-            last_obj = judge0_get_submission(token)
-        except Exception as e:
-            return {"stdout": "", "stderr": str(e), "compile_output": ""}
+            created = judge0_create_submissions_batch([(zip_b64, stdin) for (_i, zip_b64, stdin) in group])
+        except Exception:
+            # Batch endpoint unavailable (e.g. disabled on this host); run these one by one.
+            for (i, zip_b64, _stdin) in group:
+                tc = testcases[i]
+                out[i] = call_judge0_api(
+                    student_path,
+                    tc.get("input") or "",
+                    language,
+                    tc.get("additional_files"),
+                    entry_class=tc.get("entry_class") or "",
+                    archive=(zip_b64, None, build_output_by_index[i]),
+                    max_output_chars=max_output_chars,
+                )
+            continue
 
-        status = last_obj.get("status") or {}
-        status_id = status.get("id")
-        if status_id not in (1, 2):
-            return normalize_result(last_obj)
+        for (i, _zip_b64, _stdin), obj in zip(group, created):
+            token = ((obj or {}).get("token") or "").strip()
+            if token:
+                token_by_index[i] = token
+            else:
+                out[i] = judge0_error_result(stderr="Judge0 did not return a submission token.")
 
-        time.sleep(JUDGE0_POLL_INTERVAL_SECONDS)
+    try:
+        polled = poll_judge0_batch(list(token_by_index.values()))
+    except Exception as e:
+        polled = {}
+        for i in token_by_index:
+            out[i] = judge0_error_result(stderr=str(e))
 
-    # Timed out, return whatever we have
-    return normalize_result(last_obj)
+    for i, token in token_by_index.items():
+        if out[i] is None:
+            out[i] = normalize_judge0_result(polled.get(token) or {}, build_output_by_index[i], max_output_chars)
+
+    return [r or judge0_error_result() for r in out]
+
+
+def execute_tests_batch(
+    filename: str,
+    testcases: List[Dict[str, Any]],
+    language: str,
+    max_output_chars: int = 0,
+) -> List[Dict[str, Any]]:
+    cleaned = [
+        {**tc, "input": (tc.get("input") or "").replace("\r", "")}
+        for tc in testcases
+    ]
+    return call_judge0_api_batch(filename, cleaned, language, max_output_chars=max_output_chars)
 
 
 def execute_test(
@@ -524,14 +1107,18 @@ def execute_test(
     language: str,
     additional_files: Any,
     entry_class: str = "",
-) -> Dict[str, str]:
+    archive: Optional[SubmissionArchive] = None,
+    max_output_chars: int = 0,
+) -> Dict[str, Any]:
     response = call_judge0_api(
         filename,
         (testcase_in or "").replace("\r", ""),
         language,
         additional_files,
         entry_class=entry_class,
+        archive=archive,
+        max_output_chars=max_output_chars,
     )
     if response is None:
-        return {"stdout": "", "stderr": "", "compile_output": ""}
+        return judge0_error_result()
     return response